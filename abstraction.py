@@ -0,0 +1,256 @@
+import os
+import random
+
+import numpy as np
+
+from card import Card
+from card_enums import PHASE, RANK, SUIT
+from evaluator import Evaluator
+from isomorphism import canonical_index, card_id, holdem_indexer, id_to_card
+
+# Situations are handled as card ids (see isomorphism.card_id) in this module.
+ID_TO_CARD = [id_to_card(c) for c in range(52)]
+BOARD_SIZES = {PHASE.PF: 0, PHASE.FLOP: 3, PHASE.TURN: 4, PHASE.RIVER: 5}
+
+
+def iter_canonical_situations(street, chunk_size=10_000, limit=None):
+    """
+    Stream every canonical (index, hole, board) of a street, in isomorphism
+    index order, in lists of at most chunk_size so callers never hold a whole
+    street in memory.
+    """
+    indexer = holdem_indexer(BOARD_SIZES[street])
+    end = indexer.size if limit is None else min(limit, indexer.size)
+    for start in range(0, end, chunk_size):
+        chunk = []
+        for index in range(start, min(start + chunk_size, end)):
+            rounds = indexer.unindex(index)
+            chunk.append((index, tuple(rounds[0]), tuple(rounds[1]) if len(rounds) > 1 else ()))
+        yield chunk
+
+
+def hand_features(hole_ids, board_ids, rng, runouts=8, opponents=8, bins=10):
+    """
+    Sampled hand-strength features for one situation:
+      hs:   equity against a random hand at the river
+      ppot: P(behind now, ahead at the river)
+      npot: P(ahead now, behind at the river)
+      hist: histogram over runouts of the per-runout equity (the k-means input)
+    """
+    hole = [ID_TO_CARD[c] for c in hole_ids]
+    board = [ID_TO_CARD[c] for c in board_ids]
+    rest = [c for c in range(52) if c not in hole_ids and c not in board_ids]
+    missing = 5 - len(board)
+    if missing == 0:
+        runouts = 1
+
+    hist = np.zeros(bins, dtype=np.float32)
+    total = ppot = npot = 0.0
+    mine_now = Evaluator.best_hand_rank(hole + board) if len(board) >= 3 else None
+    for _ in range(runouts):
+        drawn = rng.sample(rest, missing + 2 * opponents)
+        final_board = board + [ID_TO_CARD[c] for c in drawn[:missing]]
+        mine = Evaluator.best_hand_rank(hole + final_board)
+
+        runout_equity = 0.0
+        for i in range(opponents):
+            opp = [ID_TO_CARD[c] for c in drawn[missing + 2 * i:missing + 2 * i + 2]]
+            theirs = Evaluator.best_hand_rank(opp + final_board)
+            final = 1.0 if mine > theirs else 0.5 if mine == theirs else 0.0
+            runout_equity += final
+            if mine_now is not None and missing:
+                theirs_now = Evaluator.best_hand_rank(opp + board)
+                if mine_now < theirs_now and final == 1.0:
+                    ppot += 1
+                elif mine_now > theirs_now and final == 0.0:
+                    npot += 1
+        runout_equity /= opponents
+        total += runout_equity
+        hist[min(bins - 1, int(runout_equity * bins))] += 1
+
+    samples = runouts * opponents
+    return total / runouts, ppot / samples, npot / samples, hist / runouts
+
+
+def kmeans_plus_plus(data, k, rng):
+    """k-means++ seeding on an in-memory sample."""
+    centroids = [data[rng.randrange(len(data))]]
+    for _ in range(1, k):
+        dist = np.min([((data - c) ** 2).sum(axis=1) for c in centroids], axis=0)
+        if dist.sum() == 0:
+            centroids.append(data[rng.randrange(len(data))])
+            continue
+        idx = rng.choices(range(len(data)), weights=dist)[0]
+        centroids.append(data[idx])
+    return np.array(centroids, dtype=np.float32)
+
+
+def assign_clusters(data, centroids):
+    dist = ((data[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+    return dist.argmin(axis=1)
+
+
+class AbstractionPipeline:
+    """
+    Precompute card buckets per street into out_dir:
+      1) stream canonical situations and write their features chunk by chunk
+      2) run Lloyd's k-means over the chunk files (one chunk in memory at a time)
+         on cumulative equity histograms, where L2 approximates earth mover's
+         distance, seeded by k-means++ on `kmeans_sample` rows drawn from every chunk
+      3) write <street>.keys.npy (sorted isomorphism indices) and <street>.buckets.npy
+         chunk by chunk into preallocated memory-mapped files
+    """
+    def __init__(self, out_dir, n_buckets=8, bins=10, runouts=8, opponents=8,
+                 chunk_size=10_000, kmeans_iterations=10, kmeans_sample=10_000, limit=None, seed=None):
+        self.out_dir = out_dir
+        self.n_buckets = n_buckets
+        self.bins = bins
+        self.runouts = runouts
+        self.opponents = opponents
+        self.chunk_size = chunk_size
+        self.kmeans_iterations = kmeans_iterations
+        self.kmeans_sample = kmeans_sample
+        self.limit = limit
+        self.rng = random.Random(seed)
+
+    def _path(self, street, name):
+        return os.path.join(self.out_dir, f"{street.name.lower()}.{name}.npy")
+
+    def build(self, streets=(PHASE.PF, PHASE.FLOP, PHASE.TURN, PHASE.RIVER)):
+        os.makedirs(self.out_dir, exist_ok=True)
+        for street in streets:
+            self.build_street(street)
+
+    def build_street(self, street):
+        chunk_files = self._write_feature_chunks(street)
+        centroids = self._fit(chunk_files)
+        self._write_index(street, chunk_files, centroids)
+        for keys_file, features_file in chunk_files:
+            os.remove(keys_file)
+            os.remove(features_file)
+
+    def _write_feature_chunks(self, street):
+        chunk_files = []
+        for i, chunk in enumerate(iter_canonical_situations(street, self.chunk_size, self.limit)):
+            keys = np.empty(len(chunk), dtype=np.int64)
+            features = np.empty((len(chunk), self.bins + 3), dtype=np.float32)
+            for j, (index, hole, board) in enumerate(chunk):
+                hs, ppot, npot, hist = hand_features(hole, board, self.rng, self.runouts, self.opponents, self.bins)
+                keys[j] = index
+                features[j, :self.bins] = np.cumsum(hist)
+                features[j, self.bins:] = (hs, ppot, npot)
+            keys_file = self._path(street, f"chunk{i}.keys")
+            features_file = self._path(street, f"chunk{i}.features")
+            np.save(keys_file, keys)
+            np.save(features_file, features)
+            chunk_files.append((keys_file, features_file))
+        return chunk_files
+
+    def _seed_sample(self, chunk_files):
+        """An even share of `kmeans_sample` random rows from every chunk."""
+        share = max(1, self.kmeans_sample // len(chunk_files))
+        rows = []
+        for _, features_file in chunk_files:
+            data = np.load(features_file, mmap_mode="r")
+            picked = sorted(self.rng.sample(range(len(data)), min(share, len(data))))
+            rows.append(np.asarray(data[picked, :self.bins]))
+        return np.concatenate(rows)
+
+    def _fit(self, chunk_files):
+        sample = self._seed_sample(chunk_files)
+        k = min(self.n_buckets, len(sample))
+        centroids = kmeans_plus_plus(sample, k, self.rng)
+        for _ in range(self.kmeans_iterations):
+            sums = np.zeros_like(centroids, dtype=np.float64)
+            counts = np.zeros(k, dtype=np.int64)
+            for _, features_file in chunk_files:
+                data = np.load(features_file)[:, :self.bins]
+                labels = assign_clusters(data, centroids)
+                np.add.at(sums, labels, data)
+                counts += np.bincount(labels, minlength=k)
+            nonempty = counts > 0
+            centroids[nonempty] = (sums[nonempty] / counts[nonempty, None]).astype(np.float32)
+
+        # Order buckets so bucket 0 is the weakest: a larger cumulative
+        # histogram means more of the mass sits at low equity.
+        order = np.argsort(-centroids.sum(axis=1))
+        return centroids[order]
+
+    def _write_index(self, street, chunk_files, centroids):
+        # Chunks come out of iter_canonical_situations in index order, so each
+        # one is a slice of the final files and nothing is sorted or held whole.
+        total = sum(len(np.load(keys_file, mmap_mode="r")) for keys_file, _ in chunk_files)
+        dtype = np.uint8 if len(centroids) <= 256 else np.uint16
+        keys = np.lib.format.open_memmap(self._path(street, "keys"), mode="w+", dtype=np.int64, shape=(total,))
+        buckets = np.lib.format.open_memmap(self._path(street, "buckets"), mode="w+", dtype=dtype, shape=(total,))
+        start = 0
+        for keys_file, features_file in chunk_files:
+            chunk_keys = np.load(keys_file)
+            end = start + len(chunk_keys)
+            keys[start:end] = chunk_keys
+            buckets[start:end] = assign_clusters(np.load(features_file)[:, :self.bins], centroids)
+            start = end
+        keys.flush()
+        buckets.flush()
+        del keys, buckets
+        np.save(self._path(street, "centroids"), centroids)
+
+
+class BucketIndex:
+    """
+    Memory-mapped lookup over the tables written by AbstractionPipeline, usable
+    wherever a bucketer is expected (e.g. CFRTrainer). Situations missing from
+    the index (e.g. when it was built with a limit) are featurized on the fly
+    and assigned to the nearest centroid.
+    """
+    def __init__(self, out_dir, bins=10, runouts=8, opponents=8, seed=None):
+        self.bins = bins
+        self.runouts = runouts
+        self.opponents = opponents
+        self.rng = random.Random(seed)
+        self.tables = {}
+        for street in BOARD_SIZES:
+            keys_path = os.path.join(out_dir, f"{street.name.lower()}.keys.npy")
+            if os.path.exists(keys_path):
+                prefix = os.path.join(out_dir, street.name.lower())
+                self.tables[BOARD_SIZES[street]] = (
+                    np.load(keys_path, mmap_mode="r"),
+                    np.load(prefix + ".buckets.npy", mmap_mode="r"),
+                    np.load(prefix + ".centroids.npy"),
+                )
+        if not self.tables:
+            raise ValueError(f"No bucket tables found in {out_dir}")
+        self.n_buckets = max(len(centroids) for _, _, centroids in self.tables.values())
+
+    def bucket(self, hole, board):
+        table = self.tables.get(len(board))
+        if table is None:
+            raise ValueError(f"No bucket table for a {len(board)}-card board")
+        keys, buckets, centroids = table
+
+        index = canonical_index(hole, board)
+        if len(keys) == holdem_indexer(len(board)).size:
+            # Complete table: the isomorphism index is the row.
+            return int(buckets[index])
+        pos = np.searchsorted(keys, index)
+        if pos < len(keys) and keys[pos] == index:
+            return int(buckets[pos])
+
+        hole_ids = [card_id(c) for c in hole]
+        board_ids = [card_id(c) for c in board]
+        _, _, _, hist = hand_features(hole_ids, board_ids, self.rng, self.runouts, self.opponents, self.bins)
+        return int(assign_clusters(np.cumsum(hist)[None, :], centroids)[0])
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    out_dir = tempfile.mkdtemp()
+    pipeline = AbstractionPipeline(out_dir, n_buckets=5, runouts=4, opponents=4, chunk_size=50, seed=1)
+    pipeline.build(streets=(PHASE.PF,))
+    print(f"Pre-flop situations: {len(np.load(os.path.join(out_dir, 'pf.keys.npy')))}")
+
+    index = BucketIndex(out_dir)
+    aces = [Card(RANK.ACE, SUIT.HEARTS), Card(RANK.ACE, SUIT.SPADES)]
+    junk = [Card(RANK.SEVEN, SUIT.CLUBS), Card(RANK.TWO, SUIT.DIAMONDS)]
+    print(f"Aces bucket: {index.bucket(aces, [])}, 7-2 offsuit bucket: {index.bucket(junk, [])}")
@@ -1,8 +1,59 @@
 import math
+import random
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from card import Card
+from card_enums import BUTTON, RANK, SUIT
 from player import Player
-from evaluator import Evaluator
+from evaluator import CachedEvaluator
+from ruleset import STANDARD
+from hand_reading import action_kind
+from isomorphism import card_id
+
+class _ReadingPlayer(Player):
+    """Opponent model and range reader plumbing shared by the minimax and alpha-beta players."""
+    __slots__ = ("model", "reader")
+
+    def __init__(self, name, chips=1000, community_cards=None, position=BUTTON.PLAYER, verbose=False, model=None,
+                 reader=None):
+        """
+        model:   an OpponentModel to weight opponent responses with; None plays worst case.
+        reader:  a hand_reading.RangeReader; when set, strength is our equity against the narrowed ranges.
+        """
+        super().__init__(name, chips=chips, community_cards=community_cards, position=position, verbose=verbose)
+        self.model = model
+        self.reader = reader
+
+    def receive_cards(self, cards):
+        super().receive_cards(cards)
+        if self.reader is not None and len(self.hand) == 2:
+            self.reader.new_hand([card_id(c) for c in self.hand])
+
+    def observe_action(self, player, old_bet, call_amount, phase):
+        if self.reader is not None and player.hand:
+            self.reader.observe_action(player.name, action_kind(player, old_bet, call_amount))
+
+    def observe_board(self, cards):
+        if self.reader is not None:
+            self.reader.observe_board([card_id(c) for c in cards])
+
+    def opponents(self):
+        """Names of the other players still in the hand at our table."""
+        if self.seats is None:
+            return []
+        return [p.name for p in self.seats.players if p is not self and not p.folded and p.hand]
+
+    def opponent_profile(self):
+        if self.model is None:
+            return 0.0, 1.0
+        return self.model.opponent_profile(self.opponents())
+
+#===================================================================================================================================
+
+class MinimaxPlayer(_ReadingPlayer):
+    __slots__ = ()
 
-class MinimaxPlayer(Player):
     def make_decision(self, highest_bet, call_amount):
         """
         Naive minimax-based decision for a single betting round
@@ -66,7 +117,10 @@ class MinimaxPlayer(Player):
             fold_ev = self.evaluate_opponent_fold()
             call_ev = self.evaluate_opponent_call()
             raise_ev = self.evaluate_opponent_reraise()
-            return min(fold_ev, call_ev, raise_ev)
+            if self.model is None:
+                return min(fold_ev, call_ev, raise_ev)
+            p_fold, p_call, p_raise = self.model.response_probabilities(self.opponents())
+            return p_fold * fold_ev + p_call * call_ev + p_raise * raise_ev
 
     def evaluate_fold(self):
         return 0
@@ -84,22 +138,30 @@ class MinimaxPlayer(Player):
         return 150 + 150 * (strength - 0.5)
 
     def evaluate_opponent_call(self):
+        # Opponents who show down stronger hands than most need more to call against.
         strength = self.estimate_strength()
-        return 200 * (strength - 0.5)
+        offset, _ = self.opponent_profile()
+        return 200 * (strength - 0.5 - offset)
 
     def evaluate_opponent_reraise(self):
+        # Bigger re-raisers cost more when they come over the top.
         strength = self.estimate_strength()
-        return (200 * (strength - 0.5)) - 50
+        offset, size_ratio = self.opponent_profile()
+        return (200 * (strength - 0.5 - offset)) - 50 * size_ratio
 
     def estimate_strength(self):
+        if self.reader is not None:
+            return self.reader.equity(self.opponents())
         cards = self.hand + self.community_cards
-        rank, _ = Evaluator.get_hand_rank(cards)
+        rank, _ = CachedEvaluator.get_hand_rank(cards)
         normalized_strength = rank / len(cards)
         return normalized_strength
 
 #===================================================================================================================================
 
-class AlphaBetaPlayer(Player):
+class AlphaBetaPlayer(_ReadingPlayer):
+    __slots__ = ()
+
     def make_decision(self, highest_bet, call_amount):
         if self.folded or self.chips <= 0:
             return
@@ -157,8 +219,10 @@ class AlphaBetaPlayer(Player):
             fold_ev = self.evaluate_opponent_fold()
             call_ev = self.evaluate_opponent_call()
             raise_ev = self.evaluate_opponent_reraise()
-
-            return min(fold_ev, call_ev, raise_ev)
+            if self.model is None:
+                return min(fold_ev, call_ev, raise_ev)
+            p_fold, p_call, p_raise = self.model.response_probabilities(self.opponents())
+            return p_fold * fold_ev + p_call * call_ev + p_raise * raise_ev
 
     def evaluate_fold(self):
         return 0
@@ -176,15 +240,259 @@ class AlphaBetaPlayer(Player):
         return 150 + 150 * (strength - 0.5)
 
     def evaluate_opponent_call(self):
+        # Opponents who show down stronger hands than most need more to call against.
         strength = self.estimate_strength()
-        return 200 * (strength - 0.5)
+        offset, _ = self.opponent_profile()
+        return 200 * (strength - 0.5 - offset)
 
     def evaluate_opponent_reraise(self):
+        # Bigger re-raisers cost more when they come over the top.
         strength = self.estimate_strength()
-        return (200 * (strength - 0.5)) - 50
+        offset, size_ratio = self.opponent_profile()
+        return (200 * (strength - 0.5 - offset)) - 50 * size_ratio
 
     def estimate_strength(self):
+        if self.reader is not None:
+            return self.reader.equity(self.opponents())
         cards = self.hand + self.community_cards
-        rank, _ = Evaluator.get_hand_rank(cards)
+        rank, _ = CachedEvaluator.get_hand_rank(cards)
         normalized_strength = rank / len(cards)
         return normalized_strength
+
+#===================================================================================================================================
+
+def simulate_showdown(hand, community_cards, num_opponents, rng=random):
+    """
+    Headless rollout of the rest of a hand: deal random hole cards to each
+    opponent and complete the board from the unseen cards, then return our
+    share of the pot (1 for a win, 1/k for a k-way tie, 0 for a loss).
+    """
+    known = {(c.rank, c.suit) for c in hand + community_cards}
+    unseen = [(rank, suit) for suit in SUIT for rank in RANK if (rank, suit) not in known]
+    needed = 2 * num_opponents + (5 - len(community_cards))
+    drawn = [Card(rank, suit) for rank, suit in rng.sample(unseen, needed)]
+
+    board = community_cards + drawn[2 * num_opponents:]
+    # Packed scores from the precomputed table order hands like Evaluator.best_hand_rank.
+    best = STANDARD.best_hand_score(hand + board)
+    ties = 1
+    for i in range(num_opponents):
+        opp_rank = STANDARD.best_hand_score(drawn[2 * i:2 * i + 2] + board)
+        if opp_rank > best:
+            return 0.0
+        if opp_rank == best:
+            ties += 1
+    return 1.0 / ties
+
+
+class _MCTSNode:
+    """
+    One decision point of the simplified betting tree searched by MCTSPlayer.
+    We play against the opponents as a single aggregated "villain"; a call by
+    either side ends the betting and goes to a rollout showdown.
+    """
+    def __init__(self, actor, invested, pot, to_call, raises_left, terminal=None, parent=None):
+        self.actor = actor              # "hero" or "villain"
+        self.invested = invested        # chips we add from the current decision on
+        self.pot = pot                  # pot including every bet made so far
+        self.to_call = to_call          # chips the actor must add to call
+        self.raises_left = raises_left
+        self.terminal = terminal        # None, "hero_fold", "villain_fold" or "showdown"
+        self.parent = parent
+        self.children = {}
+        self.untried = [] if terminal else ["fold", "call", "raise"] if raises_left > 0 else ["fold", "call"]
+        self.visits = 0
+        self.value_sum = 0.0
+
+    def child_state(self, action, raise_unit, hero_chips):
+        if action == "fold":
+            kind = "hero_fold" if self.actor == "hero" else "villain_fold"
+            return _MCTSNode(self.actor, self.invested, self.pot, 0, 0, terminal=kind, parent=self)
+
+        invested = self.invested
+        to_call = self.to_call
+        if self.actor == "hero":
+            to_call = min(to_call, hero_chips - invested)
+            invested += to_call
+        pot = self.pot + to_call
+
+        if action == "call":
+            return _MCTSNode(self.actor, invested, pot, 0, 0, terminal="showdown", parent=self)
+
+        # Raise: never let the hero commit more chips than they have.
+        unit = raise_unit
+        if self.actor == "hero":
+            unit = min(unit, hero_chips - invested)
+            invested += unit
+        pot += unit
+        other = "villain" if self.actor == "hero" else "hero"
+        return _MCTSNode(other, invested, pot, unit, self.raises_left - 1, parent=self)
+
+    def terminal_value(self, share):
+        if self.terminal == "hero_fold":
+            return -self.invested
+        if self.terminal == "villain_fold":
+            return self.pot - self.invested
+        return share * self.pot - self.invested
+
+    def select_child(self, exploration, scale):
+        """UCT selection; the villain picks the child that is worst for us."""
+        sign = 1.0 if self.actor == "hero" else -1.0
+        log_visits = math.log(self.visits)
+        best_child, best_score = None, -math.inf
+        for child in self.children.values():
+            mean = child.value_sum / child.visits / scale
+            score = sign * mean + exploration * math.sqrt(log_visits / child.visits)
+            if score > best_score:
+                best_child, best_score = child, score
+        return best_child
+
+
+def mcts_search(hand, community_cards, chips, call_amount, pot, num_opponents,
+                exploration=1.4, time_budget=0.05, max_iterations=None, seed=None):
+    """
+    Anytime UCT search over our fold/call/raise decision. Runs until either the
+    wall-clock budget (seconds) or the iteration budget runs out, whichever is
+    first, and returns {action: (visits, value_sum)} for the root's children.
+    Module-level so it can be shipped to worker processes.
+    """
+    rng = random.Random(seed)
+    raise_unit = max(5, call_amount)
+    scale = max(1, pot + 4 * raise_unit)
+    root = _MCTSNode("hero", 0, pot, call_amount, 2)
+    if call_amount >= chips:
+        root.untried = ["fold", "call"]
+
+    deadline = time.perf_counter() + time_budget if time_budget is not None else None
+    iterations = 0
+    while True:
+        if max_iterations is not None and iterations >= max_iterations:
+            break
+        if deadline is not None and iterations > 0 and time.perf_counter() >= deadline:
+            break
+        iterations += 1
+
+        # Selection / expansion: the tree is shallow, so expand all the way down.
+        node = root
+        while node.terminal is None:
+            if node.untried:
+                action = node.untried.pop(rng.randrange(len(node.untried)))
+                child = node.child_state(action, raise_unit, chips)
+                node.children[action] = child
+                node = child
+            else:
+                node = node.select_child(exploration, scale)
+
+        # Rollout: one determinization of the unseen cards per iteration.
+        share = 0.0
+        if node.terminal == "showdown":
+            share = simulate_showdown(hand, community_cards, num_opponents, rng)
+        value = node.terminal_value(share)
+
+        while node is not None:
+            node.visits += 1
+            node.value_sum += value
+            node = node.parent
+
+    return {action: (child.visits, child.value_sum) for action, child in root.children.items()}
+
+
+class MCTSPlayer(Player):
+    # __weakref__ lets the worker pool's finalizer watch the player.
+    __slots__ = ("time_budget", "max_iterations", "num_opponents", "exploration", "workers",
+                 "_executor", "_shutdown", "__weakref__")
+
+    def __init__(self, name, chips=1000, community_cards=None, position=BUTTON.PLAYER, verbose=False,
+                 time_budget=0.05, max_iterations=None, num_opponents=1, exploration=1.4, workers=1):
+        """
+        time_budget:    wall-clock seconds per decision (None for no limit)
+        max_iterations: iteration cap per worker (None for no limit)
+        workers:        >1 runs root-parallel searches in separate processes
+                        and merges their root statistics; the pool lives until
+                        close(), the end of a `with` block, or garbage collection
+        Searches are seeded from the global random module, so random.seed
+        makes decisions reproducible.
+        """
+        super().__init__(name, chips=chips, community_cards=community_cards, position=position, verbose=verbose)
+        if time_budget is None and max_iterations is None:
+            raise ValueError("MCTSPlayer needs a time budget or an iteration budget")
+        self.time_budget = time_budget
+        self.max_iterations = max_iterations
+        self.num_opponents = num_opponents
+        self.exploration = exploration
+        self.workers = workers
+        self._executor = None
+        self._shutdown = None
+
+    def make_decision(self, highest_bet, call_amount):
+        if self.folded or self.chips <= 0:
+            return
+
+        stats = self.search(highest_bet, call_amount)
+        # Robust child: the most visited action rather than the highest mean.
+        best_action = max(stats, key=lambda a: stats[a][0])
+
+        if call_amount >= self.chips:
+            if best_action == "fold":
+                self.fold()
+                if self.verbose:
+                    print(f"{self.name} folds (mcts).")
+            else:
+                self.place_bet(self.chips)
+                if self.verbose:
+                    print(f"{self.name} goes all-in (mcts).")
+            return
+
+        if best_action == "fold":
+            self.fold()
+            if self.verbose:
+                print(f"{self.name} folds (mcts).")
+        elif best_action == "call":
+            self.place_bet(call_amount)
+            if self.verbose:
+                print(f"{self.name} calls {call_amount} (mcts).")
+        else:
+            raise_amount = min(self.chips - call_amount, max(5, call_amount))
+            total_bet = call_amount + raise_amount
+            self.place_bet(total_bet)
+            if self.verbose:
+                print(f"{self.name} raises to {total_bet} (mcts).")
+
+    def search(self, highest_bet, call_amount):
+        """
+        Run the search and return merged root statistics {action: (visits, value_sum)}.
+        The player is not told the pot, so it is estimated from the highest bet.
+        """
+        pot = max(highest_bet * (self.num_opponents + 1), 2 * max(5, call_amount))
+        args = (self.hand, self.community_cards, self.chips, call_amount, pot, self.num_opponents,
+                self.exploration, self.time_budget, self.max_iterations)
+
+        if self.workers <= 1:
+            return mcts_search(*args, random.getrandbits(64))
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            # Release the worker processes even if close() is never called.
+            self._shutdown = weakref.finalize(self, self._executor.shutdown)
+        seeds = [random.getrandbits(64) for _ in range(self.workers)]
+        futures = [self._executor.submit(mcts_search, *args, seed) for seed in seeds]
+
+        merged = {}
+        for future in futures:
+            for action, (visits, value_sum) in future.result().items():
+                old_visits, old_sum = merged.get(action, (0, 0.0))
+                merged[action] = (old_visits + visits, old_sum + value_sum)
+        return merged
+
+    def close(self):
+        """Shut down the worker pool used for parallel rollouts."""
+        if self._shutdown is not None:
+            self._shutdown()
+            self._shutdown = None
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
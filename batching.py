@@ -0,0 +1,182 @@
+import threading
+import time
+
+import numpy as np
+
+
+class _Request:
+    __slots__ = ("features", "enqueued", "taken", "done", "result", "error")
+
+    def __init__(self, features):
+        self.features = features
+        self.enqueued = time.perf_counter()
+        self.taken = False
+        self.done = False
+        self.result = None
+        self.error = None
+
+
+class InferenceBatcher:
+    """
+    Turns per-decision model calls from many tables into batched ones. Each
+    table runs in its own thread (see play_concurrently); a player calls the
+    batcher with one feature vector and blocks, while the batcher stacks the
+    pending vectors and runs `model` once on the (n, features) array,
+    handing row i of the result back to the i-th caller.
+
+    A batch is flushed as soon as one of these holds:
+      - max_batch_size requests are pending,
+      - every registered client is waiting (nobody else can add to it),
+      - the oldest request has waited max_wait seconds (None never flushes
+        on time, which with registered clients gives one batch per
+        lockstep step, but blocks forever without them).
+
+    The thread that triggers a flush runs the model outside the lock, so
+    other tables keep queueing the next batch meanwhile.
+    """
+    def __init__(self, model, max_batch_size=64, max_wait=0.001):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.clients = 0
+        self.requests = 0
+        self.batches = 0
+        self.largest_batch = 0
+        self.wait_seconds = 0.0
+        self._pending = []
+        self._cond = threading.Condition()
+
+    def register(self, count=1):
+        with self._cond:
+            self.clients += count
+
+    def finished(self):
+        """A registered client is done; batches no longer wait for it."""
+        with self._cond:
+            self.clients -= 1
+            self._cond.notify_all()
+
+    def mean_batch(self):
+        return self.requests / self.batches if self.batches else 0.0
+
+    def __call__(self, features):
+        request = _Request(features)
+        with self._cond:
+            self._pending.append(request)
+            while not request.done:
+                batch = self._take_ready()
+                if batch:
+                    started = time.perf_counter()
+                    self._cond.release()
+                    try:
+                        self._run(batch)
+                    finally:
+                        self._cond.acquire()
+                    self.requests += len(batch)
+                    self.batches += 1
+                    self.largest_batch = max(self.largest_batch, len(batch))
+                    self.wait_seconds += sum(started - r.enqueued for r in batch)
+                    self._cond.notify_all()
+                    continue
+                # Once taken, the request is answered when its batch's model call returns.
+                self._cond.wait(None if request.taken else self._timeout())
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _timeout(self):
+        if self.max_wait is None:
+            return None
+        return max(0.0, self._pending[0].enqueued + self.max_wait - time.perf_counter())
+
+    def _take_ready(self):
+        """Pop a batch if one may be flushed now; called with the lock held."""
+        pending = self._pending
+        if not pending:
+            return None
+        full = len(pending) >= self.max_batch_size
+        everyone = self.clients > 0 and len(pending) >= self.clients
+        expired = self.max_wait is not None and time.perf_counter() - pending[0].enqueued >= self.max_wait
+        if not (full or everyone or expired):
+            return None
+        batch, self._pending = pending[:self.max_batch_size], pending[self.max_batch_size:]
+        for request in batch:
+            request.taken = True
+        return batch
+
+    def _run(self, batch):
+        try:
+            results = self.model(np.stack([request.features for request in batch]))
+            for request, result in zip(batch, results):
+                request.result = result
+        except Exception as error:
+            for request in batch:
+                request.error = error
+        for request in batch:
+            request.done = True
+
+
+def play_concurrently(games, rounds=1, batcher=None, before_round=None, after_round=None):
+    """
+    Play `rounds` rounds at every game, one thread per game, so decisions
+    from all tables can meet in `batcher`. Each thread is registered with
+    the batcher for as long as it runs. before_round(game, i) and
+    after_round(game, i), if given, run in the game's thread around each
+    round. The first exception raised at any table is re-raised once all
+    threads have stopped.
+    """
+    errors = []
+
+    def run(game):
+        try:
+            for i in range(rounds):
+                if before_round is not None:
+                    before_round(game, i)
+                game.play_round()
+                if after_round is not None:
+                    after_round(game, i)
+        except Exception as error:
+            errors.append(error)
+        finally:
+            if batcher is not None:
+                batcher.finished()
+
+    if batcher is not None:
+        batcher.register(len(games))
+    threads = [threading.Thread(target=run, args=(game,)) for game in games]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+if __name__ == "__main__":
+    import random
+
+    from self_play import PolicyNetwork, PolicyPlayer, num_features
+    from tournament import Tournament
+
+    # Batching only pays off once the model is a real share of a decision's
+    # cost next to equity bucketing and the game loop, hence the wide layer.
+    network = PolicyNetwork(num_features(8), hidden=8192, seed=1)
+    setups = (("per seat", None),
+              ("2ms wait", InferenceBatcher(network.probabilities, max_batch_size=64, max_wait=0.002)),
+              ("lockstep", InferenceBatcher(network.probabilities, max_batch_size=64, max_wait=None)))
+    for label, batcher in setups:
+        random.seed(1)
+        policy = batcher if batcher is not None else network
+        players = [PolicyPlayer(f"Player{i + 1}", chips=1500, policy=policy) for i in range(288)]
+        tournament = Tournament(players, seats_per_table=9, batcher=batcher)
+        start = time.perf_counter()
+        tournament.run(max_rounds=10)
+        elapsed = time.perf_counter() - start
+        line = f"{label:>9}: {tournament.hands_played / elapsed:,.0f} hands/s"
+        if batcher is not None:
+            line += (f", {batcher.requests:,} decisions in {batcher.batches:,} batches "
+                     f"(mean {batcher.mean_batch():.1f}, largest {batcher.largest_batch}, "
+                     f"mean wait {batcher.wait_seconds / max(1, batcher.requests) * 1000:.2f}ms)")
+        print(line)
@@ -0,0 +1,347 @@
+import math
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from card_enums import RANK, SUIT
+from multi_deck import MultiDeck
+from single_deck import SUIT_INDEX
+
+ACE = 11
+
+
+def blackjack_value(card):
+    """Ace counts 11 (reduced to 1 as needed), faces count 10."""
+    if card.rank == RANK.ACE:
+        return ACE
+    return min(card.value + 1, 10)
+
+
+def hand_total(values):
+    """Return (total, soft) for a list of blackjack card values."""
+    total = sum(values)
+    aces = values.count(ACE)
+    while total > 21 and aces:
+        total -= 10
+        aces -= 1
+    return total, aces > 0
+
+
+class BlackjackRules:
+    def __init__(self, decks=6, hit_soft_17=False, double_after_split=True, max_hands=4,
+                 surrender=True, penetration=0.75, blackjack_payout=1.5, resplit_aces=False):
+        if decks < 1:
+            raise ValueError("Number of decks must be greater than 0")
+        if not 0 < penetration < 1:
+            raise ValueError("Penetration must be between 0 and 1")
+        self.decks = decks
+        self.hit_soft_17 = hit_soft_17
+        self.double_after_split = double_after_split
+        self.max_hands = max_hands
+        self.surrender = surrender
+        self.penetration = penetration
+        self.blackjack_payout = blackjack_payout
+        self.resplit_aces = resplit_aces
+
+    def __str__(self):
+        return (f"{self.decks} decks, {'H17' if self.hit_soft_17 else 'S17'}, "
+                f"{'DAS' if self.double_after_split else 'no DAS'}, "
+                f"{'late surrender' if self.surrender else 'no surrender'}, "
+                f"{self.penetration:.0%} penetration")
+
+
+class Shoe:
+    """
+    A MultiDeck shoe with a cut card. Cards are dealt through a cursor over the
+    shuffled values instead of popping the front of the deck list, and the shoe
+    is reshuffled between rounds once the cut card has been reached.
+
+    The rank x suit composition of the undealt cards is updated in O(1) per
+    card (a flat Python list in the hot path; self.counts gives the same
+    layout as SingleDeck.counts), and any counting systems passed in are told
+    about every dealt card.
+    """
+    def __init__(self, rules, rng=None, counters=()):
+        self.rules = rules
+        self.rng = rng or random.Random()
+        self.deck = MultiDeck(rules.decks)
+        self.cut = int(len(self.deck.cards) * rules.penetration)
+        self.counters = list(counters)
+        self.shuffles = 0
+        self.shuffle()
+
+    def shuffle(self):
+        self.rng.shuffle(self.deck.cards)
+        self.values = [blackjack_value(c) for c in self.deck.cards]
+        self.slots = [c.value * len(SUIT) + SUIT_INDEX[c.suit] for c in self.deck.cards]
+        self._flat_counts = self.deck.counts.reshape(-1).tolist()
+        self.cursor = 0
+        self.shuffles += 1
+        for counter in self.counters:
+            counter.reset()
+
+    def draw(self):
+        cursor = self.cursor
+        self.cursor = cursor + 1
+        self._flat_counts[self.slots[cursor]] -= 1
+        if self.counters:
+            card = self.deck.cards[cursor]
+            for counter in self.counters:
+                counter.observe(card)
+        return self.values[cursor]
+
+    def needs_shuffle(self):
+        return self.cursor >= self.cut
+
+    def cards_remaining(self):
+        return len(self.values) - self.cursor
+
+    @property
+    def counts(self):
+        return np.array(self._flat_counts, dtype=np.int32).reshape(len(RANK), len(SUIT))
+
+    def rank_probability(self, rank):
+        """Probability that the next card dealt has this rank."""
+        remaining = self.cards_remaining()
+        start = rank.value * len(SUIT)
+        return sum(self._flat_counts[start:start + len(SUIT)]) / remaining if remaining else 0.0
+
+
+class BasicStrategy:
+    """
+    Table-driven multi-deck basic strategy. Action codes:
+      H hit, S stand, P split, D double (else hit), Ds double (else stand),
+      Rh/Rs/Rp surrender (else hit/stand/split).
+    Tables are indexed [total or pair value][dealer up card 2..11] for O(1) lookups.
+    """
+    def __init__(self, rules):
+        self.rules = rules
+        self.hard = [["H"] * 12 for _ in range(22)]
+        self.soft = [["H"] * 12 for _ in range(22)]
+        self.pair = [[None] * 12 for _ in range(12)]
+        h17 = rules.hit_soft_17
+
+        for up in range(2, 12):
+            for total in range(17, 22):
+                self.hard[total][up] = "S"
+            self.hard[9][up] = "D" if 3 <= up <= 6 else "H"
+            self.hard[10][up] = "D" if up <= 9 else "H"
+            self.hard[11][up] = "D" if up <= 10 or h17 else "H"
+            self.hard[12][up] = "S" if 4 <= up <= 6 else "H"
+            for total in range(13, 17):
+                self.hard[total][up] = "S" if up <= 6 else "H"
+
+            self.soft[13][up] = self.soft[14][up] = "D" if 5 <= up <= 6 else "H"
+            self.soft[15][up] = self.soft[16][up] = "D" if 4 <= up <= 6 else "H"
+            self.soft[17][up] = "D" if 3 <= up <= 6 else "H"
+            if 3 <= up <= 6 or (h17 and up == 2):
+                self.soft[18][up] = "Ds"
+            else:
+                self.soft[18][up] = "S" if up <= 8 else "H"
+            self.soft[19][up] = "Ds" if h17 and up == 6 else "S"
+            self.soft[20][up] = self.soft[21][up] = "S"
+
+            das = rules.double_after_split
+            self.pair[2][up] = self.pair[3][up] = "P" if (2 if das else 4) <= up <= 7 else None
+            self.pair[4][up] = "P" if das and 5 <= up <= 6 else None
+            self.pair[6][up] = "P" if (2 if das else 3) <= up <= 6 else None
+            self.pair[7][up] = "P" if up <= 7 else None
+            self.pair[8][up] = "P"
+            self.pair[9][up] = "P" if up <= 9 and up != 7 else None
+            self.pair[ACE][up] = "P"
+
+        if rules.surrender:
+            self.hard[15][10] = "Rh"
+            self.hard[16][9] = self.hard[16][10] = self.hard[16][ACE] = "Rh"
+            if h17:
+                self.hard[15][ACE] = "Rh"
+                self.hard[17][ACE] = "Rs"
+                self.pair[8][ACE] = "Rp"
+
+    def action(self, values, up, can_double, can_split, can_surrender):
+        if can_split and len(values) == 2 and values[0] == values[1]:
+            code = self.pair[values[0]][up]
+            if code == "Rp":
+                code = "R" if can_surrender else "P"
+            if code == "P":
+                return "P"
+
+        total, soft = hand_total(values)
+        code = (self.soft if soft else self.hard)[total][up]
+        if code[0] == "R":
+            if can_surrender:
+                return "R"
+            code = code[1].upper()
+        if code == "D":
+            return "D" if can_double else "H"
+        if code == "Ds":
+            return "D" if can_double else "S"
+        return code
+
+
+class BlackjackGame:
+    def __init__(self, rules=None, strategy=None, rng=None, counters=(), verbose=False):
+        self.rules = rules or BlackjackRules()
+        self.strategy = strategy or BasicStrategy(self.rules)
+        self.shoe = Shoe(self.rules, rng, counters)
+        self.verbose = verbose
+
+    def _dealer_plays(self, dealer):
+        draw = self.shoe.draw
+        while True:
+            total, soft = hand_total(dealer)
+            if total < 17 or (total == 17 and soft and self.rules.hit_soft_17):
+                dealer.append(draw())
+            else:
+                return total
+
+    def play_round(self, bet=1.0):
+        """
+        Play one round heads-up against the dealer and return the player's
+        net win in units of `bet`-sized chips (e.g. +1.5 for a blackjack).
+        """
+        if self.shoe.needs_shuffle():
+            self.shoe.shuffle()
+        draw = self.shoe.draw
+        rules = self.rules
+
+        player = [draw()]
+        dealer = [draw()]
+        player.append(draw())
+        dealer.append(draw())
+        up = dealer[0]
+
+        player_bj = hand_total(player)[0] == 21
+        dealer_bj = hand_total(dealer)[0] == 21
+        # The dealer peeks for blackjack, so nothing is lost to it beyond the original bet.
+        if dealer_bj:
+            return 0.0 if player_bj else -bet
+        if player_bj:
+            return rules.blackjack_payout * bet
+
+        # Each hand: [values, bet, split_aces]
+        hands = [[player, bet, False]]
+        finished = []
+        surrendered = 0.0
+        while hands:
+            values, stake, split_aces = hands.pop()
+            is_split = len(hands) + len(finished) > 0
+            while True:
+                if split_aces and len(values) == 2:
+                    # Split aces get one card each, unless they may be resplit.
+                    if not (rules.resplit_aces and values[1] == ACE
+                            and len(hands) + len(finished) + 1 < rules.max_hands):
+                        break
+                    hands.append([[ACE, draw()], stake, True])
+                    values = [ACE, draw()]
+                    continue
+                total, _ = hand_total(values)
+                if total >= 21:
+                    break
+                first_two = len(values) == 2
+                can_split = (first_two and values[0] == values[1]
+                             and len(hands) + len(finished) + 1 < rules.max_hands
+                             and (values[0] != ACE or not split_aces or rules.resplit_aces))
+                can_double = first_two and (not is_split or rules.double_after_split)
+                can_surrender = rules.surrender and first_two and not is_split
+                action = self.strategy.action(values, up, can_double, can_split, can_surrender)
+
+                if action == "S":
+                    break
+                if action == "H":
+                    values.append(draw())
+                elif action == "D":
+                    stake *= 2
+                    values.append(draw())
+                    break
+                elif action == "R":
+                    surrendered -= stake / 2
+                    values = None
+                    break
+                elif action == "P":
+                    card = values[0]
+                    hands.append([[card, draw()], stake, card == ACE])
+                    values = [card, draw()]
+                    split_aces = card == ACE
+                    is_split = True
+            if values is not None:
+                finished.append((values, stake))
+
+        live = [(values, stake) for values, stake in finished if hand_total(values)[0] <= 21]
+        dealer_total = self._dealer_plays(dealer) if live else 0
+
+        net = surrendered
+        for values, stake in finished:
+            total, _ = hand_total(values)
+            if total > 21:
+                net -= stake
+            elif dealer_total > 21 or total > dealer_total:
+                net += stake
+            elif total < dealer_total:
+                net -= stake
+        if self.verbose:
+            print(f"Player: {[v for v, _ in finished]}, dealer: {dealer} -> {net:+.1f}")
+        return net
+
+
+def simulate_rounds(rules, rounds, seed=None):
+    """Play `rounds` rounds and return (rounds, sum, sum of squares) of the net results."""
+    game = BlackjackGame(rules, rng=random.Random(seed))
+    play = game.play_round
+    total = 0.0
+    total_sq = 0.0
+    for _ in range(rounds):
+        net = play()
+        total += net
+        total_sq += net * net
+    return rounds, total, total_sq
+
+
+def simulate(rules=None, rounds=1_000_000, workers=1, seed=None, z=1.96):
+    """
+    Estimate the house edge of basic strategy under `rules`, splitting the
+    rounds across `workers` processes. Returns a dict with the edge (as a
+    fraction of the initial bet), its standard error and a confidence interval.
+    """
+    rules = rules or BlackjackRules()
+    rng = random.Random(seed)
+    if workers <= 1:
+        results = [simulate_rounds(rules, rounds, rng.getrandbits(64))]
+    else:
+        shares = [rounds // workers + (1 if i < rounds % workers else 0) for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(simulate_rounds, rules, n, rng.getrandbits(64)) for n in shares]
+            results = [future.result() for future in futures]
+
+    n = sum(r[0] for r in results)
+    total = sum(r[1] for r in results)
+    total_sq = sum(r[2] for r in results)
+    mean = total / n
+    variance = max(total_sq / n - mean * mean, 0.0) * n / max(n - 1, 1)
+    stderr = math.sqrt(variance / n)
+    edge = -mean
+    return {
+        "rounds": n,
+        "house_edge": edge,
+        "stderr": stderr,
+        "ci": (edge - z * stderr, edge + z * stderr),
+    }
+
+
+if __name__ == "__main__":
+    import time
+
+    rules = BlackjackRules(decks=6)
+    game = BlackjackGame(rules, verbose=True)
+    for _ in range(5):
+        game.play_round()
+    print("-" * 30)
+
+    start = time.perf_counter()
+    result = simulate(rules, rounds=200_000, workers=4, seed=1)
+    elapsed = time.perf_counter() - start
+    low, high = result["ci"]
+    print(f"Rules: {rules}")
+    print(f"House edge over {result['rounds']:,} rounds: {result['house_edge']:.3%} "
+          f"(95% CI {low:.3%} to {high:.3%}), {result['rounds'] / elapsed * 60:,.0f} rounds/min")
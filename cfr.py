@@ -0,0 +1,416 @@
+import json
+import os
+import random
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from ai_player import simulate_showdown
+from card_enums import BUTTON, PHASE
+from dealer import Dealer
+from evaluator import Evaluator
+from isomorphism import canonical_index
+from player import Player
+from single_deck import SingleDeck
+
+# Abstract heads-up limit game in big-blind units: SB = 1, BB = 2, bets of 2 on
+# pre-flop/flop and 4 on turn/river, at most raise_cap bets per street.
+STREETS = [PHASE.PF, PHASE.FLOP, PHASE.TURN, PHASE.RIVER]
+BOARD_SIZES = [0, 3, 4, 5]
+BET_SIZES = [2, 2, 4, 4]
+ACTIONS = ("fold", "call", "raise")
+
+NOT_TERMINAL = 0
+FOLD = 1
+SHOWDOWN = 2
+
+
+class HandStrengthBucketer:
+    """
+    Card abstraction: bucket = equity against one random hand, estimated with
+    `samples` headless rollouts and split into n_buckets equal-width bins.
+    Rollouts draw from the bucketer's own Random(seed).
+    """
+    def __init__(self, n_buckets=8, samples=16, max_cache=200_000, seed=None):
+        self.n_buckets = n_buckets
+        self.samples = samples
+        self.max_cache = max_cache
+        self.rng = random.Random(seed)
+        self._cache = {}
+
+    def bucket(self, hole, board):
+        # Suit-isomorphic situations share one cache entry.
+        key = (len(board), canonical_index(hole, board))
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        hole, board = list(hole), list(board)
+        equity = sum(simulate_showdown(hole, board, 1, self.rng) for _ in range(self.samples)) / self.samples
+        result = min(self.n_buckets - 1, int(equity * self.n_buckets))
+
+        if len(self._cache) >= self.max_cache:
+            self._cache.clear()
+        self._cache[key] = result
+        return result
+
+
+class BettingTree:
+    """
+    The full betting tree of the abstract game, flattened into arrays so that
+    every decision node has a dense id usable as a row into the CFR tables.
+    Player 0 is the small blind and acts first pre-flop; player 1 (big blind)
+    acts first after the flop, as in TexasHoldemGame._first_to_act.
+    """
+    def __init__(self, raise_cap=3):
+        self.raise_cap = raise_cap
+        self.player = []
+        self.street = []
+        self.to_call = []
+        self.terminal = []
+        self.payoff = []
+        self.children = []
+        self._build(0, (1, 2), 0, 1, 0)
+
+        self.player = np.array(self.player, dtype=np.int8)
+        self.street = np.array(self.street, dtype=np.int8)
+        self.to_call = np.array(self.to_call, dtype=np.int16)
+        self.terminal = np.array(self.terminal, dtype=np.int8)
+        self.payoff = np.array(self.payoff, dtype=np.int16)
+        self.children = np.array(self.children, dtype=np.int32)
+        self.legal = self.children >= 0
+
+    def __len__(self):
+        return len(self.player)
+
+    def _new_node(self, player, street, to_call, terminal, payoff):
+        self.player.append(player)
+        self.street.append(street)
+        self.to_call.append(to_call)
+        self.terminal.append(terminal)
+        self.payoff.append(payoff)
+        self.children.append([-1, -1, -1])
+        return len(self.player) - 1
+
+    def _build(self, street, contrib, actor, bets, acted):
+        opp = 1 - actor
+        to_call = contrib[opp] - contrib[actor]
+        node = self._new_node(actor, street, to_call, NOT_TERMINAL, 0)
+
+        if to_call > 0:
+            # Folding forfeits everything the actor has put in so far.
+            lost = contrib[actor]
+            payoff = -lost if actor == 0 else lost
+            self.children[node][0] = self._new_node(-1, street, 0, FOLD, payoff)
+
+        called = list(contrib)
+        called[actor] += to_call
+        if acted >= 1:
+            self.children[node][1] = self._end_street(street, tuple(called))
+        else:
+            self.children[node][1] = self._build(street, tuple(called), opp, bets, acted + 1)
+
+        if bets < self.raise_cap:
+            raised = list(contrib)
+            raised[actor] = contrib[opp] + BET_SIZES[street]
+            self.children[node][2] = self._build(street, tuple(raised), opp, bets + 1, acted + 1)
+        return node
+
+    def _end_street(self, street, contrib):
+        if street == len(STREETS) - 1:
+            # Stakes are equal at showdown; payoff is the amount either side risks.
+            return self._new_node(-1, street, 0, SHOWDOWN, contrib[0])
+        return self._build(street + 1, contrib, 1, 0, 0)
+
+
+class CFRTrainer:
+    """
+    External-sampling Monte Carlo CFR (CFR+ when plus=True) for the abstract
+    heads-up game. Regrets and cumulative strategies are float32 arrays of
+    shape (nodes, buckets, 3), so lookups at play time are plain indexing.
+    """
+    def __init__(self, n_buckets=8, bucketer=None, plus=True, raise_cap=3):
+        self.bucketer = bucketer if bucketer is not None else HandStrengthBucketer(n_buckets)
+        self.n_buckets = self.bucketer.n_buckets
+        self.plus = plus
+        self.raise_cap = raise_cap
+        self.tree = BettingTree(raise_cap)
+        shape = (len(self.tree), self.n_buckets, len(ACTIONS))
+        self.regrets = np.zeros(shape, dtype=np.float32)
+        self.strategy_sum = np.zeros(shape, dtype=np.float32)
+        self.iterations = 0
+        self._average = None
+        self._dealer = Dealer()
+        self._seats = [Player("P0"), Player("P1")]
+
+    def _deal(self, rng):
+        """
+        Deal one chance outcome with the project's Dealer (burns included),
+        shuffled by `rng`, and return the per-street buckets and the showdown
+        result for player 0.
+        """
+        # A fresh deck shuffled by rng alone, so deals follow the training seed.
+        self._dealer.deck = SingleDeck()
+        self._dealer.community_cards = []
+        rng.shuffle(self._dealer.deck.cards)
+        for seat in self._seats:
+            seat.reset_hand()
+        self._dealer.deal_hole_cards(self._seats)
+        for count in (3, 1, 1):
+            self._dealer.deal_community_cards(count, None)
+        board = self._dealer.community_cards
+
+        buckets = [[self.bucketer.bucket(seat.hand, board[:size]) for size in BOARD_SIZES]
+                   for seat in self._seats]
+        rank0 = Evaluator.evaluate_hand(self._seats[0], board)
+        rank1 = Evaluator.evaluate_hand(self._seats[1], board)
+        result = (rank0 > rank1) - (rank0 < rank1)
+        return buckets, result
+
+    def current_strategy(self, node, bucket):
+        legal = self.tree.legal[node]
+        positive = np.where(legal, np.maximum(self.regrets[node, bucket], 0.0), 0.0)
+        total = positive.sum()
+        if total > 0:
+            return positive / total
+        return legal / legal.sum()
+
+    def _traverse(self, node, traverser, buckets, result, rng):
+        tree = self.tree
+        kind = tree.terminal[node]
+        if kind != NOT_TERMINAL:
+            utility = float(tree.payoff[node]) if kind == FOLD else float(tree.payoff[node] * result)
+            return utility if traverser == 0 else -utility
+
+        actor = tree.player[node]
+        bucket = buckets[actor][tree.street[node]]
+        strategy = self.current_strategy(node, bucket)
+        children = tree.children[node]
+
+        if actor != traverser:
+            weight = self.iterations + 1 if self.plus else 1
+            self.strategy_sum[node, bucket] += weight * strategy
+            action = rng.choices(range(len(ACTIONS)), weights=strategy)[0]
+            return self._traverse(children[action], traverser, buckets, result, rng)
+
+        utils = np.zeros(len(ACTIONS), dtype=np.float32)
+        for action in range(len(ACTIONS)):
+            if children[action] >= 0:
+                utils[action] = self._traverse(children[action], traverser, buckets, result, rng)
+        node_util = float(strategy @ utils)
+
+        regrets = self.regrets[node, bucket]
+        regrets += np.where(tree.legal[node], utils - node_util, 0.0)
+        if self.plus:
+            np.maximum(regrets, 0.0, out=regrets)
+        return node_util
+
+    def train(self, iterations, workers=1, chunk=None, seed=None):
+        """
+        Run `iterations` sampled iterations (both players traverse once each).
+        With workers > 1 the work is split into chunks run on copies of the
+        tables in separate processes; their regret and strategy deltas are
+        summed back into this trainer after every round of chunks.
+
+        Tables loaded read-only (CFRTrainer.load with mmap=True) are copied
+        into memory first, so training can resume from any checkpoint.
+        """
+        if not self.regrets.flags.writeable:
+            self.regrets = np.array(self.regrets)
+        if not self.strategy_sum.flags.writeable:
+            self.strategy_sum = np.array(self.strategy_sum)
+        self._average = None
+        rng = random.Random(seed)
+        if workers <= 1:
+            self._run(iterations, rng)
+            return
+
+        chunk = chunk or max(1, iterations // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            remaining = iterations
+            while remaining > 0:
+                sizes = []
+                for _ in range(workers):
+                    if remaining <= 0:
+                        break
+                    sizes.append(min(chunk, remaining))
+                    remaining -= sizes[-1]
+                futures = [pool.submit(_train_worker, self, size, rng.getrandbits(64)) for size in sizes]
+                for future in futures:
+                    regret_delta, strategy_delta = future.result()
+                    self.regrets += regret_delta
+                    self.strategy_sum += strategy_delta
+                if self.plus:
+                    np.maximum(self.regrets, 0.0, out=self.regrets)
+                self.iterations += sum(sizes)
+
+    def _run(self, iterations, rng):
+        for _ in range(iterations):
+            buckets, result = self._deal(rng)
+            for traverser in (0, 1):
+                self._traverse(0, traverser, buckets, result, rng)
+            self.iterations += 1
+
+    def average_strategy(self):
+        """
+        Normalized average strategy table; uniform over legal actions where
+        unvisited. A trainer loaded from a checkpoint returns the saved table
+        (memory-mapped with mmap=True) until it trains again.
+        """
+        if self._average is not None:
+            return self._average
+        totals = self.strategy_sum.sum(axis=2, keepdims=True)
+        uniform = self.tree.legal / np.maximum(self.tree.legal.sum(axis=1, keepdims=True), 1)
+        uniform = np.broadcast_to(uniform[:, None, :], self.strategy_sum.shape)
+        safe = np.where(totals > 0, totals, 1.0)
+        return np.where(totals > 0, self.strategy_sum / safe, uniform).astype(np.float32)
+
+    def save(self, path):
+        """
+        Write a checkpoint directory: raw .npy tables (memory-mappable) plus a
+        small JSON header. The tables of each save get fresh file names that
+        only meta.json, renamed into place last, points to, so a crash at any
+        point leaves the previous checkpoint intact and loadable. Tables of
+        older saves are removed once the new header is in place.
+        """
+        os.makedirs(path, exist_ok=True)
+        generation = uuid.uuid4().hex[:12]
+        tables = {
+            "regrets": self.regrets,
+            "strategy_sum": self.strategy_sum,
+            "average_strategy": self.average_strategy(),
+        }
+        files = {name: f"{name}.{generation}.npy" for name in tables}
+        for name, table in tables.items():
+            with open(os.path.join(path, files[name]), "wb") as f:
+                np.save(f, table)
+
+        meta = {
+            "n_buckets": self.n_buckets,
+            "plus": self.plus,
+            "raise_cap": self.raise_cap,
+            "iterations": self.iterations,
+            "files": files,
+        }
+        tmp = os.path.join(path, "meta.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, os.path.join(path, "meta.json"))
+
+        for filename in os.listdir(path):
+            if filename.endswith(".npy") and filename not in files.values():
+                os.remove(os.path.join(path, filename))
+
+    @staticmethod
+    def load(path, bucketer=None, mmap=True):
+        """
+        Load a checkpoint. With mmap=True the tables, including the saved
+        average strategy that CFRPlayer plays from, are memory-mapped
+        read-only, so many processes can share one copy of a large strategy;
+        train() copies them into memory before resuming.
+        """
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        files = meta.get("files") or {name: f"{name}.npy" for name in ("regrets", "strategy_sum", "average_strategy")}
+        trainer = CFRTrainer(meta["n_buckets"], bucketer=bucketer, plus=meta["plus"], raise_cap=meta["raise_cap"])
+        mode = "r" if mmap else None
+        tables = {name: np.load(os.path.join(path, filename), mmap_mode=mode) for name, filename in files.items()}
+        shape = trainer.regrets.shape
+        for name, table in tables.items():
+            if table.shape != shape:
+                raise ValueError(f"Checkpoint table {name} has shape {table.shape}, expected {shape}")
+        trainer.regrets = tables["regrets"]
+        trainer.strategy_sum = tables["strategy_sum"]
+        trainer._average = tables["average_strategy"]
+        trainer.iterations = meta["iterations"]
+        return trainer
+
+
+def _train_worker(trainer, iterations, seed):
+    """Run a chunk of iterations on a private copy and return the table deltas."""
+    regrets = trainer.regrets.copy()
+    strategy_sum = trainer.strategy_sum.copy()
+    trainer._run(iterations, random.Random(seed))
+    return trainer.regrets - regrets, trainer.strategy_sum - strategy_sum
+
+
+class CFRPlayer(Player):
+    __slots__ = ("bucketer", "strategy", "play_nodes")
+
+    def __init__(self, name, chips=1000, community_cards=None, position=BUTTON.PLAYER, verbose=False,
+                 trainer=None, checkpoint=None):
+        """
+        Plays the average strategy of a trained CFRTrainer, given directly or
+        loaded from a checkpoint directory written by CFRTrainer.save.
+        """
+        super().__init__(name, chips=chips, community_cards=community_cards, position=position, verbose=verbose)
+        if trainer is None:
+            if checkpoint is None:
+                raise ValueError("CFRPlayer needs a trainer or a checkpoint")
+            trainer = CFRTrainer.load(checkpoint)
+        self.bucketer = trainer.bucketer
+        # A loaded trainer hands back its memory-mapped table, so nothing is copied here.
+        self.strategy = trainer.average_strategy()
+
+        # The real game does not report the betting history, so each
+        # (street, facing a bet) situation maps to the first matching node of
+        # the tree in build order, which is the shortest line reaching it.
+        tree = trainer.tree
+        self.play_nodes = np.zeros((len(STREETS), 2), dtype=np.int32)
+        found = np.zeros((len(STREETS), 2), dtype=bool)
+        for node in range(len(tree)):
+            if tree.terminal[node] != NOT_TERMINAL:
+                continue
+            street, facing = tree.street[node], int(tree.to_call[node] > 0)
+            if not found[street, facing]:
+                self.play_nodes[street, facing] = node
+                found[street, facing] = True
+
+    def make_decision(self, highest_bet, call_amount):
+        if self.folded or self.chips <= 0:
+            return
+
+        street = BOARD_SIZES.index(len(self.community_cards))
+        node = self.play_nodes[street, int(call_amount > 0)]
+        bucket = self.bucketer.bucket(self.hand, self.community_cards)
+        probs = self.strategy[node, bucket]
+        action = ACTIONS[random.choices(range(len(ACTIONS)), weights=probs)[0]]
+
+        if action == "fold" and call_amount == 0:
+            action = "call"
+
+        if call_amount >= self.chips:
+            if action == "fold":
+                self.fold()
+                if self.verbose:
+                    print(f"{self.name} folds (cfr).")
+            else:
+                self.place_bet(self.chips)
+                if self.verbose:
+                    print(f"{self.name} goes all-in (cfr).")
+            return
+
+        if action == "fold":
+            self.fold()
+            if self.verbose:
+                print(f"{self.name} folds (cfr).")
+        elif action == "call":
+            self.place_bet(call_amount)
+            if self.verbose:
+                print(f"{self.name} calls {call_amount} (cfr).")
+        else:
+            raise_amount = min(self.chips - call_amount, max(5, call_amount))
+            total_bet = call_amount + raise_amount
+            self.place_bet(total_bet)
+            if self.verbose:
+                print(f"{self.name} raises to {total_bet} (cfr).")
+
+
+if __name__ == "__main__":
+    trainer = CFRTrainer(n_buckets=5, bucketer=HandStrengthBucketer(5, samples=8))
+    print(f"Betting tree nodes: {len(trainer.tree)}")
+    trainer.train(200)
+    print(f"Trained {trainer.iterations} iterations")
+    print("Average pre-flop strategy for the small blind by bucket (fold/call/raise):")
+    print(trainer.average_strategy()[0])
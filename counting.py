@@ -0,0 +1,78 @@
+from card_enums import RANK
+
+class CountingSystem:
+    """
+    Base class for card-counting systems. TAGS maps rank.value -> tag (ACE is
+    index 0), and every observed card updates the running count in O(1).
+    Attach an instance to a deck with SingleDeck.attach_counter (or pass it to
+    a blackjack Shoe) and it is told about every card that leaves the deck.
+    """
+    name = "Base"
+    TAGS = [0] * len(RANK)
+    balanced = True
+
+    def __init__(self, decks=1):
+        self.decks = decks
+        self.reset()
+
+    def initial_count(self):
+        return 0
+
+    def reset(self):
+        self.running_count = self.initial_count()
+        self.cards_seen = 0
+
+    def observe(self, card, sign=1):
+        """sign=1 for a card leaving the deck, -1 for a card put back."""
+        self.running_count += sign * self.TAGS[card.value]
+        self.cards_seen += sign
+
+    def true_count(self, cards_remaining):
+        """Running count per deck remaining; unbalanced systems report the running count."""
+        if not self.balanced:
+            return self.running_count
+        decks_remaining = cards_remaining / 52
+        if decks_remaining <= 0:
+            return 0.0
+        return self.running_count / decks_remaining
+
+
+class HiLo(CountingSystem):
+    name = "Hi-Lo"
+    #       A   2  3  4  5  6  7  8  9  10  J   Q   K
+    TAGS = [-1, 1, 1, 1, 1, 1, 0, 0, 0, -1, -1, -1, -1]
+
+
+class KO(CountingSystem):
+    name = "Knock-Out"
+    TAGS = [-1, 1, 1, 1, 1, 1, 1, 0, 0, -1, -1, -1, -1]
+    balanced = False
+
+    def initial_count(self):
+        # Standard initial running count, so the key count is the same for any shoe size.
+        return 4 - 4 * self.decks
+
+
+class OmegaII(CountingSystem):
+    name = "Omega II"
+    TAGS = [0, 1, 1, 2, 2, 2, 1, 0, -1, -2, -2, -2, -2]
+
+
+class ZenCount(CountingSystem):
+    name = "Zen Count"
+    TAGS = [-1, 1, 1, 2, 2, 2, 1, 0, 0, -2, -2, -2, -2]
+
+
+if __name__ == "__main__":
+    from single_deck import SingleDeck
+
+    deck = SingleDeck()
+    deck.shuffle()
+    hilo = HiLo()
+    deck.attach_counter(hilo)
+
+    for _ in range(20):
+        deck.draw_card()
+    print(f"After 20 cards: Hi-Lo running count {hilo.running_count}, "
+          f"true count {hilo.true_count(len(deck.cards)):.2f}")
+    print(f"P(next card is a King): {deck.rank_probability(RANK.KING):.4f}")
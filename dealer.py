@@ -2,21 +2,23 @@ from multi_deck import MultiDeck
 from single_deck import SingleDeck
 from card_enums import BUTTON
 from player import Player
+from ruleset import STANDARD
 
 class Dealer:
-    def __init__(self, num_decks=1):
+    def __init__(self, num_decks=1, ruleset=None):
+        self.ruleset = ruleset or STANDARD
         if num_decks < 1:
             raise ValueError("Number of decks must be greater than 0")
         elif num_decks < 2:
-            self.deck = SingleDeck()
+            self.deck = SingleDeck(self.ruleset)
         else:
-            self.deck = MultiDeck(num_decks)
+            self.deck = MultiDeck(num_decks, self.ruleset)
 
         self.deck.shuffle()
         self.community_cards = []
 
-    def deal_hole_cards(self, players):
-        for _ in range(2):
+    def deal_hole_cards(self, players, count=2):
+        for _ in range(count):
             for player in players:
                 player.receive_cards([self.deck.draw_card()])
 
@@ -29,14 +31,15 @@ class Dealer:
             for player in players:
                 # Make a copy to avoid unintended modifications.
                 player.community_cards = self.community_cards.copy()
+                player.observe_board(new_cards)
 
     def reset_deck(self, num_decks=1):
         if num_decks < 1:
             raise ValueError("Number of decks must be greater than 0")
         elif num_decks < 2:
-            self.deck = SingleDeck()
+            self.deck = SingleDeck(self.ruleset)
         else:
-            self.deck = MultiDeck(num_decks)
+            self.deck = MultiDeck(num_decks, self.ruleset)
         self.deck.shuffle()
         self.community_cards = []
 
@@ -0,0 +1,220 @@
+import random
+import re
+from itertools import combinations
+
+import numpy as np
+
+from card_enums import RANK, SUIT
+from evaluator import CachedEvaluator
+from isomorphism import NUM_RANKS, SUITS, card_id, id_to_card
+
+RANK_CHARS = "23456789TJQKA"
+SUIT_CHARS = "hdcs"
+CHAR_TO_RANK = {"A": RANK.ACE, "K": RANK.KING, "Q": RANK.QUEEN, "J": RANK.JACK, "T": RANK.TEN,
+                "9": RANK.NINE, "8": RANK.EIGHT, "7": RANK.SEVEN, "6": RANK.SIX, "5": RANK.FIVE,
+                "4": RANK.FOUR, "3": RANK.THREE, "2": RANK.TWO}
+CHAR_TO_SUIT = {"h": SUIT.HEARTS, "d": SUIT.DIAMONDS, "c": SUIT.CLUBS, "s": SUIT.SPADES}
+RANK_TO_CHAR = {rank: char for char, rank in CHAR_TO_RANK.items()}
+SUIT_TO_CHAR = {suit: char for char, suit in CHAR_TO_SUIT.items()}
+
+_TOKEN = re.compile(r"^(?:(\d+(?:\.\d+)?)%\s*)?(.+)$")
+
+
+def _card(rank_char, suit_char):
+    return SUITS.index(CHAR_TO_SUIT[suit_char]) * NUM_RANKS + CHAR_TO_RANK[rank_char].value
+
+
+def card_str(cid):
+    card = id_to_card(cid)
+    return RANK_TO_CHAR[card.rank] + SUIT_TO_CHAR[card.suit]
+
+
+def combo_str(combo):
+    """Two card ids as e.g. 'AhKh', higher rank first."""
+    return "".join(sorted((card_str(c) for c in combo), key=lambda s: -RANK_CHARS.index(s[0])))
+
+
+def _hand_class_combos(high, low, kind):
+    """All combos of a hand class such as ('A', 'K', 's'), ('Q', 'Q', '') or ('A', 'Q', 'o')."""
+    combos = []
+    if high == low:
+        for s1, s2 in combinations(SUIT_CHARS, 2):
+            combos.append((_card(high, s1), _card(low, s2)))
+        return combos
+    for s1 in SUIT_CHARS:
+        for s2 in SUIT_CHARS:
+            if kind == "s" and s1 != s2:
+                continue
+            if kind == "o" and s1 == s2:
+                continue
+            combos.append((_card(high, s1), _card(low, s2)))
+    return combos
+
+
+def _expand_token(token):
+    """Hand classes covered by one token: 'QQ+', 'ATs+', '22-55', 'A2s-A5s', 'AKo', 'AhKh'."""
+    if re.fullmatch(r"[2-9TJQKA][hdcs][2-9TJQKA][hdcs]", token):
+        return [((_card(token[0], token[1]), _card(token[2], token[3])),)]
+
+    match = re.fullmatch(r"([2-9TJQKA])([2-9TJQKA])([so]?)(\+?)(?:-([2-9TJQKA])([2-9TJQKA])([so]?))?", token)
+    if not match:
+        raise ValueError(f"Cannot parse range token: {token}")
+    a, b, kind, plus, end_a, end_b, end_kind = match.groups()
+    if RANK_CHARS.index(a) < RANK_CHARS.index(b):
+        a, b = b, a
+    if a == b and kind:
+        raise ValueError(f"Pairs cannot be suited or offsuit: {token}")
+
+    classes = []
+    if end_a:
+        if RANK_CHARS.index(end_a) < RANK_CHARS.index(end_b):
+            end_a, end_b = end_b, end_a
+        if end_kind != kind or (a == b) != (end_a == end_b) or (a != b and a != end_a):
+            raise ValueError(f"Inconsistent range bounds: {token}")
+        lo, hi = sorted((RANK_CHARS.index(b), RANK_CHARS.index(end_b)))
+        for i in range(lo, hi + 1):
+            classes.append((RANK_CHARS[i], RANK_CHARS[i], kind) if a == b else (a, RANK_CHARS[i], kind))
+    elif plus:
+        if a == b:
+            for i in range(RANK_CHARS.index(a), len(RANK_CHARS)):
+                classes.append((RANK_CHARS[i], RANK_CHARS[i], ""))
+        else:
+            for i in range(RANK_CHARS.index(b), RANK_CHARS.index(a)):
+                classes.append((a, RANK_CHARS[i], kind))
+    else:
+        classes.append((a, b, kind))
+    return [tuple(_hand_class_combos(*cls)) for cls in classes]
+
+
+def parse_range(text):
+    """
+    Parse a comma-separated range such as "QQ+, AKs, 50% AQo, AhKh" into a
+    dict {(card_id, card_id): weight}. A leading percentage weights every
+    combo of that token; if a combo appears twice the larger weight wins.
+    """
+    weights = {}
+    for raw in text.split(","):
+        raw = raw.strip()
+        if not raw:
+            continue
+        percent, token = _TOKEN.match(raw).groups()
+        weight = float(percent) / 100 if percent is not None else 1.0
+        if not 0 <= weight <= 1:
+            raise ValueError(f"Weight must be between 0% and 100%: {raw}")
+        for combos in _expand_token(token.strip()):
+            for combo in combos:
+                combo = tuple(sorted(combo))
+                weights[combo] = max(weight, weights.get(combo, 0.0))
+    return weights
+
+
+def _runouts(board_ids, dead, runouts, rng):
+    missing = 5 - len(board_ids)
+    live = [c for c in range(52) if c not in dead]
+    if runouts is None:
+        for extra in combinations(live, missing):
+            yield board_ids + list(extra)
+    else:
+        for _ in range(runouts):
+            yield board_ids + rng.sample(live, missing)
+
+
+def range_vs_range(range1, range2, board=(), runouts=None, block=256, seed=None):
+    """
+    Weighted equity of range1 against range2 (dicts from parse_range).
+
+    runouts=None enumerates every board completion, otherwise that many
+    completions are sampled. For each runout every distinct combo of either
+    range is scored once (the board-only five cards are memoized and shared by
+    all combos), then the combo x combo comparisons for a block of runouts are
+    done as one NumPy broadcast over a (combos1, combos2, runouts) array.
+    Card-conflicting combo pairs, and combos that collide with the runout,
+    get zero weight.
+
+    Returns {"equity": (e1, e2), "combo_equity1": {...}, "combo_equity2": {...},
+    "runouts": n}.
+    """
+    rng = random.Random(seed)
+    board_ids = [card_id(c) for c in board]
+    dead = set(board_ids)
+    combos1 = [c for c in range1 if not dead.intersection(c) and range1[c] > 0]
+    combos2 = [c for c in range2 if not dead.intersection(c) and range2[c] > 0]
+    if not combos1 or not combos2:
+        raise ValueError("A range has no combos left after removing board cards")
+
+    w1 = np.array([range1[c] for c in combos1], dtype=np.float64)
+    w2 = np.array([range2[c] for c in combos2], dtype=np.float64)
+    pair_ok = np.array([[not set(a).intersection(b) for b in combos2] for a in combos1])
+    base = w1[:, None] * w2[None, :] * pair_ok
+
+    unique = sorted(set(combos1) | set(combos2))
+    pos = {combo: i for i, combo in enumerate(unique)}
+    rows1 = np.array([pos[c] for c in combos1])
+    rows2 = np.array([pos[c] for c in combos2])
+    hole_cards = [[id_to_card(c) for c in combo] for combo in unique]
+
+    # Keep the (combos1, combos2, runouts) block to a few million cells.
+    block = max(1, min(block, 4_000_000 // (len(combos1) * len(combos2))))
+
+    num1 = np.zeros(len(combos1))
+    den1 = np.zeros(len(combos1))
+    num2 = np.zeros(len(combos2))
+    den2 = np.zeros(len(combos2))
+    count = 0
+
+    def flush(scores):
+        # scores: (unique combos, runouts in block); -1 marks a card collision.
+        s1 = scores[rows1]
+        s2 = scores[rows2]
+        valid = (s1[:, None, :] >= 0) & (s2[None, :, :] >= 0)
+        weight = base[:, :, None] * valid
+        wins = (s1[:, None, :] > s2[None, :, :]) + 0.5 * (s1[:, None, :] == s2[None, :, :])
+        won = (weight * wins).sum(axis=2)
+        total = weight.sum(axis=2)
+        num1[:] += won.sum(axis=1)
+        den1[:] += total.sum(axis=1)
+        num2[:] += (total - won).sum(axis=0)
+        den2[:] += total.sum(axis=0)
+
+    columns = []
+    for full_board in _runouts(board_ids, dead, runouts, rng):
+        board_cards = [id_to_card(c) for c in full_board]
+        board_set = set(full_board)
+        ranks = {}
+        column = []
+        for combo, cards in zip(unique, hole_cards):
+            if board_set.intersection(combo):
+                column.append(None)
+                continue
+            rank = CachedEvaluator.best_hand_rank(cards + board_cards)
+            ranks[rank] = None
+            column.append(rank)
+        # Scores only need to order hands within one runout: use dense ranks.
+        order = {rank: i for i, rank in enumerate(sorted(ranks))}
+        columns.append([order[r] if r is not None else -1 for r in column])
+        count += 1
+        if len(columns) == block:
+            flush(np.array(columns, dtype=np.int32).T)
+            columns = []
+    if columns:
+        flush(np.array(columns, dtype=np.int32).T)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        eq1 = np.where(den1 > 0, num1 / den1, np.nan)
+        eq2 = np.where(den2 > 0, num2 / den2, np.nan)
+    total = den1.sum()
+    overall = float(num1.sum() / total) if total else float("nan")
+    return {
+        "equity": (overall, 1 - overall),
+        "combo_equity1": {combo_str(c): float(e) for c, e in zip(combos1, eq1)},
+        "combo_equity2": {combo_str(c): float(e) for c, e in zip(combos2, eq2)},
+        "runouts": count,
+    }
+
+
+if __name__ == "__main__":
+    hero = parse_range("QQ+, AKs")
+    villain = parse_range("TT+, AQs+, 50% AQo")
+    print(f"Hero combos: {len(hero)}, villain combos: {len(villain)}")
+    result = range_vs_range(hero, villain, runouts=200, seed=1)
+    print(f"Equity over {result['runouts']} runouts: hero {result['equity'][0]:.3f}, villain {result['equity'][1]:.3f}")
@@ -1,5 +1,8 @@
+import sys
+import threading
 from itertools import combinations
-from collections import Counter
+from collections import OrderedDict
+from card_enums import RANK, SUIT
 
 class Evaluator:
     HAND_RANKS = {
@@ -23,45 +26,35 @@ class Evaluator:
         else:
             return rank_index + 1
 
+    @staticmethod
+    def analyze(cards):
+        return HandAnalysis(cards)
+
+    # The is_* / get_*_info helpers are kept for callers that test a single
+    # category; each is one HandAnalysis, so get_hand_rank uses that directly.
+
     # FOUR OF A KIND
     @staticmethod
     def is_four_of_a_kind(cards):
-        vals = [Evaluator.card_value(c) for c in cards]
-        counts = Counter(vals)
-        return any(count >= 4 for count in counts.values())
+        return HandAnalysis(cards).four_of_a_kind() is not None
 
     @staticmethod
     def get_four_of_a_kind_info(cards):
-        vals = [Evaluator.card_value(c) for c in cards]
-        counts = Counter(vals)
-        four_rank = max(rank for rank, count in counts.items() if count >= 4)
-        kicker_candidates = [r for r, cnt in counts.items() if r != four_rank]
-        kicker = max(kicker_candidates) if kicker_candidates else 0
-        return (four_rank, kicker)
+        return HandAnalysis(cards).four_of_a_kind_info()
 
     # FULL HOUSE
     @staticmethod
     def is_full_house(cards):
-        vals = [Evaluator.card_value(c) for c in cards]
-        counts = Counter(vals)
-        has_three = any(count >= 3 for count in counts.values())
-        pairs = [rank for rank, cnt in counts.items() if cnt >= 2]
-        return has_three and len(pairs) >= 2
+        return HandAnalysis(cards).full_house() is not None
 
     @staticmethod
     def get_full_house_info(cards):
-        vals = [Evaluator.card_value(c) for c in cards]
-        counts = Counter(vals)
-        three_rank = max(r for r, cnt in counts.items() if cnt >= 3)
-        pair_candidates = [r for r, cnt in counts.items() if r != three_rank and cnt >= 2]
-        pair_rank = max(pair_candidates) if pair_candidates else 0
-        return (three_rank, pair_rank)
+        return HandAnalysis(cards).full_house_info()
 
     # FLUSH
     @staticmethod
     def is_flush(cards):
-        suits = [c.suit for c in cards]
-        return len(set(suits)) == 1
+        return HandAnalysis(cards).flush
 
     @staticmethod
     def get_flush_cards(cards):
@@ -70,79 +63,47 @@ class Evaluator:
     # STRAIGHT
     @staticmethod
     def is_straight(cards):
-        values = sorted({Evaluator.card_value(c) for c in cards})
-        if len(values) < 5:
-            return False
-        for i in range(len(values) - 4):
-            if values[i + 4] - values[i] == 4:
-                return True
-        if {14, 2, 3, 4, 5}.issubset(values):
-            return True
-        return False
+        return HandAnalysis(cards).straight_high != 0
 
     @staticmethod
     def get_highest_straight_card(cards):
-        values = sorted({Evaluator.card_value(c) for c in cards})
-        for i in range(len(values) - 4):
-            if values[i + 4] - values[i] == 4:
-                return values[i+4]
-        if {14, 2, 3, 4, 5}.issubset(values):
-            return 5  # In Ace-low straight, highest card is 5 (index 3)
-        return None
+        return HandAnalysis(cards).straight_high or None
 
     # THREE OF A KIND (excluding full house)
     @staticmethod
     def is_three_of_a_kind(cards):
-        vals = [Evaluator.card_value(c) for c in cards]
-        counts = Counter(vals)
-        has_three = any(count == 3 for count in counts.values())
-        if not has_three:
-            return False
-        return not Evaluator.is_full_house(cards)
+        return HandAnalysis(cards).three_of_a_kind() is not None
 
     @staticmethod
     def get_three_of_a_kind_info(cards):
-        vals = [Evaluator.card_value(c) for c in cards]
-        counts = Counter(vals)
-        three_rank = max(r for r, cnt in counts.items() if cnt == 3)
-        kickers = sorted((r for r, cnt in counts.items() if r != three_rank), reverse=True)
-        return (three_rank, kickers)
+        three_rank, kickers = HandAnalysis(cards).three_of_a_kind_info()
+        return (three_rank, list(kickers))
 
     # TWO PAIR
     @staticmethod
     def is_two_pair(cards):
-        vals = [Evaluator.card_value(c) for c in cards]
-        counts = Counter(vals)
-        pairs = [r for r, cnt in counts.items() if cnt == 2]
-        return len(pairs) == 2
+        return HandAnalysis(cards).two_pair() is not None
 
     @staticmethod
     def get_two_pair_info(cards):
-        vals = [Evaluator.card_value(c) for c in cards]
-        counts = Counter(vals)
-        pairs = sorted([r for r, cnt in counts.items() if cnt == 2], reverse=True)
-        kicker = max(r for r, cnt in counts.items() if cnt == 1)
-        return (pairs[0], pairs[1], kicker)
+        return HandAnalysis(cards).two_pair_info()
 
     # ONE PAIR (excluding higher multiplicities)
     @staticmethod
     def is_one_pair(cards):
-        vals = [Evaluator.card_value(c) for c in cards]
-        counts = Counter(vals)
-        pairs = [cnt for cnt in counts.values() if cnt == 2]
-        return len(pairs) == 1 and max(counts.values()) == 2
+        return HandAnalysis(cards).one_pair() is not None
 
     @staticmethod
     def get_one_pair_info(cards):
-        vals = [Evaluator.card_value(c) for c in cards]
-        counts = Counter(vals)
-        pair_rank = max(r for r, cnt in counts.items() if cnt == 2)
-        kickers = sorted([r for r, cnt in counts.items() if cnt == 1], reverse=True)
-        return (pair_rank, kickers)
+        pair_rank, kickers = HandAnalysis(cards).one_pair_info()
+        return (pair_rank, list(kickers))
 
     @staticmethod
     def evaluate_hand(player, community_cards):
-        all_cards = player.hand + community_cards
+        return Evaluator.best_hand_rank(player.hand + community_cards)
+
+    @staticmethod
+    def best_hand_rank(all_cards):
         best = (-1, ())
         for combo in combinations(all_cards, 5):
             rank_info = Evaluator.get_hand_rank(combo)
@@ -152,62 +113,362 @@ class Evaluator:
 
     @staticmethod
     def get_hand_rank(cards):
-        values = sorted([Evaluator.card_value(c) for c in cards], reverse=True)
-
-        # Check for flush and straight conditions.
-        flush = Evaluator.is_flush(cards)
-        straight = Evaluator.is_straight(cards)
-        straight_high = Evaluator.get_highest_straight_card(cards)
-
-        # Check for Royal Flush (Ace-high flush with the specific values).
-        if flush and straight and straight_high == 14:
-            return (Evaluator.HAND_RANKS["Royal Flush"], tuple(values))
-        # Straight Flush.
-        if flush and straight:
+        hand = HandAnalysis(cards)
+        flush = hand.flush
+        straight_high = hand.straight_high
+
+        # Royal Flush and Straight Flush.
+        if flush and straight_high == 14:
+            return (Evaluator.HAND_RANKS["Royal Flush"], hand.values)
+        if flush and straight_high:
             return (Evaluator.HAND_RANKS["Straight Flush"], (straight_high,))
         # Four of a Kind.
-        if Evaluator.is_four_of_a_kind(cards):
-            four_rank, kicker = Evaluator.get_four_of_a_kind_info(cards)
-            return (Evaluator.HAND_RANKS["Four of a Kind"], (four_rank, kicker))
+        info = hand.four_of_a_kind()
+        if info:
+            return (Evaluator.HAND_RANKS["Four of a Kind"], info)
         # Full House.
-        if Evaluator.is_full_house(cards):
-            trip_rank, pair_rank = Evaluator.get_full_house_info(cards)
-            return (Evaluator.HAND_RANKS["Full House"], (trip_rank, pair_rank))
+        info = hand.full_house()
+        if info:
+            return (Evaluator.HAND_RANKS["Full House"], info)
         # Flush.
         if flush:
-            flush_cards_sorted = Evaluator.get_flush_cards(cards)
-            ranks_desc = sorted(
-                [Evaluator.card_value(c) for c in flush_cards_sorted],
-                reverse=True
-            )
-            return Evaluator.HAND_RANKS["Flush"], tuple(ranks_desc)
+            return (Evaluator.HAND_RANKS["Flush"], hand.values)
         # Straight.
-        if straight:
+        if straight_high:
             return (Evaluator.HAND_RANKS["Straight"], (straight_high,))
         # Three of a Kind.
-        if Evaluator.is_three_of_a_kind(cards):
-            trip_rank, kicker_list = Evaluator.get_three_of_a_kind_info(cards)
-            return (Evaluator.HAND_RANKS["Three of a Kind"],
-                    (trip_rank,) + tuple(kicker_list))
+        info = hand.three_of_a_kind()
+        if info:
+            return (Evaluator.HAND_RANKS["Three of a Kind"], (info[0],) + info[1])
         # Two Pair.
-        if Evaluator.is_two_pair(cards):
-            high_pair, low_pair, kicker = Evaluator.get_two_pair_info(cards)
-            return (Evaluator.HAND_RANKS["Two Pair"], (high_pair, low_pair, kicker))
+        info = hand.two_pair()
+        if info:
+            return (Evaluator.HAND_RANKS["Two Pair"], info)
         # One Pair.
-        if Evaluator.is_one_pair(cards):
-            pair_rank, kicker_list = Evaluator.get_one_pair_info(cards)
-            return (Evaluator.HAND_RANKS["One Pair"],
-                    (pair_rank,) + tuple(kicker_list))
+        info = hand.one_pair()
+        if info:
+            return (Evaluator.HAND_RANKS["One Pair"], (info[0],) + info[1])
         # High Card.
-        return (Evaluator.HAND_RANKS["High Card"], tuple(values))
+        return (Evaluator.HAND_RANKS["High Card"], hand.values)
+
+    # A packed score holds the category above five 4-bit kicker nibbles,
+    # first kicker most significant and missing kickers zero, so comparing
+    # scores as integers orders hands exactly like the (category, kickers)
+    # tuples. Scores stay below 2**24 and fit in int32 arrays.
+    KICKER_BITS = 4
+    SCORE_KICKERS = 5
+
+    @staticmethod
+    def pack_rank(rank_info):
+        category, kickers = rank_info
+        score = category
+        for i in range(Evaluator.SCORE_KICKERS):
+            score = score << Evaluator.KICKER_BITS | (kickers[i] if i < len(kickers) else 0)
+        return score
+
+    @staticmethod
+    def unpack_score(score):
+        """
+        The (category, kickers) tuple of a packed score. Trailing zero
+        kickers are dropped; a real kicker is only ever 0 in hands of fewer
+        than five cards, or in five of a kind from several decks.
+        """
+        bits = Evaluator.KICKER_BITS
+        kickers = [score >> bits * i & ((1 << bits) - 1) for i in range(Evaluator.SCORE_KICKERS - 1, -1, -1)]
+        while kickers and kickers[-1] == 0:
+            kickers.pop()
+        return (score >> bits * Evaluator.SCORE_KICKERS, tuple(kickers))
+
+    @staticmethod
+    def describe_score(score, hand_ranks=None):
+        """(category name, kickers) of a packed score, named by `hand_ranks` (default HAND_RANKS)."""
+        category, kickers = Evaluator.unpack_score(score)
+        for name, strength in (hand_ranks or Evaluator.HAND_RANKS).items():
+            if strength == category:
+                return (name, kickers)
+        raise ValueError(f"Unknown hand category {category}")
+
+    @staticmethod
+    def hand_score(cards):
+        return Evaluator.pack_rank(Evaluator.get_hand_rank(cards))
+
+    @staticmethod
+    def best_hand_score(all_cards):
+        return max(Evaluator.hand_score(combo) for combo in combinations(all_cards, 5))
+
+
+# Card value v (2..14, ace high) is bit v - 2, so a rank mask fits in 13 bits.
+RANK_BITS = 13
+WHEEL_MASK = 0b1000000001111  # A-2-3-4-5
+
+
+def _mask_values(mask):
+    return tuple(bit + 2 for bit in range(RANK_BITS - 1, -1, -1) if mask >> bit & 1)
+
+
+def _straight_high(mask):
+    for high in range(14, 5, -1):
+        run = 0b11111 << (high - 6)
+        if mask & run == run:
+            return high
+    return 5 if mask & WHEEL_MASK == WHEEL_MASK else 0
+
+
+# The values in every 13-bit rank mask, highest first, and the high card of
+# the best straight it contains (0 for none).
+MASK_VALUES = [_mask_values(mask) for mask in range(1 << RANK_BITS)]
+STRAIGHT_HIGH = [_straight_high(mask) for mask in range(1 << RANK_BITS)]
+
+
+class HandAnalysis:
+    """
+    One pass over a group of cards: the values highest first, a 13-bit rank
+    mask per suit, and the value histogram folded into masks of the values
+    held exactly once, twice, three times and four or more times. Every
+    category test and kicker list is then a few bit operations and lookups
+    in MASK_VALUES / STRAIGHT_HIGH.
+    """
+    __slots__ = ("values", "suit_masks", "rank_mask", "singles", "pairs", "trips", "quads")
+
+    def __init__(self, cards):
+        counts = [0] * 15
+        suit_masks = {}
+        values = []
+        for c in cards:
+            v = 14 if c.value == 0 else c.value + 1
+            values.append(v)
+            counts[v] += 1
+            suit_masks[c.suit] = suit_masks.get(c.suit, 0) | 1 << (v - 2)
+        by_count = [0, 0, 0, 0, 0]
+        for v in values:
+            by_count[min(counts[v], 4)] |= 1 << (v - 2)
+        values.sort(reverse=True)
+        self.values = tuple(values)
+        self.suit_masks = suit_masks
+        self.rank_mask = by_count[1] | by_count[2] | by_count[3] | by_count[4]
+        _, self.singles, self.pairs, self.trips, self.quads = by_count
+
+    @property
+    def flush(self):
+        """All cards share one suit."""
+        return len(self.suit_masks) == 1
+
+    @property
+    def straight_high(self):
+        return STRAIGHT_HIGH[self.rank_mask]
 
-class EvaluatorTable(Evaluator):
+    @staticmethod
+    def top(mask):
+        """Highest value in a non-empty rank mask."""
+        if not mask:
+            raise ValueError("No such rank in the hand")
+        return mask.bit_length() + 1
+
+    # The *_info methods read a category's ranks and kickers without checking
+    # that the category is the hand's best one, like the get_*_info helpers.
+    def four_of_a_kind_info(self):
+        four = HandAnalysis.top(self.quads)
+        rest = self.rank_mask & ~(1 << (four - 2))
+        return (four, rest.bit_length() + 1 if rest else 0)
+
+    def full_house_info(self):
+        three = HandAnalysis.top(self.trips | self.quads)
+        rest = (self.pairs | self.trips | self.quads) & ~(1 << (three - 2))
+        return (three, rest.bit_length() + 1 if rest else 0)
+
+    def three_of_a_kind_info(self):
+        three = HandAnalysis.top(self.trips)
+        return (three, MASK_VALUES[self.rank_mask & ~(1 << (three - 2))])
+
+    def two_pair_info(self):
+        high, low = MASK_VALUES[self.pairs][:2]
+        return (high, low, HandAnalysis.top(self.singles))
+
+    def one_pair_info(self):
+        return (HandAnalysis.top(self.pairs), MASK_VALUES[self.singles])
+
+    # Category tests, each returning its info or None.
+    def four_of_a_kind(self):
+        return self.four_of_a_kind_info() if self.quads else None
+
+    def full_house(self):
+        three_up = self.trips | self.quads
+        if three_up and (self.pairs | three_up).bit_count() >= 2:
+            return self.full_house_info()
+        return None
+
+    def three_of_a_kind(self):
+        """Trips that are not part of a full house."""
+        if self.trips and (self.pairs | self.trips | self.quads).bit_count() == 1:
+            return self.three_of_a_kind_info()
+        return None
+
+    def two_pair(self):
+        """Exactly two values held exactly twice."""
+        if self.pairs.bit_count() == 2:
+            return (*MASK_VALUES[self.pairs], self.singles.bit_length() + 1 if self.singles else 0)
+        return None
+
+    def one_pair(self):
+        if self.pairs.bit_count() == 1 and not self.trips | self.quads:
+            return self.one_pair_info()
+        return None
+
+
+class EvaluationCache:
+    """
+    Bounded, thread-safe memo table for hand evaluations.
+
+    policy="lru" evicts the least recently used entry, "fifo" the oldest
+    insertion. Memory use is tracked incrementally per entry, so stats() is O(1).
+    """
+    POLICIES = ("lru", "fifo")
+    # Rough per-entry overhead of an OrderedDict slot and its linked-list node.
+    ENTRY_OVERHEAD = 100
+
+    def __init__(self, max_size=100_000, policy="lru"):
+        if max_size < 1:
+            raise ValueError("Cache size must be greater than 0")
+        if policy not in EvaluationCache.POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        self.max_size = max_size
+        self.policy = policy
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._entry_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    @staticmethod
+    def _sizeof(key, value):
+        size = sys.getsizeof(key) + sys.getsizeof(value) + EvaluationCache.ENTRY_OVERHEAD
+        if isinstance(value, tuple):
+            size += sum(sys.getsizeof(v) for v in value if isinstance(v, tuple))
+        return size
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if self.policy == "lru":
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            if key in self._data:
+                return
+            self._data[key] = value
+            self._entry_bytes += EvaluationCache._sizeof(key, value)
+            while len(self._data) > self.max_size:
+                old_key, old_value = self._data.popitem(last=False)
+                self._entry_bytes -= EvaluationCache._sizeof(old_key, old_value)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._entry_bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "policy": self.policy,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "memory_bytes": sys.getsizeof(self._data) + self._entry_bytes,
+            }
+
+
+class CachedEvaluator(Evaluator):
+    """
+    Evaluator with memoized get_hand_rank / evaluate_hand. Cards are keyed by
+    an order-independent 52-bit mask, so any permutation of the same cards
+    hits the same entry. Hands with duplicate cards (multi-deck shoes) cannot
+    be keyed by a set and are evaluated directly.
+    """
+    SUIT_OFFSETS = {suit: i * len(RANK) for i, suit in enumerate(SUIT)}
+    rank_cache = EvaluationCache()
+    best_cache = EvaluationCache()
+
+    @staticmethod
+    def configure(max_size=100_000, policy="lru"):
+        CachedEvaluator.rank_cache = EvaluationCache(max_size, policy)
+        CachedEvaluator.best_cache = EvaluationCache(max_size, policy)
+
+    @staticmethod
+    def stats():
+        return {
+            "get_hand_rank": CachedEvaluator.rank_cache.stats(),
+            "evaluate_hand": CachedEvaluator.best_cache.stats(),
+        }
+
+    @staticmethod
+    def card_mask(cards):
+        mask = 0
+        offsets = CachedEvaluator.SUIT_OFFSETS
+        for c in cards:
+            mask |= 1 << (offsets[c.suit] + c.value)
+        return mask
+
+    @staticmethod
+    def get_hand_rank(cards):
+        mask = CachedEvaluator.card_mask(cards)
+        if mask.bit_count() != len(cards):
+            return Evaluator.get_hand_rank(cards)
+        cache = CachedEvaluator.rank_cache
+        result = cache.get(mask)
+        if result is None:
+            result = Evaluator.get_hand_rank(cards)
+            cache.put(mask, result)
+        return result
+
+    @staticmethod
+    def evaluate_hand(player, community_cards):
+        return CachedEvaluator.best_hand_rank(player.hand + community_cards)
+
+    @staticmethod
+    def best_hand_rank(all_cards):
+        mask = CachedEvaluator.card_mask(all_cards)
+        if mask.bit_count() != len(all_cards):
+            return Evaluator.best_hand_rank(all_cards)
+        cache = CachedEvaluator.best_cache
+        result = cache.get(mask)
+        if result is None:
+            # Board-only five-card combinations are shared by every seat, so
+            # the per-combination cache still helps on a miss here.
+            result = (-1, ())
+            for combo in combinations(all_cards, 5):
+                rank_info = CachedEvaluator.get_hand_rank(combo)
+                if rank_info > result:
+                    result = rank_info
+            cache.put(mask, result)
+        return result
+
+class EvaluatorTable(CachedEvaluator):
     @staticmethod
     def determine_winner(players, community_cards):
         player_ranks = {}
         for p in players:
             if not getattr(p, "folded", False):
                 player_ranks[p] = EvaluatorTable.evaluate_hand(p, community_cards)
+        return EvaluatorTable.top_ranked(player_ranks)
+
+    @staticmethod
+    def top_ranked(player_ranks):
         sorted_by_best = sorted(player_ranks.items(), key=lambda x: x[1], reverse=True)
         if not sorted_by_best:
             return []
@@ -219,3 +480,59 @@ class EvaluatorTable(Evaluator):
             else:
                 break
         return winners
+
+
+class OmahaEvaluatorTable(EvaluatorTable):
+    """
+    Omaha showdowns: a hand must use exactly two hole cards and three board
+    cards. The board's 3-card subsets are prepared once per showdown and every
+    player's hole pairs are scored against them in one batch. A 5-card rank
+    depends only on the sorted card values and whether all five share a suit,
+    so each combination is looked up by (values, flush) in a memo table that
+    quickly covers the few thousand possible keys, instead of re-running
+    get_hand_rank for all 60 combinations per player.
+    """
+    _rank_memo = {}
+
+    @staticmethod
+    def _prepare(cards):
+        """(values, suit or None if mixed, cards) for a small group of cards."""
+        suits = {c.suit for c in cards}
+        return (tuple(Evaluator.card_value(c) for c in cards),
+                next(iter(suits)) if len(suits) == 1 else None,
+                cards)
+
+    @staticmethod
+    def board_subsets(community_cards):
+        return [OmahaEvaluatorTable._prepare(combo) for combo in combinations(community_cards, 3)]
+
+    @staticmethod
+    def best_omaha_rank(hole_cards, board_subsets):
+        memo = OmahaEvaluatorTable._rank_memo
+        best = (-1, ())
+        for pair in combinations(hole_cards, 2):
+            pair_values, pair_suit, _ = OmahaEvaluatorTable._prepare(pair)
+            for board_values, board_suit, board_cards in board_subsets:
+                flush = pair_suit is not None and pair_suit == board_suit
+                key = (tuple(sorted(pair_values + board_values)), flush)
+                rank_info = memo.get(key)
+                if rank_info is None:
+                    rank_info = Evaluator.get_hand_rank(pair + board_cards)
+                    memo[key] = rank_info
+                if rank_info > best:
+                    best = rank_info
+        return best
+
+    @staticmethod
+    def evaluate_hand(player, community_cards):
+        return OmahaEvaluatorTable.best_omaha_rank(
+            player.hand, OmahaEvaluatorTable.board_subsets(community_cards))
+
+    @staticmethod
+    def determine_winner(players, community_cards):
+        subsets = OmahaEvaluatorTable.board_subsets(community_cards)
+        player_ranks = {}
+        for p in players:
+            if not getattr(p, "folded", False):
+                player_ranks[p] = OmahaEvaluatorTable.best_omaha_rank(p.hand, subsets)
+        return EvaluatorTable.top_ranked(player_ranks)
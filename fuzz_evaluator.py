@@ -0,0 +1,203 @@
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+
+from evaluator import CachedEvaluator, Evaluator
+from isomorphism import id_to_card
+from ruleset import STANDARD
+
+_CARDS = [id_to_card(c) for c in range(52)]
+
+# Candidate engines, each a picklable callable whose results must order hands
+# exactly like the reference. Five-card engines rank exactly five cards; best-hand
+# engines take any number of cards.
+FIVE_CARD_ENGINES = {
+    "cached": CachedEvaluator.get_hand_rank,
+    "ruleset": STANDARD.get_hand_rank,
+    "ruleset_score": STANDARD.hand_score,
+}
+BEST_HAND_ENGINES = {
+    "cached": CachedEvaluator.best_hand_rank,
+    "ruleset": STANDARD.best_hand_rank,
+    "ruleset_score": STANDARD.best_hand_score,
+}
+REFERENCE = "reference"
+
+# How many of the 2,598,960 five-card hands fall in each category.
+FIVE_CARD_CATEGORY_COUNTS = {
+    "Royal Flush": 4,
+    "Straight Flush": 36,
+    "Four of a Kind": 624,
+    "Full House": 3744,
+    "Flush": 5108,
+    "Straight": 10200,
+    "Three of a Kind": 54912,
+    "Two Pair": 123552,
+    "One Pair": 1098240,
+    "High Card": 1302540,
+}
+_CATEGORY_NAMES = {strength: name for name, strength in Evaluator.HAND_RANKS.items()}
+
+
+class _Tally:
+    """
+    What one worker saw: hands checked, seconds spent per engine, reference
+    categories, and for each candidate the value it gave every distinct
+    reference rank. A candidate that gives one reference rank two different
+    values is recorded as a mismatch right away; the order of the values is
+    checked once all tallies are merged.
+    """
+    def __init__(self, engines):
+        self.hands = 0
+        self.seconds = dict.fromkeys([REFERENCE] + list(engines), 0.0)
+        self.categories = Counter()
+        self.values = {name: {} for name in engines}
+        self.mismatches = {name: [] for name in engines}
+
+    def run(self, hands, reference, engines, max_examples=5):
+        """Time every engine over the same list of card tuples and compare them with the reference."""
+        start = time.perf_counter()
+        expected = [reference(cards) for cards in hands]
+        self.seconds[REFERENCE] += time.perf_counter() - start
+        self.hands += len(hands)
+        self.categories.update(rank[0] for rank in expected)
+
+        for name, engine in engines.items():
+            start = time.perf_counter()
+            results = [engine(cards) for cards in hands]
+            self.seconds[name] += time.perf_counter() - start
+            seen = self.values[name]
+            bad = self.mismatches[name]
+            for cards, rank, value in zip(hands, expected, results):
+                known = seen.setdefault(rank, value)
+                if known != value and len(bad) < max_examples:
+                    bad.append((_card_ids(cards), rank, value))
+
+    def merge(self, other):
+        self.hands += other.hands
+        for name, seconds in other.seconds.items():
+            self.seconds[name] += seconds
+        self.categories.update(other.categories)
+        for name, values in other.values.items():
+            seen = self.values[name]
+            for rank, value in values.items():
+                if seen.setdefault(rank, value) != value:
+                    self.mismatches[name].append((None, rank, value))
+            self.mismatches[name].extend(other.mismatches[name])
+        return self
+
+
+def _card_ids(cards):
+    return tuple(_CARDS.index(c) for c in cards)
+
+
+def _order_mismatches(values):
+    """Reference ranks whose candidate values are not strictly increasing with them."""
+    ordered = sorted(values.items())
+    return [(None, (low, high), (values[low], values[high]))
+            for (low, _), (high, _) in zip(ordered, ordered[1:])
+            if not values[low] < values[high]]
+
+
+def _five_card_chunk(first, engines):
+    """Every five-card hand whose lowest card id is `first`."""
+    tally = _Tally(engines)
+    lead = _CARDS[first]
+    hands = [(lead,) + rest for rest in combinations(_CARDS[first + 1:], 4)]
+    tally.run(hands, Evaluator.get_hand_rank, engines)
+    return tally
+
+
+def _sample_chunk(size, count, seed, engines):
+    rng = random.Random(seed)
+    hands = [tuple(rng.sample(_CARDS, size)) for _ in range(count)]
+    tally = _Tally(engines)
+    tally.run(hands, Evaluator.best_hand_rank, engines)
+    return tally
+
+
+def _run(tasks, engines, workers):
+    total = _Tally(engines)
+    if workers <= 1:
+        for func, *args in tasks:
+            total.merge(func(*args, engines))
+        return total
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(func, *args, engines) for func, *args in tasks]
+        for future in futures:
+            total.merge(future.result())
+    return total
+
+
+def _report(tally):
+    mismatches = {}
+    for name in tally.values:
+        found = tally.mismatches[name] + _order_mismatches(tally.values[name])
+        if found:
+            mismatches[name] = found
+    return {
+        "hands": tally.hands,
+        "hands_per_sec": {name: tally.hands / s if s else 0.0 for name, s in tally.seconds.items()},
+        "categories": {_CATEGORY_NAMES[c]: n for c, n in sorted(tally.categories.items(), reverse=True)},
+        "mismatches": mismatches,
+    }
+
+
+def fuzz(five_card_engines=None, best_hand_engines=None, samples=100_000, sizes=(6, 7),
+         workers=1, seed=0, first_cards=range(48), chunk=20_000):
+    """
+    Check candidate evaluators against Evaluator.get_hand_rank on every
+    five-card hand (all 2,598,960 by default; `first_cards` restricts the
+    enumeration to hands whose lowest card id is in it) and against
+    Evaluator.best_hand_rank on `samples` random hands of each of `sizes`.
+
+    A candidate passes if its results order hands exactly as the reference
+    does: equal reference ranks give equal values and higher ranks give
+    strictly higher values, so packed scores or any other encoding can be
+    checked too. Work is split over `workers` processes, which requires
+    picklable engines.
+
+    Returns {size: {"hands", "hands_per_sec" per engine (reference
+    included, engine time only), "categories" (reference category counts,
+    the correctness fingerprint), "mismatches" per failing engine}}.
+    Mismatch examples are (card ids or None, reference rank(s), value(s)).
+    """
+    five_card_engines = FIVE_CARD_ENGINES if five_card_engines is None else five_card_engines
+    best_hand_engines = BEST_HAND_ENGINES if best_hand_engines is None else best_hand_engines
+    rng = random.Random(seed)
+    results = {}
+
+    # Low first cards lead the most hands, so they go out first.
+    tasks = [(_five_card_chunk, first) for first in sorted(first_cards)]
+    results[5] = _report(_run(tasks, five_card_engines, workers))
+
+    for size in sizes:
+        tasks = [(_sample_chunk, size, min(chunk, samples - start), rng.getrandbits(64))
+                 for start in range(0, samples, chunk)]
+        results[size] = _report(_run(tasks, best_hand_engines, workers))
+    return results
+
+
+def format_report(results):
+    lines = []
+    for size, report in results.items():
+        lines.append(f"{size}-card hands: {report['hands']:,}")
+        for name, rate in report["hands_per_sec"].items():
+            status = "" if name == REFERENCE else ("  MISMATCH" if name in report["mismatches"] else "  ok")
+            lines.append(f"  {name:<16}{rate:>14,.0f} hands/s{status}")
+        total = report["hands"] or 1
+        for name, count in report["categories"].items():
+            lines.append(f"    {name:<16}{count:>10,}  {count / total:8.4%}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import os
+
+    start = time.perf_counter()
+    results = fuzz(workers=os.cpu_count() or 1)
+    print(format_report(results))
+    print(f"Five-card categories match the known counts: {results[5]['categories'] == FIVE_CARD_CATEGORY_COUNTS}")
+    print(f"Finished in {time.perf_counter() - start:.0f}s")
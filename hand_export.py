@@ -0,0 +1,319 @@
+import os
+import threading
+import time
+from enum import Enum
+
+from card_enums import BUTTON, PHASE, RANK, SUIT
+from evaluator import Evaluator
+from hand_reading import ACTIONS, action_kind
+from isomorphism import card_id
+
+PHASE_BY_BOARD = {0: PHASE.PF, 3: PHASE.FLOP, 4: PHASE.TURN, 5: PHASE.RIVER}
+BOARD_COLUMNS = ("board1", "board2", "board3", "board4", "board5")
+
+# Enum columns are dictionary-encoded against every member's name, so all row
+# groups share one dictionary; cards are plain int8 card ids.
+ENUM_COLUMNS = {
+    "position": BUTTON,
+    "phase": PHASE,
+    "last_phase": PHASE,
+    "high_rank": RANK,
+    "low_rank": RANK,
+    "high_suit": SUIT,
+    "low_suit": SUIT,
+}
+PLAYER_COLUMNS = ("hand_id", "table_id", "seat", "player", "player_class", "position", "stack", "big_blind",
+                  "hole1", "hole2", "high_rank", "high_suit", "low_rank", "low_suit", "suited") + BOARD_COLUMNS + (
+                  "last_phase", "folded", "category", "result")
+ACTION_COLUMNS = ("hand_id", "table_id", "seat", "player", "player_class", "position", "phase", "action",
+                  "amount", "call_amount", "result")
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError as error:
+        raise ImportError("Parquet export needs pyarrow (pip install pyarrow)") from error
+    return pyarrow
+
+
+class HandColumns:
+    """
+    Turns hand events into column buffers (attach it as game.recorder):
+
+      players:  one row per seat per hand: who, class, position, starting
+                stack, hole cards (ids plus rank/suit, higher card first),
+                board, the phase the hand ended for them, whether they
+                folded, the showdown category and the chip result
+      actions:  one row per decision: phase, fold/check/call/raise, chips
+                added, the call faced, and the player's result for the hand
+
+    Rows of a hand are added when it ends, so results are on every row.
+    A bare HandColumns buffers until take() is called. Subclasses that
+    write rows out in flush(), such as ParquetExporter, take a
+    `row_group_size` and have flush() called once that many player rows are
+    buffered. Only two-hole-card hold'em is exported.
+    """
+    _lock = threading.Lock()
+
+    def __init__(self, row_group_size=None, first_hand_id=0):
+        if row_group_size is not None and type(self).flush is HandColumns.flush:
+            raise ValueError(f"{type(self).__name__} keeps rows until take(): row_group_size needs a "
+                             "subclass that writes them out in flush()")
+        self.row_group_size = row_group_size
+        self.next_hand_id = first_hand_id
+        self.players = {name: [] for name in PLAYER_COLUMNS}
+        self.actions = {name: [] for name in ACTION_COLUMNS}
+        self._hands = {}    # hand in progress by the game's SeatTable
+
+    def start_hand(self, game):
+        self._hands[game.seats] = {
+            "stacks": [p.chips for p in game.players],
+            "actions": [],
+            "fold_phase": {},
+        }
+
+    def action(self, player, old_bet, call_amount, phase):
+        kind = action_kind(player, old_bet, call_amount)
+        amount = 0 if kind == "fold" else player.current_bet - old_bet
+        hand = self._hands[player.seats]
+        hand["actions"].append((player.seat, player.position, phase, kind, amount, call_amount))
+        if kind == "fold":
+            hand["fold_phase"][player.seat] = phase
+
+    def end_hand(self, game):
+        hand = self._hands.pop(game.seats)
+        # Tables playing concurrently share the buffers; a hand's rows stay together.
+        with HandColumns._lock:
+            self._add_hand(game, hand)
+
+    def _add_hand(self, game, hand):
+        hand_id = self.next_hand_id
+        self.next_hand_id += 1
+        table_id = getattr(game, "table_id", 0)
+        board = [card_id(c) for c in game.dealer.community_cards]
+        reached = PHASE_BY_BOARD.get(len(board), PHASE.RIVER)
+        contenders = [p for p in game.players if not p.folded and p.hand]
+        showdown = len(contenders) > 1 and len(board) == 5
+        ruleset = game.ruleset
+
+        results = []
+        columns = self.players
+        for seat, player in enumerate(game.players):
+            result = player.chips - hand["stacks"][seat]
+            results.append(result)
+            hole = sorted(player.hand[:2], key=Evaluator.card_value, reverse=True)
+            category = None
+            if showdown and not player.folded and player.hand:
+                score = ruleset.best_hand_score(player.hand + game.dealer.community_cards)
+                category, _ = ruleset.describe_score(score)
+            row = {
+                "hand_id": hand_id,
+                "table_id": table_id,
+                "seat": seat,
+                "player": player.name,
+                "player_class": type(player).__name__,
+                "position": player.position,
+                "stack": hand["stacks"][seat],
+                "big_blind": game.current_big_blind,
+                "hole1": card_id(hole[0]) if hole else None,
+                "hole2": card_id(hole[1]) if len(hole) > 1 else None,
+                "high_rank": hole[0].rank if hole else None,
+                "high_suit": hole[0].suit if hole else None,
+                "low_rank": hole[1].rank if len(hole) > 1 else None,
+                "low_suit": hole[1].suit if len(hole) > 1 else None,
+                "suited": len(hole) > 1 and hole[0].suit == hole[1].suit,
+                "last_phase": hand["fold_phase"].get(seat, reached),
+                "folded": player.folded,
+                "category": category,
+                "result": result,
+            }
+            for i, name in enumerate(BOARD_COLUMNS):
+                row[name] = board[i] if i < len(board) else None
+            for name in PLAYER_COLUMNS:
+                columns[name].append(row[name])
+
+        columns = self.actions
+        players = game.players
+        for seat, position, phase, kind, amount, call_amount in hand["actions"]:
+            row = (hand_id, table_id, seat, players[seat].name, type(players[seat]).__name__, position, phase,
+                   kind, amount, call_amount, results[seat])
+            for name, value in zip(ACTION_COLUMNS, row):
+                columns[name].append(value)
+
+        if self.row_group_size is not None and len(self.players["hand_id"]) >= self.row_group_size:
+            self.flush()
+
+    def take(self):
+        """Return the buffered (players, actions) columns and start empty ones."""
+        players, actions = self.players, self.actions
+        self.players = {name: [] for name in PLAYER_COLUMNS}
+        self.actions = {name: [] for name in ACTION_COLUMNS}
+        return players, actions
+
+    def flush(self):
+        """Write the buffered rows out; subclasses that take a row_group_size override this."""
+
+
+def _schemas(pa):
+    enum = pa.dictionary(pa.int8(), pa.string())
+    strings = pa.dictionary(pa.int32(), pa.string())
+    card = pa.int8()
+    players = pa.schema([
+        ("hand_id", pa.int64()), ("table_id", pa.int32()), ("seat", pa.int8()),
+        ("player", strings), ("player_class", strings), ("position", enum),
+        ("stack", pa.int64()), ("big_blind", pa.int64()),
+        ("hole1", card), ("hole2", card),
+        ("high_rank", enum), ("high_suit", enum), ("low_rank", enum), ("low_suit", enum),
+        ("suited", pa.bool_()),
+    ] + [(name, card) for name in BOARD_COLUMNS] + [
+        ("last_phase", enum), ("folded", pa.bool_()), ("category", strings), ("result", pa.int64()),
+    ])
+    actions = pa.schema([
+        ("hand_id", pa.int64()), ("table_id", pa.int32()), ("seat", pa.int8()),
+        ("player", strings), ("player_class", strings), ("position", enum),
+        ("phase", enum), ("action", enum),
+        ("amount", pa.int64()), ("call_amount", pa.int64()), ("result", pa.int64()),
+    ])
+    return players, actions
+
+
+def _column(pa, name, values, field):
+    enum = ENUM_COLUMNS.get(name)
+    if enum is not None:
+        members = list(enum)
+        index = {member: i for i, member in enumerate(members)}
+        indices = pa.array([None if v is None else index[v] for v in values], pa.int8())
+        return pa.DictionaryArray.from_arrays(indices, pa.array([m.name for m in members]))
+    if name == "action":
+        index = {kind: i for i, kind in enumerate(ACTIONS)}
+        return pa.DictionaryArray.from_arrays(pa.array([index[v] for v in values], pa.int8()), pa.array(ACTIONS))
+    if pa.types.is_dictionary(field.type):
+        return pa.array(values, pa.string()).dictionary_encode()
+    return pa.array(values, field.type)
+
+
+class ParquetExporter(HandColumns):
+    """
+    Streams hand events into out_dir/players.parquet and
+    out_dir/actions.parquet, one row group per `row_group_size` player rows,
+    so memory stays bounded however many hands are played. Rows are in hand
+    order, so the hand_id min/max statistics of each row group let readers
+    skip ranges of hands; enum columns are dictionary-encoded with the
+    member names (BUTTON, PHASE, RANK, SUIT) and cards are int8 card ids.
+    Needs pyarrow; call close() (or use it as a context manager) to finish
+    the files.
+    """
+    def __init__(self, out_dir, row_group_size=65_536, first_hand_id=0, compression="zstd"):
+        super().__init__(row_group_size, first_hand_id)
+        pa = self._pa = _pyarrow()
+        os.makedirs(out_dir, exist_ok=True)
+        self.out_dir = out_dir
+        self.row_groups = 0
+        self.schemas = dict(zip(("players", "actions"), _schemas(pa)))
+        self.writers = {
+            kind: pa.parquet.ParquetWriter(os.path.join(out_dir, f"{kind}.parquet"), schema, compression=compression)
+            for kind, schema in self.schemas.items()
+        }
+
+    def flush(self):
+        if not self.players["hand_id"]:
+            return
+        pa = self._pa
+        for kind, columns in zip(("players", "actions"), self.take()):
+            if not columns["hand_id"]:
+                continue
+            schema = self.schemas[kind]
+            arrays = [_column(pa, field.name, columns[field.name], field) for field in schema]
+            batch = pa.RecordBatch.from_arrays(arrays, schema=schema)
+            self.writers[kind].write_batch(batch, row_group_size=len(batch))
+        self.row_groups += 1
+
+    def close(self):
+        self.flush()
+        for writer in self.writers.values():
+            writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _predicate(ds, where):
+    expression = None
+    for column, wanted in where.items():
+        if isinstance(wanted, (list, tuple, set, frozenset)):
+            values = [v.name if isinstance(v, Enum) else v for v in wanted]
+            term = ds.field(column).isin(values)
+        else:
+            term = ds.field(column) == (wanted.name if isinstance(wanted, Enum) else wanted)
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def scan(path, columns=None, where=None):
+    """
+    Read an exported Parquet file (or a directory of them) into a pyarrow
+    Table, reading only `columns` and pushing `where` down to the scan:
+    {column: value or list of values}, enum members allowed, all terms
+    and-ed together, e.g. where={"position": BUTTON.SB, "phase": [PHASE.FLOP,
+    PHASE.TURN]}. Row groups whose statistics rule the predicate out are
+    skipped without being read. A pyarrow compute expression is passed
+    through as is.
+    """
+    _pyarrow()
+    import pyarrow.dataset as ds
+
+    if isinstance(where, dict):
+        where = _predicate(ds, where) if where else None
+    return ds.dataset(path, format="parquet").to_table(columns=columns, filter=where)
+
+
+def summarize(path, by, value="result", where=None):
+    """Count, sum and mean of `value` per group of the `by` columns, sorted by the group keys."""
+    by = [by] if isinstance(by, str) else list(by)
+    table = scan(path, columns=by + [value], where=where)
+    # Group keys come back as plain strings, which sort and print cleanly.
+    for name in by:
+        column = table[name]
+        if _pyarrow().types.is_dictionary(column.type):
+            table = table.set_column(table.schema.get_field_index(name), name, column.cast(_pyarrow().string()))
+    summary = table.group_by(by).aggregate([(value, "count"), (value, "sum"), (value, "mean")])
+    return summary.sort_by([(name, "ascending") for name in by])
+
+
+if __name__ == "__main__":
+    import random
+    import tempfile
+
+    from ai_player import AlphaBetaPlayer, MinimaxPlayer
+    from player import RandomPlayer
+    from tournament import BlindLevel, TournamentTable
+
+    random.seed(1)
+    with tempfile.TemporaryDirectory() as out_dir:
+        start = time.perf_counter()
+        with ParquetExporter(out_dir, row_group_size=4096) as exporter:
+            for table_id in range(4):
+                players = [RandomPlayer(f"Random{table_id}", 100_000), MinimaxPlayer(f"Minimax{table_id}", 100_000),
+                           AlphaBetaPlayer(f"AlphaBeta{table_id}", 100_000),
+                           RandomPlayer(f"Random{table_id}b", 100_000)]
+                game = TournamentTable(table_id, players)
+                game.level = BlindLevel(50, 100)
+                game.recorder = exporter
+                for _ in range(1000):
+                    game.play_round()
+        elapsed = time.perf_counter() - start
+        sizes = {name: os.path.getsize(os.path.join(out_dir, name)) for name in sorted(os.listdir(out_dir))}
+        print(f"Exported {exporter.next_hand_id:,} hands in {elapsed:.1f}s: "
+              + ", ".join(f"{name} {size / 1024:.0f} KiB" for name, size in sizes.items()))
+
+        players = os.path.join(out_dir, "players.parquet")
+        print(summarize(players, ["player_class", "position"]).to_pandas().to_string(index=False))
+        start = time.perf_counter()
+        river_raises = scan(os.path.join(out_dir, "actions.parquet"), columns=["player_class", "amount"],
+                            where={"phase": PHASE.RIVER, "action": "raise"})
+        print(f"{river_raises.num_rows:,} river raises scanned in {(time.perf_counter() - start) * 1000:.1f}ms")
@@ -0,0 +1,210 @@
+from functools import lru_cache
+from itertools import combinations
+
+import numpy as np
+
+from isomorphism import card_id, id_to_card
+from ruleset import STANDARD
+
+# Every two-card combo as (low id, high id) rows, and for each card the 51
+# combos that hold it, so card removal is one fancy-indexed assignment.
+COMBOS = np.array(list(combinations(range(52), 2)), dtype=np.int64)
+NUM_COMBOS = len(COMBOS)
+CARD_COMBOS = np.array([np.flatnonzero((COMBOS == c).any(axis=1)) for c in range(52)])
+_CARDS = [id_to_card(c) for c in range(52)]
+
+ACTIONS = ("fold", "check", "call", "raise")
+
+
+def _likelihoods(strength):
+    """
+    P(action | combo) for every combo from its strength percentile: strong
+    hands raise and call, weak ones check and fold, with a floor so bluffs
+    and slow plays never rule a combo out completely.
+    """
+    return {
+        "fold": 1.05 - strength,
+        "check": 1.0 - 0.5 * strength ** 2,
+        "call": 0.3 + 0.7 * strength,
+        "raise": 0.05 + 0.95 * strength ** 3,
+    }
+
+
+def action_kind(player, old_bet, call_amount):
+    """Classify a decision from the hand-event hook arguments."""
+    added = player.current_bet - old_bet
+    if player.folded:
+        return "fold"
+    if added > call_amount:
+        return "raise"
+    return "call" if added > 0 else "check"
+
+
+def _percentiles(scores, live):
+    """Strength of each combo as the fraction of live combos it beats (ties count half)."""
+    ranked = np.sort(scores[live])
+    below = np.searchsorted(ranked, scores, side="left")
+    at_most = np.searchsorted(ranked, scores, side="right")
+    strength = (below + at_most) / (2.0 * len(ranked))
+    strength[~live] = 0.0
+    return strength
+
+
+def _chen_score(a, b):
+    """Bill Chen's pre-flop hand score for two card ids."""
+    values = sorted((14 if c % 13 == 0 else c % 13 + 1 for c in (a, b)), reverse=True)
+    high, low = values
+    score = {14: 10, 13: 8, 12: 7, 11: 6}.get(high, high / 2)
+    if high == low:
+        return max(5, 2 * score)
+    if a // 13 == b // 13:
+        score += 2
+    gap = high - low - 1
+    score -= (0, 1, 2, 4)[gap] if gap < 4 else 5
+    if gap <= 1 and high < 12:
+        score += 1
+    return score
+
+
+PREFLOP_STRENGTH = _percentiles(np.array([_chen_score(a, b) for a, b in COMBOS]), np.ones(NUM_COMBOS, dtype=bool))
+
+
+@lru_cache(maxsize=256)
+def board_strength(board):
+    """
+    Made-hand strength percentile of every combo on a board (a sorted tuple
+    of card ids), 0 for combos that collide with it. Cached, so every
+    reader at a table scores a board once.
+    """
+    board_cards = [_CARDS[c] for c in board]
+    live = np.ones(NUM_COMBOS, dtype=bool)
+    live[CARD_COMBOS[list(board)].ravel()] = False
+    scores = np.full(NUM_COMBOS, -1, dtype=np.int64)
+    for i in np.flatnonzero(live):
+        a, b = COMBOS[i]
+        scores[i] = STANDARD.best_hand_score([_CARDS[a], _CARDS[b]] + board_cards)
+    return _percentiles(scores, live)
+
+
+class RangeReader:
+    """
+    Bayesian hand reading: one weight per opponent over all 1,326 hole-card
+    combos. Cards we can see zero out the combos holding them, and every
+    action multiplies the actor's weights by P(action | combo), looked up
+    from the current street's likelihood vectors, so an update is a single
+    NumPy multiply. New community cards rescore the combos (board_strength)
+    and rebuild the likelihood vectors.
+    """
+    def __init__(self, samples=200, min_weight=0.01, seed=None):
+        """
+        samples:     (opponent combo, runout) pairs drawn per equity estimate
+        min_weight:  combos below this fraction of the heaviest are left out of combined_range
+        """
+        self.samples = samples
+        self.min_weight = min_weight
+        self.rng = np.random.default_rng(seed)
+        self.new_hand(())
+
+    def new_hand(self, hole_ids):
+        self.hole = tuple(hole_ids)
+        self.board = []
+        self.ranges = {}
+        self._known = np.ones(NUM_COMBOS)
+        self._known[CARD_COMBOS[list(self.hole)].ravel()] = 0.0
+        self._likelihoods = _likelihoods(PREFLOP_STRENGTH)
+        self._equity = {}   # by tuple of names (None for everyone seen)
+
+    def weights(self, name):
+        """The opponent's combo weights, summing to 1 (created uniform over the unseen cards)."""
+        weights = self.ranges.get(name)
+        if weights is None:
+            weights = self.ranges[name] = self._known / self._known.sum()
+        return weights
+
+    def observe_action(self, name, kind):
+        weights = self.weights(name)
+        weights *= self._likelihoods[kind]
+        total = weights.sum()
+        if total > 0:
+            weights /= total
+        else:
+            # Nothing left fits what we saw; start over from the cards alone.
+            self.ranges[name] = self._known / self._known.sum()
+        self._equity = {}
+
+    def observe_board(self, card_ids):
+        self.board.extend(card_ids)
+        removed = CARD_COMBOS[list(card_ids)].ravel()
+        self._known[removed] = 0.0
+        for name, weights in self.ranges.items():
+            weights[removed] = 0.0
+            total = weights.sum()
+            self.ranges[name] = weights / total if total > 0 else self._known / self._known.sum()
+        self._likelihoods = _likelihoods(board_strength(tuple(sorted(self.board))))
+        self._equity = {}
+
+    def _combined(self, names):
+        """Weights over `names` (default every opponent seen) pooled into one range, summing to 1."""
+        names = list(self.ranges) if names is None else names
+        if not names:
+            return self._known / self._known.sum()
+        return sum(self.weights(name) for name in names) / len(names)
+
+    def combined_range(self, names=None):
+        """
+        {(card id, card id): weight} over `names`, heaviest combo 1, in the
+        format of equity.parse_range so it can go to equity.range_vs_range.
+        """
+        weights = self._combined(names)
+        weights = weights / weights.max()
+        keep = np.flatnonzero(weights >= self.min_weight)
+        return {(int(COMBOS[i, 0]), int(COMBOS[i, 1])): float(weights[i]) for i in keep}
+
+    def equity(self, names=None):
+        """
+        Our showdown equity against the narrowed ranges of `names`, from
+        `samples` draws of an opponent combo by weight plus a random runout.
+        Kept per set of names until the next observation, since AI players
+        ask several times per decision.
+        """
+        key = None if names is None else tuple(names)
+        equity = self._equity.get(key)
+        if equity is None:
+            combos = self.rng.choice(NUM_COMBOS, size=self.samples, p=self._combined(names))
+            hero = [_CARDS[c] for c in self.hole]
+            board = [_CARDS[c] for c in self.board]
+            seen = set(self.hole) | set(self.board)
+            won = 0.0
+            for a, b in COMBOS[combos]:
+                deck = [c for c in range(52) if c not in seen and c != a and c != b]
+                runout = board + [_CARDS[c] for c in self.rng.choice(deck, 5 - len(board), replace=False)]
+                ours = STANDARD.best_hand_score(hero + runout)
+                theirs = STANDARD.best_hand_score([_CARDS[a], _CARDS[b]] + runout)
+                won += 1.0 if ours > theirs else 0.5 if ours == theirs else 0.0
+            equity = self._equity[key] = won / self.samples
+        return equity
+
+
+if __name__ == "__main__":
+    import time
+
+    from card import Card
+    from card_enums import RANK, SUIT
+
+    reader = RangeReader(seed=1)
+    reader.new_hand([card_id(Card(RANK.ACE, SUIT.HEARTS)), card_id(Card(RANK.KING, SUIT.HEARTS))])
+    print(f"Equity against any two cards: {reader.equity():.3f}")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        reader.observe_action("Villain", "call")
+        reader.observe_action("Villain", "raise")
+    per_action = (time.perf_counter() - start) / 2000 * 1e6
+    reader.ranges["Villain"] = reader._known / reader._known.sum()
+
+    reader.observe_action("Villain", "raise")
+    reader.observe_action("Villain", "raise")
+    print(f"After two raises: {reader.equity(['Villain']):.3f} ({per_action:.1f}us per action update)")
+    reader.observe_board([card_id(Card(rank, SUIT.CLUBS)) for rank in (RANK.TWO, RANK.SEVEN, RANK.QUEEN)])
+    reader.observe_action("Villain", "raise")
+    print(f"After a flop raise: {reader.equity(['Villain']):.3f}")
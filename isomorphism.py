@@ -0,0 +1,251 @@
+from bisect import bisect_right
+from math import comb
+
+from card import Card
+from card_enums import RANK, SUIT
+
+SUITS = list(SUIT)
+RANKS = list(RANK)
+NUM_RANKS = len(RANKS)
+NUM_SUITS = len(SUITS)
+
+
+def card_id(card):
+    """Dense card id 0..51: suit_index * 13 + rank.value."""
+    return SUITS.index(card.suit) * NUM_RANKS + card.value
+
+
+def id_to_card(cid):
+    return Card(RANKS[cid % NUM_RANKS], SUITS[cid // NUM_RANKS])
+
+
+def _colex_rank(positions):
+    """Colex rank of a sorted set of positions among all sets of that size."""
+    return sum(comb(p, i + 1) for i, p in enumerate(positions))
+
+
+def _colex_unrank(index, size):
+    positions = []
+    for i in range(size, 0, -1):
+        p = i - 1
+        while comb(p + 1, i) <= index:
+            p += 1
+        index -= comb(p, i)
+        positions.append(p)
+    return positions[::-1]
+
+
+class HandIndexer:
+    """
+    Suit-isomorphism canonicalization and perfect indexing of multi-round card
+    sets (e.g. rounds (2, 3) = hole cards + flop). Two situations that differ
+    only by a relabelling of suits get the same canonical form and the same
+    index, and the indices of all canonical forms are exactly 0..size-1.
+
+    Each suit is described by its rank set in every round. Suits are ordered by
+    their shape (cards per round, descending) and then by the index of their
+    rank sets, which fixes a canonical relabelling. Suits sharing a shape are
+    interchangeable, so they are indexed as a multiset.
+    """
+    def __init__(self, round_sizes):
+        self.round_sizes = tuple(round_sizes)
+        self.shapes = sorted(self._shapes(len(self.round_sizes)), reverse=True)
+        self.shape_counts = {shape: self._shape_count(shape) for shape in self.shapes}
+
+        # Every way of splitting the rounds over four suits, up to suit order.
+        self.configs = []
+        self._collect_configs([], [0] * len(self.round_sizes), 0)
+        self.offsets = []
+        total = 0
+        for config in self.configs:
+            self.offsets.append(total)
+            total += self._config_size(config)
+        self.config_ids = {config: i for i, config in enumerate(self.configs)}
+        self.size = total
+
+    def _shapes(self, n_rounds, prefix=()):
+        if len(prefix) == n_rounds:
+            return [prefix] if sum(prefix) <= NUM_RANKS else []
+        r = len(prefix)
+        shapes = []
+        for k in range(self.round_sizes[r] + 1):
+            shapes.extend(self._shapes(n_rounds, prefix + (k,)))
+        return shapes
+
+    @staticmethod
+    def _shape_count(shape):
+        count, used = 1, 0
+        for k in shape:
+            count *= comb(NUM_RANKS - used, k)
+            used += k
+        return count
+
+    def _collect_configs(self, config, totals, start):
+        if len(config) == NUM_SUITS:
+            if tuple(totals) == self.round_sizes:
+                self.configs.append(tuple(config))
+            return
+        for i in range(start, len(self.shapes)):
+            shape = self.shapes[i]
+            new_totals = [t + k for t, k in zip(totals, shape)]
+            if all(t <= s for t, s in zip(new_totals, self.round_sizes)):
+                self._collect_configs(config + [shape], new_totals, i)
+
+    def _groups(self, config):
+        """Runs of equal shapes in a config as (shape, multiplicity)."""
+        groups = []
+        for shape in config:
+            if groups and groups[-1][0] == shape:
+                groups[-1][1] += 1
+            else:
+                groups.append([shape, 1])
+        return groups
+
+    def _config_size(self, config):
+        size = 1
+        for shape, k in self._groups(config):
+            size *= comb(self.shape_counts[shape] + k - 1, k)
+        return size
+
+    @staticmethod
+    def _suit_index(masks):
+        """Index of one suit's rank sets (one 13-bit mask per round) within its shape."""
+        index, used = 0, 0
+        for mask in masks:
+            free = [r for r in range(NUM_RANKS) if not used >> r & 1]
+            positions = [i for i, r in enumerate(free) if mask >> r & 1]
+            index = index * comb(len(free), len(positions)) + _colex_rank(positions)
+            used |= mask
+        return index
+
+    @staticmethod
+    def _suit_unindex(index, shape):
+        digits = []
+        used = 0
+        radices = []
+        for k in shape:
+            radices.append(comb(NUM_RANKS - used, k))
+            used += k
+        for radix in reversed(radices):
+            digits.append(index % radix)
+            index //= radix
+        digits.reverse()
+
+        masks, used = [], 0
+        for k, digit in zip(shape, digits):
+            free = [r for r in range(NUM_RANKS) if not used >> r & 1]
+            mask = 0
+            for p in _colex_unrank(digit, k):
+                mask |= 1 << free[p]
+            masks.append(mask)
+            used |= mask
+        return masks
+
+    def _suit_order(self, rounds):
+        """Per-suit (shape, index, masks, original suit), in canonical order."""
+        suits = []
+        for s in range(NUM_SUITS):
+            masks = []
+            for cards in rounds:
+                mask = 0
+                for cid in cards:
+                    if cid // NUM_RANKS == s:
+                        mask |= 1 << (cid % NUM_RANKS)
+                masks.append(mask)
+            shape = tuple(bin(m).count("1") for m in masks)
+            suits.append((shape, self._suit_index(masks), masks, s))
+        suits.sort(key=lambda x: (tuple(-k for k in x[0]), x[1]))
+        return suits
+
+    def _check(self, rounds):
+        if tuple(len(cards) for cards in rounds) != self.round_sizes:
+            raise ValueError(f"Expected rounds of sizes {self.round_sizes}")
+
+    def index(self, rounds):
+        """Dense index of a situation given as one list of card ids per round."""
+        self._check(rounds)
+        suits = self._suit_order(rounds)
+        config = tuple(shape for shape, _, _, _ in suits)
+
+        index, pos = 0, 0
+        for shape, k in self._groups(config):
+            values = [suits[pos + j][1] for j in range(k)]
+            group_index = sum(comb(v + j, j + 1) for j, v in enumerate(values))
+            index = index * comb(self.shape_counts[shape] + k - 1, k) + group_index
+            pos += k
+        return self.offsets[self.config_ids[config]] + index
+
+    def unindex(self, index):
+        """Canonical representative (card ids per round) of a dense index."""
+        if not 0 <= index < self.size:
+            raise ValueError(f"Index {index} out of range 0..{self.size - 1}")
+        c = bisect_right(self.offsets, index) - 1
+        config = self.configs[c]
+        index -= self.offsets[c]
+
+        groups = self._groups(config)
+        group_indices = []
+        for shape, k in reversed(groups):
+            radix = comb(self.shape_counts[shape] + k - 1, k)
+            group_indices.append(index % radix)
+            index //= radix
+        group_indices.reverse()
+
+        rounds = [[] for _ in self.round_sizes]
+        suit = 0
+        for (shape, k), group_index in zip(groups, group_indices):
+            values = [w - j for j, w in enumerate(_colex_unrank(group_index, k))]
+            for value in values:
+                for r, mask in enumerate(self._suit_unindex(value, shape)):
+                    rounds[r].extend(suit * NUM_RANKS + rank for rank in range(NUM_RANKS) if mask >> rank & 1)
+                suit += 1
+        return [sorted(cards) for cards in rounds]
+
+    def canonicalize(self, rounds):
+        """Suit-relabelled canonical form (card ids per round) of a situation."""
+        self._check(rounds)
+        relabel = {old: new for new, (_, _, _, old) in enumerate(self._suit_order(rounds))}
+        return [sorted(relabel[cid // NUM_RANKS] * NUM_RANKS + cid % NUM_RANKS for cid in cards)
+                for cards in rounds]
+
+
+_HOLDEM_INDEXERS = {}
+
+
+def holdem_indexer(board_size):
+    """Shared indexer for two hole cards plus an unordered board of board_size cards."""
+    indexer = _HOLDEM_INDEXERS.get(board_size)
+    if indexer is None:
+        indexer = HandIndexer((2, board_size) if board_size else (2,))
+        _HOLDEM_INDEXERS[board_size] = indexer
+    return indexer
+
+
+def canonical_index(hole, board):
+    """Dense isomorphism index of hole + board Cards, unique per board size."""
+    rounds = [[card_id(c) for c in hole]]
+    if board:
+        rounds.append([card_id(c) for c in board])
+    return holdem_indexer(len(board)).index(rounds)
+
+
+def canonicalize_cards(hole, board):
+    """Canonical suit-relabelled (hole, board) as new Card objects."""
+    rounds = [[card_id(c) for c in hole]]
+    if board:
+        rounds.append([card_id(c) for c in board])
+    canonical = holdem_indexer(len(board)).canonicalize(rounds)
+    hole_ids = canonical[0]
+    board_ids = canonical[1] if board else []
+    return [id_to_card(c) for c in hole_ids], [id_to_card(c) for c in board_ids]
+
+
+if __name__ == "__main__":
+    for size, name in [(0, "Pre-flop"), (3, "Flop"), (4, "Turn"), (5, "River")]:
+        print(f"{name} canonical situations: {holdem_indexer(size).size:,}")
+
+    hole_a = [Card(RANK.ACE, SUIT.HEARTS), Card(RANK.KING, SUIT.HEARTS)]
+    board_a = [Card(RANK.QUEEN, SUIT.HEARTS), Card(RANK.JACK, SUIT.DIAMONDS), Card(RANK.TWO, SUIT.CLUBS)]
+    hole_b = [Card(RANK.ACE, SUIT.SPADES), Card(RANK.KING, SUIT.SPADES)]
+    board_b = [Card(RANK.QUEEN, SUIT.SPADES), Card(RANK.JACK, SUIT.HEARTS), Card(RANK.TWO, SUIT.DIAMONDS)]
+    print(canonical_index(hole_a, board_a), canonical_index(hole_b, board_b))
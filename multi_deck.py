@@ -3,9 +3,10 @@ from card import Card
 from card_enums import RANK, SUIT
 
 class MultiDeck(SingleDeck):
-    def __init__(self, num=1):
-        super().__init__()
-        self.cards = [Card(rank, suit) for _ in range(num) for suit in SUIT for rank in RANK]
+    def __init__(self, num=1, ruleset=None):
+        super().__init__(ruleset)
+        self.cards = [Card(rank, suit) for _ in range(num) for suit in SUIT for rank in self.ruleset.ranks]
+        self._rebuild_counts()
 
 if __name__ == '__main__':
     deck = MultiDeck(num=3)
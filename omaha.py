@@ -0,0 +1,52 @@
+from evaluator import Evaluator, OmahaEvaluatorTable
+from player import RandomPlayer
+from table import Table
+from texas_holdem import TexasHoldemGame
+
+class OmahaGame(TexasHoldemGame):
+    """
+    Pot-Limit Omaha: four hole cards each, showdowns use exactly two hole
+    cards and three board cards, and no bet may exceed the pot. Everything
+    else (positions, blinds, streets) is the TexasHoldemGame round structure.
+    """
+    HOLE_CARDS = 4
+
+    def __init__(self, players, verbose=False, testing=False):
+        super().__init__(players, verbose=verbose, testing=testing)
+        self.table = Table(self.players, pot_limit=True)
+
+    def _apply_bet_limit(self, player, highest_bet, old_bet):
+        excess = self.table.clamp_bet(player, highest_bet, committed=old_bet)
+        if excess and self.verbose:
+            print(f"{player.name}'s bet is capped at the pot ({excess} returned).")
+
+    def showdown_scores(self, players):
+        subsets = OmahaEvaluatorTable.board_subsets(self.dealer.community_cards)
+        return {p.seat: Evaluator.pack_rank(OmahaEvaluatorTable.best_omaha_rank(p.hand, subsets)) for p in players}
+
+    def _showdown(self):
+        winners = OmahaEvaluatorTable.determine_winner(self.players, self.dealer.community_cards)
+        if len(winners) == 1:
+            if not self.testing:
+                print("Winner:", winners[0].name)
+        else:
+            if not self.testing:
+                print("Tie between:", ", ".join(w.name for w in winners))
+
+        self.table.distribute_pot(winners)
+
+if __name__ == "__main__":
+    players_list = [
+        RandomPlayer("Alice", 1000),
+        RandomPlayer("Bob", 1000),
+        RandomPlayer("Charlie", 1000),
+        RandomPlayer("David", 1000),
+    ]
+
+    game = OmahaGame(players_list, verbose=False)
+    for i in range(10):
+        print(f"\n===== ROUND {i+1} =====")
+        game.play_round()
+        for p in game.players:
+            print(f"{p.name}: {p.chips} chips")
+        print("---------------")
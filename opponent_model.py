@@ -0,0 +1,165 @@
+import threading
+
+from evaluator import Evaluator
+
+
+class OpponentStats:
+    """Running counters for one opponent; every frequency is derived in O(1)."""
+    __slots__ = ("hands", "faced", "folds", "calls", "raises", "bets", "bet_bb", "showdowns", "showdown_strength")
+
+    def __init__(self):
+        self.hands = 0
+        self.faced = 0              # decisions facing a bet
+        self.folds = 0              # ... that were folds
+        self.calls = 0              # ... calls
+        self.raises = 0             # ... raises
+        self.bets = 0               # bets and raises, facing a bet or not
+        self.bet_bb = 0.0           # their total size above the call, in big blinds
+        self.showdowns = 0
+        self.showdown_strength = 0.0  # total normalized category shown down
+
+
+class OpponentModel:
+    """
+    Per-opponent tendencies learned from game events. Attach it as
+    game.recorder (it implements the same start_hand/action/end_hand hooks
+    as stats.StatsCollector) and hand it to AI players, which query it while
+    deciding. Opponents are keyed by name, so one model can follow the same
+    players across every table of a process; OpponentModel.shared() returns
+    a process-wide instance for that.
+
+    Frequencies are smoothed towards `prior` (fold, call, raise) with the
+    weight of `prior_weight` observations, so unknown opponents get the prior
+    and a handful of actions only nudge it.
+    """
+    _shared = None
+    _lock = threading.Lock()
+
+    def __init__(self, prior=(1 / 3, 1 / 3, 1 / 3), prior_weight=10):
+        self.prior = prior
+        self.prior_weight = prior_weight
+        self.players = {}
+        self.total = OpponentStats()  # every opponent together, for relative queries
+        # Bets of the hands in progress by the game's SeatTable, so tables
+        # playing concurrently can share one model.
+        self._pending_bets = {}
+
+    @classmethod
+    def shared(cls):
+        if cls._shared is None:
+            cls._shared = cls()
+        return cls._shared
+
+    def stats(self, name):
+        stats = self.players.get(name)
+        if stats is None:
+            stats = self.players[name] = OpponentStats()
+        return stats
+
+    # Game events
+
+    def start_hand(self, game):
+        self._pending_bets[game.seats] = []
+
+    def action(self, player, old_bet, call_amount, phase):
+        added = player.current_bet - old_bet
+        raised = not player.folded and added > call_amount
+        if raised:
+            # Blinds are not known yet mid-hand; sizes are scaled at end_hand.
+            self._pending_bets[player.seats].append((player.name, added - call_amount))
+        if call_amount <= 0:
+            return
+        with OpponentModel._lock:
+            for stats in (self.stats(player.name), self.total):
+                stats.faced += 1
+                if player.folded:
+                    stats.folds += 1
+                elif raised:
+                    stats.raises += 1
+                else:
+                    stats.calls += 1
+
+    def end_hand(self, game):
+        big_blind = game.current_big_blind or 1
+        pending = self._pending_bets.pop(game.seats)
+        board = game.dealer.community_cards
+        contenders = [p for p in game.players if not p.folded]
+        categories = []
+        if len(contenders) > 1 and len(board) == 5:
+            # Scored by the game itself, so Omaha hands use two hole and three board cards.
+            scores = game.showdown_scores(contenders)
+            categories = [(player.name, Evaluator.unpack_score(scores[player.seat])[0]) for player in contenders]
+
+        with OpponentModel._lock:
+            for name, size in pending:
+                for stats in (self.stats(name), self.total):
+                    stats.bets += 1
+                    stats.bet_bb += size / big_blind
+            for player in game.players:
+                if player.hand:
+                    self.stats(player.name).hands += 1
+                    self.total.hands += 1
+            if categories:
+                top = max(game.ruleset.hand_ranks.values())
+                for name, category in categories:
+                    for stats in (self.stats(name), self.total):
+                        stats.showdowns += 1
+                        stats.showdown_strength += category / top
+
+    # Queries
+
+    def _rate(self, count, total, prior):
+        return (count + self.prior_weight * prior) / (total + self.prior_weight)
+
+    def response_frequencies(self, name):
+        """Smoothed (fold, call, raise) frequencies of `name` when facing a bet."""
+        stats = self.players.get(name) or OpponentStats()
+        fold, call, reraise = self.prior
+        return (self._rate(stats.folds, stats.faced, fold),
+                self._rate(stats.calls, stats.faced, call),
+                self._rate(stats.raises, stats.faced, reraise))
+
+    def response_probabilities(self, names):
+        """
+        (everyone folds, someone calls and nobody raises, someone raises) when
+        all of `names` face our bet, treating opponents as independent.
+        """
+        all_fold = 1.0
+        nobody_raises = 1.0
+        for name in names:
+            fold, _, reraise = self.response_frequencies(name)
+            all_fold *= fold
+            nobody_raises *= 1 - reraise
+        someone_raises = 1 - nobody_raises
+        return all_fold, max(0.0, 1 - all_fold - someone_raises), someone_raises
+
+    def showdown_strength(self, name=None):
+        """
+        Mean hand category shown down, as a fraction of the strongest category;
+        the opponent's own mean is smoothed towards everyone's.
+        """
+        overall = self.total.showdown_strength / self.total.showdowns if self.total.showdowns else 0.5
+        if name is None:
+            return overall
+        stats = self.players.get(name) or OpponentStats()
+        return self._rate(stats.showdown_strength, stats.showdowns, overall)
+
+    def bet_size(self, name=None):
+        """Mean bet or raise size in big blinds, the opponent's smoothed towards everyone's."""
+        overall = self.total.bet_bb / self.total.bets if self.total.bets else 1.0
+        if name is None:
+            return overall
+        stats = self.players.get(name) or OpponentStats()
+        return self._rate(stats.bet_bb, stats.bets, overall)
+
+    def opponent_profile(self, names):
+        """
+        (showdown strength offset, bet size ratio) of `names` relative to the
+        whole population, averaged over them: (0, 1) means typical opponents.
+        """
+        if not names:
+            return 0.0, 1.0
+        strength, size = self.showdown_strength(), self.bet_size()
+        offset = sum(self.showdown_strength(n) for n in names) / len(names) - strength
+        ratio = sum(self.bet_size(n) for n in names) / len(names) / size if size else 1.0
+        return offset, ratio
@@ -4,16 +4,46 @@ from single_deck import SingleDeck
 import random
 
 class Player:
-    def __init__(self, name, chips=1000, community_cards=[], position=BUTTON.PLAYER, verbose=False):
+    # Slotted to keep per-seat memory small in large tournaments. While a
+    # player sits in a SeatTable their chips and current bet live in its
+    # arrays; otherwise in _chips/_current_bet.
+    __slots__ = ("name", "hand", "community_cards", "folded", "position", "verbose",
+                 "seats", "seat", "_chips", "_current_bet")
+
+    def __init__(self, name, chips=1000, community_cards=None, position=BUTTON.PLAYER, verbose=False):
         self.name = name
-        self.chips = chips
+        self.seats = None
+        self.seat = None
+        self._chips = chips
+        self._current_bet = 0
         self.hand = []
-        self.community_cards = community_cards
-        self.current_bet = 0
+        self.community_cards = community_cards if community_cards is not None else []
         self.folded = False
         self.position = position
         self.verbose = verbose
 
+    @property
+    def chips(self):
+        return self._chips if self.seats is None else self.seats.chips[self.seat]
+
+    @chips.setter
+    def chips(self, value):
+        if self.seats is None:
+            self._chips = value
+        else:
+            self.seats.chips[self.seat] = value
+
+    @property
+    def current_bet(self):
+        return self._current_bet if self.seats is None else self.seats.bets[self.seat]
+
+    @current_bet.setter
+    def current_bet(self, value):
+        if self.seats is None:
+            self._current_bet = value
+        else:
+            self.seats.bets[self.seat] = value
+
     def place_bet(self, amount):
         if amount > self.chips:
             raise ValueError("Not enough chips!")
@@ -27,10 +57,17 @@ class Player:
         self.hand.extend(cards)
 
     def reset_hand(self):
-        self.hand = []
+        self.hand.clear()
+        self.community_cards = []
         self.current_bet = 0
         self.folded = False
 
+    def observe_action(self, player, old_bet, call_amount, phase):
+        """Called after another player at the table acts (same arguments as the recorder's action hook)."""
+
+    def observe_board(self, cards):
+        """Called with the community cards just dealt."""
+
     def hand_str(self):
         return ", ".join(str(card) for card in self.hand)
 
@@ -39,6 +76,8 @@ class Player:
 
 
 class RandomPlayer(Player):
+    __slots__ = ()
+
     def make_decision(self, highest_bet, call_amount):
         """
         A more refined random decision process:
@@ -104,6 +143,8 @@ class RandomPlayer(Player):
 
 
 class HumanPlayer(Player):
+    __slots__ = ()
+
     def make_decision(self, highest_bet, call_amount):
         """
         Prompt a human user for a fold/call/check/raise decision, ensuring
@@ -0,0 +1,276 @@
+import json
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from dealer import Dealer
+from isomorphism import card_id, id_to_card
+from player import Player
+from ruleset import SHORT_DECK, STANDARD
+from tournament import BlindLevel, TournamentTable
+
+RULESETS = {ruleset.name: ruleset for ruleset in (STANDARD, SHORT_DECK)}
+FOLD = -1
+# The engine never mutates dealt cards, so replays share one Card per id.
+_CARDS = [id_to_card(c) for c in range(52)]
+
+
+class ReplayMismatch(ValueError):
+    pass
+
+
+class HandRecorder:
+    """
+    Records hand histories from a TexasHoldemGame (attach it as
+    game.recorder). Each hand is one flat dict:
+
+      players, stacks:  seat names and stacks before the hand
+      button:           button seat
+      blinds:           [small blind, big blind, ante]
+      deck:             the shuffled deck as hex card ids
+      actions:          [seat, chips added] per decision, -1 for a fold
+      result:           stacks after the hand
+
+    With a stream, hands are written as JSON lines as they finish; otherwise
+    they are kept in self.hands. Only two-hole-card hold'em is recorded.
+    One recorder may follow many tables, also ones playing concurrently
+    (see batching.play_concurrently): hands in progress are kept per table.
+    """
+    _lock = threading.Lock()
+
+    def __init__(self, stream=None):
+        self.stream = stream
+        self.hands = []
+        self.count = 0
+        self._hands = {}    # hand in progress by the game's SeatTable
+
+    def start_hand(self, game):
+        self._hands[game.seats] = {
+            "ruleset": game.ruleset.name,
+            "players": [p.name for p in game.players],
+            "stacks": [p.chips for p in game.players],
+            "button": game.button_position,
+            "deck": bytes(card_id(c) for c in game.dealer.deck.cards).hex(),
+            "actions": [],
+        }
+
+    def action(self, player, old_bet, call_amount, phase):
+        added = FOLD if player.folded else player.current_bet - old_bet
+        self._hands[player.seats]["actions"].append([player.seat, added])
+
+    def end_hand(self, game):
+        hand = self._hands.pop(game.seats)
+        level = getattr(game, "level", None)
+        hand["blinds"] = [game.current_small_blind, game.current_big_blind, level.ante if level else 0]
+        hand["result"] = [p.chips for p in game.players]
+        line = json.dumps(hand, separators=(",", ":")) + "\n" if self.stream is not None else None
+        with HandRecorder._lock:
+            self.count += 1
+            if line is not None:
+                self.stream.write(line)
+            else:
+                self.hands.append(hand)
+
+
+class _Script:
+    """The recorded decisions of one hand, handed out in order."""
+    def __init__(self, actions):
+        self.actions = actions
+        self.cursor = 0
+
+    def next(self, seat):
+        if self.cursor >= len(self.actions):
+            raise ReplayMismatch(f"Seat {seat} asked to act after the recorded actions ran out")
+        recorded_seat, added = self.actions[self.cursor]
+        if recorded_seat != seat:
+            raise ReplayMismatch(f"Seat {seat} asked to act, but action {self.cursor} was recorded for seat {recorded_seat}")
+        self.cursor += 1
+        return added
+
+
+class ReplayPlayer(Player):
+    """Plays back recorded decisions instead of computing them."""
+    __slots__ = ("script",)
+
+    def __init__(self, name, chips, script):
+        super().__init__(name, chips=chips)
+        self.script = script
+
+    def make_decision(self, highest_bet, call_amount):
+        if self.folded or self.chips <= 0:
+            return
+        added = self.script.next(self.seat)
+        if added == FOLD:
+            self.fold()
+        else:
+            self.place_bet(added)
+
+
+class ReplayDealer(Dealer):
+    """Deals from a recorded deck order rather than a fresh shuffle."""
+    def __init__(self, ruleset, order):
+        self.ruleset = ruleset
+        self.order = order
+        self.deck = None
+        self.community_cards = []
+
+    def reset_deck(self, num_decks=1):
+        self.deck = _RecordedDeck([_CARDS[c] for c in self.order])
+        self.community_cards = []
+
+
+class _RecordedDeck:
+    # Replays only draw from the front; skipping SingleDeck's composition
+    # bookkeeping keeps replay cheap.
+    def __init__(self, cards):
+        self.cards = cards
+        self.cursor = 0
+
+    def draw_card(self):
+        card = self.cards[self.cursor]
+        self.cursor += 1
+        return card
+
+
+class HandReplayer:
+    """
+    Re-executes recorded hands through the hold'em engine with
+    ReplayPlayers. One headless table is reused for every hand, with the
+    hand's players seated into it, so streaming a log does not rebuild a
+    game, deck and dealer per hand.
+    """
+    def __init__(self):
+        self.game = TournamentTable(0, [])
+
+    def replay(self, hand):
+        """
+        Return the stacks after replaying one hand. Raises ReplayMismatch if
+        the engine asks for decisions in a different order than recorded.
+        """
+        game = self.game
+        for player in list(game.players):
+            game.seats.unseat(player)
+        script = _Script(hand["actions"])
+        for name, chips in zip(hand["players"], hand["stacks"]):
+            game.seats.seat(ReplayPlayer(name, chips, script))
+
+        small_blind, big_blind, ante = hand["blinds"]
+        game.ruleset = RULESETS[hand["ruleset"]]
+        game.level = BlindLevel(small_blind, big_blind, ante)
+        game.dealer = ReplayDealer(game.ruleset, bytes.fromhex(hand["deck"]))
+        game.button_position = hand["button"]
+        game._play_hand()
+        if script.cursor != len(script.actions):
+            raise ReplayMismatch(f"Only {script.cursor} of {len(script.actions)} recorded actions were used")
+        return [p.chips for p in game.players]
+
+    def verify(self, hand):
+        """True if replaying the hand reproduces its recorded result."""
+        try:
+            return self.replay(hand) == hand["result"]
+        except ReplayMismatch:
+            return False
+
+
+def replay_hand(hand):
+    return HandReplayer().replay(hand)
+
+
+def verify_hand(hand):
+    return HandReplayer().verify(hand)
+
+
+def iter_log(path):
+    """Stream hands from a JSON-lines hand-history log without loading it whole."""
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _verify_lines(start, lines):
+    replayer = HandReplayer()
+    mismatches = []
+    for i, line in enumerate(lines, start=start):
+        if not replayer.verify(json.loads(line)):
+            mismatches.append(i)
+    return len(lines), mismatches
+
+
+def _chunks(path, chunk):
+    with open(path) as f:
+        start = 0
+        while True:
+            lines = [line for line in islice(f, chunk) if line.strip()]
+            if not lines:
+                return
+            yield start, lines
+            start += len(lines)
+
+
+def replay_log(path, workers=1, chunk=2000):
+    """
+    Replay every hand of a log and check it against its recorded result.
+    Hands are independent, so with workers > 1 chunks of raw lines are
+    replayed in separate processes. Returns {"hands", "mismatches" (0-based
+    hand numbers), "seconds", "hands_per_sec"}.
+    """
+    start_time = time.perf_counter()
+    hands = 0
+    mismatches = []
+    if workers <= 1:
+        results = (_verify_lines(start, lines) for start, lines in _chunks(path, chunk))
+        for count, bad in results:
+            hands += count
+            mismatches.extend(bad)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = []
+            for start, lines in _chunks(path, chunk):
+                pending.append(pool.submit(_verify_lines, start, lines))
+                # Keep a bounded number of chunks in flight for huge logs.
+                if len(pending) >= 2 * workers:
+                    count, bad = pending.pop(0).result()
+                    hands += count
+                    mismatches.extend(bad)
+            for future in pending:
+                count, bad = future.result()
+                hands += count
+                mismatches.extend(bad)
+    elapsed = time.perf_counter() - start_time
+    return {
+        "hands": hands,
+        "mismatches": sorted(mismatches),
+        "seconds": elapsed,
+        "hands_per_sec": hands / elapsed if elapsed else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+
+    from ai_player import AlphaBetaPlayer, MinimaxPlayer
+    from player import RandomPlayer
+    from texas_holdem import TexasHoldemGame
+
+    random.seed(1)
+    players = [RandomPlayer("Alice", 1000), RandomPlayer("Bob", 1000),
+               MinimaxPlayer("Charlie", 1000), AlphaBetaPlayer("David", 1000)]
+    game = TexasHoldemGame(players, testing=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hands.jsonl")
+        with open(path, "w") as f:
+            game.recorder = HandRecorder(f)
+            start = time.perf_counter()
+            for _ in range(300):
+                game.play_round()
+            live = time.perf_counter() - start
+        print(f"Recorded {game.recorder.count} hands at {game.recorder.count / live:,.0f} hands/s")
+
+        result = replay_log(path)
+        print(f"Replayed {result['hands']} hands at {result['hands_per_sec']:,.0f} hands/s, "
+              f"{len(result['mismatches'])} mismatches")
@@ -0,0 +1,273 @@
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id INTEGER PRIMARY KEY,
+    label TEXT,
+    started REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS hands (
+    hand_id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL,
+    table_id INTEGER NOT NULL,
+    big_blind INTEGER NOT NULL,
+    players INTEGER NOT NULL,
+    showdown INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS player_hands (
+    hand_id INTEGER NOT NULL,
+    seat INTEGER NOT NULL,
+    player TEXT NOT NULL,
+    player_class TEXT NOT NULL,
+    position TEXT NOT NULL,
+    stack INTEGER NOT NULL,
+    result INTEGER NOT NULL,
+    won INTEGER NOT NULL,
+    folded INTEGER NOT NULL,
+    PRIMARY KEY (hand_id, seat)
+) WITHOUT ROWID;
+-- Covering index for per-class, per-position outcome queries over recent hands.
+CREATE INDEX IF NOT EXISTS player_hands_class_position
+    ON player_hands (player_class, position, hand_id, won, result);
+CREATE INDEX IF NOT EXISTS player_hands_player ON player_hands (player, hand_id);
+CREATE INDEX IF NOT EXISTS player_hands_stack ON player_hands (stack);
+CREATE INDEX IF NOT EXISTS player_hands_result ON player_hands (result);
+CREATE INDEX IF NOT EXISTS hands_run ON hands (run_id);
+"""
+
+
+def _connect(path, timeout=30.0, check_same_thread=True):
+    connection = sqlite3.connect(path, timeout=timeout, check_same_thread=check_same_thread)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # With WAL, NORMAL only risks the last transactions on power loss, never corruption.
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class ResultsStore:
+    """
+    Persistent SQLite store of simulation results: one `hands` row per hand
+    and one `player_hands` row per seat, with the player's class, position
+    (BUTTON name), starting stack, chip result and whether they won chips.
+    Attach it as game.recorder at any number of tables of one process.
+
+    end_hand only queues the rows; a background thread writes whatever has
+    queued up, at most `batch_size` hands per transaction, with executemany,
+    so simulations never wait on the disk. Hand ids are allocated inside
+    each write transaction. The database runs in WAL mode, so queries (from
+    this object or any other process) read concurrently with the writer.
+    Each store opening is one row of `runs`, so results of many runs, open
+    at the same time or not, share one file.
+    """
+    def __init__(self, path, label=None, batch_size=10_000):
+        self.path = path
+        self.batch_size = batch_size
+        self.error = None
+        self.hands_written = 0
+        self.transactions = 0
+        self._hands = {}
+        self._pending = queue.Queue()
+
+        setup = _connect(path)
+        with setup:
+            setup.executescript(SCHEMA)
+            self.run_id = setup.execute("INSERT INTO runs (label, started) VALUES (?, ?)",
+                                        (label, time.time())).lastrowid
+        setup.close()
+        self._reader = None
+        self._reader_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # Game events
+
+    def start_hand(self, game):
+        self._hands[id(game)] = [p.chips for p in game.players]
+
+    def action(self, player, old_bet, call_amount, phase):
+        pass
+
+    def end_hand(self, game):
+        stacks = self._hands.pop(id(game))
+        contenders = sum(1 for p in game.players if not p.folded and p.hand)
+        hand = (getattr(game, "table_id", 0), game.current_big_blind, len(game.players),
+                int(contenders > 1 and len(game.dealer.community_cards) == 5))
+        seats = [(seat, p.name, type(p).__name__, p.position.name, stacks[seat], p.chips - stacks[seat],
+                  int(p.chips > stacks[seat]), int(p.folded))
+                 for seat, p in enumerate(game.players)]
+        self.submit(hand, seats)
+
+    def submit(self, hand, seats):
+        """
+        Queue one hand: (table id, big blind, players, showdown) and a list of
+        (seat, player, class, position, stack, result, won, folded).
+        """
+        if self.error is not None:
+            raise self.error
+        self._pending.put((hand, seats))
+
+    # Writer thread
+
+    def _run(self):
+        connection = _connect(self.path)
+        try:
+            while True:
+                item = self._pending.get()
+                if item is None:
+                    self._pending.task_done()
+                    return
+                batch = [item]
+                stop = False
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._pending.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is None:
+                        stop = True
+                        break
+                    batch.append(item)
+                try:
+                    self._write(connection, batch)
+                except sqlite3.Error as e:
+                    self.error = e
+                finally:
+                    for _ in range(len(batch) + stop):
+                        self._pending.task_done()
+                if stop:
+                    return
+        finally:
+            connection.close()
+
+    def _write(self, connection, batch):
+        # Hand ids are taken under the database's write lock, so stores of other
+        # runs or processes writing to the same file never hand out the same ids.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            first = connection.execute("SELECT COALESCE(MAX(hand_id), 0) + 1 FROM hands").fetchone()[0]
+        except sqlite3.Error:
+            connection.rollback()
+            raise
+        hand_rows = []
+        seat_rows = []
+        for offset, (hand, seats) in enumerate(batch):
+            hand_id = first + offset
+            hand_rows.append((hand_id, self.run_id) + tuple(hand))
+            seat_rows.extend((hand_id,) + tuple(seat) for seat in seats)
+        with connection:
+            connection.executemany("INSERT INTO hands VALUES (?, ?, ?, ?, ?, ?)", hand_rows)
+            connection.executemany("INSERT INTO player_hands VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", seat_rows)
+        self.hands_written += len(batch)
+        self.transactions += 1
+
+    def flush(self):
+        """Block until every queued hand is committed."""
+        self._pending.join()
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        """Write everything still queued, stop the writer and raise any write error."""
+        self._pending.put(None)
+        self._thread.join()
+        with self._reader_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Queries
+
+    def query(self, sql, params=()):
+        """
+        Run a read query on the store's reader connection, which any thread
+        may use (one query at a time); WAL readers never block the writer.
+        """
+        with self._reader_lock:
+            if self._reader is None:
+                self._reader = _connect(self.path, check_same_thread=False)
+            return self._reader.execute(sql, params).fetchall()
+
+    def win_rate(self, player_class, position=None, last_hands=None):
+        """
+        {"hands", "wins", "win_rate", "mean_result"} for seats of
+        `player_class` (from `position`, a BUTTON or its name, if given) over
+        the last `last_hands` hands in the store. Answered from the covering
+        (player_class, position, hand_id, won, result) index.
+        """
+        sql = "SELECT COUNT(*), COALESCE(SUM(won), 0), AVG(result) FROM player_hands WHERE player_class = ?"
+        params = [player_class]
+        if position is not None:
+            sql += " AND position = ?"
+            params.append(getattr(position, "name", position))
+        if last_hands is not None:
+            sql += " AND hand_id > (SELECT COALESCE(MAX(hand_id), 0) FROM hands) - ?"
+            params.append(last_hands)
+        hands, wins, mean_result = self.query(sql, params)[0]
+        return {
+            "hands": hands,
+            "wins": wins,
+            "win_rate": wins / hands if hands else 0.0,
+            "mean_result": mean_result or 0.0,
+        }
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+
+    from ai_player import AlphaBetaPlayer, MinimaxPlayer
+    from card_enums import BUTTON
+    from player import RandomPlayer
+    from tournament import BlindLevel, TournamentTable
+
+    random.seed(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.db")
+        with ResultsStore(path, label="demo") as store:
+            tables = []
+            for table_id in range(8):
+                players = [RandomPlayer(f"Random{table_id}", 1_000_000), MinimaxPlayer(f"Minimax{table_id}", 1_000_000),
+                           AlphaBetaPlayer(f"AlphaBeta{table_id}", 1_000_000)]
+                table = TournamentTable(table_id, players)
+                table.level = BlindLevel(5, 10)
+                table.recorder = store
+                tables.append(table)
+            start = time.perf_counter()
+            for _ in range(1000):
+                for table in tables:
+                    table.play_round()
+            played = time.perf_counter() - start
+            store.flush()
+            print(f"{store.hands_written:,} hands played in {played:.1f}s, "
+                  f"written in {store.transactions} transactions")
+
+            # Pad the store out with synthetic hands so the query has something to skip over.
+            rows = ((0, 10, 3, 0), [(0, "Random0", "RandomPlayer", "DEALER", 1000, 5, 1, 0),
+                                    (1, "Minimax0", "MinimaxPlayer", "SB", 1000, -5, 0, 1),
+                                    (2, "AlphaBeta0", "AlphaBetaPlayer", "BB", 1000, 0, 0, 0)])
+            start = time.perf_counter()
+            for _ in range(500_000):
+                store.submit(*rows)
+            store.flush()
+            print(f"Bulk-inserted 500,000 hands in {time.perf_counter() - start:.1f}s")
+
+            start = time.perf_counter()
+            stats = store.win_rate("MinimaxPlayer", BUTTON.SB, last_hands=100_000)
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"MinimaxPlayer from the SB over the last 100,000 hands: {stats['win_rate']:.1%} "
+                  f"of {stats['hands']:,} hands ({elapsed:.1f}ms)")
+            plan = store.query("EXPLAIN QUERY PLAN SELECT COUNT(*), SUM(won) FROM player_hands "
+                               "WHERE player_class = 'MinimaxPlayer' AND position = 'SB' AND hand_id > 1000")
+            print("Plan:", "; ".join(row[-1] for row in plan))
@@ -0,0 +1,167 @@
+from collections import Counter
+from itertools import combinations, combinations_with_replacement
+
+from card_enums import RANK
+from evaluator import Evaluator, EvaluatorTable
+
+
+class Ruleset:
+    """
+    Deck composition and hand-ranking rules for a hold'em variant.
+
+    ranks:          the RANKs in the deck
+    hand_ranks:     category name -> strength, like Evaluator.HAND_RANKS
+    low_straight:   card values of the ace-low straight, e.g. (14, 2, 3, 4, 5)
+
+    Each ruleset precomputes its own 5-card table keyed by (values sorted
+    descending, flush), covering every rank multiset and suit pattern a
+    deck of any size allows (five of a kind and paired flushes only occur
+    with several decks), so a hand is ranked with one dict lookup. The standard table gives exactly
+    Evaluator.get_hand_rank's results. A parallel table holds the same ranks
+    as packed integer scores (see Evaluator.pack_rank), which showdowns
+    compare instead of tuples.
+    """
+    def __init__(self, name, ranks, hand_ranks, low_straight):
+        self.name = name
+        self.ranks = list(ranks)
+        self.hand_ranks = dict(hand_ranks)
+        self.low_straight = tuple(low_straight)
+
+        values = sorted(Ruleset.rank_value(r) for r in self.ranks)
+        present = set(values)
+        self.straight_highs = {}
+        for v in values:
+            run = tuple(range(v, v + 5))
+            if present.issuperset(run):
+                self.straight_highs[Ruleset.value_mask(run)] = v + 4
+        self.straight_highs[Ruleset.value_mask(self.low_straight)] = max(x for x in self.low_straight if x != 14)
+
+        self.table = {}
+        for combo in combinations_with_replacement(sorted(values, reverse=True), 5):
+            self.table[(combo, False)] = self._classify(combo, False)
+            self.table[(combo, True)] = self._classify(combo, True)
+        self.scores = {key: Evaluator.pack_rank(rank) for key, rank in self.table.items()}
+
+    def __str__(self):
+        return self.name
+
+    @staticmethod
+    def rank_value(rank):
+        return 14 if rank == RANK.ACE else rank.value + 1
+
+    @staticmethod
+    def value_mask(values):
+        mask = 0
+        for v in values:
+            mask |= 1 << v
+        return mask
+
+    def _classify(self, values, flush):
+        """(strength, kickers) for five card values sorted descending."""
+        counts = Counter(values)
+        by_count = sorted(counts.items(), key=lambda x: (x[1], x[0]), reverse=True)
+        straight_high = self.straight_highs.get(Ruleset.value_mask(values)) if len(counts) == 5 else None
+        ranks = self.hand_ranks
+
+        if flush and straight_high == 14:
+            return (ranks["Royal Flush"], tuple(values))
+        if flush and straight_high:
+            return (ranks["Straight Flush"], (straight_high,))
+
+        candidates = []
+        if by_count[0][1] >= 4:
+            # Five of a kind (several decks) ranks as quads without a kicker, like Evaluator.
+            kicker = by_count[1][0] if len(by_count) > 1 else 0
+            candidates.append((ranks["Four of a Kind"], (by_count[0][0], kicker)))
+        if by_count[0][1] == 3 and by_count[1][1] == 2:
+            candidates.append((ranks["Full House"], (by_count[0][0], by_count[1][0])))
+        if flush:
+            candidates.append((ranks["Flush"], tuple(values)))
+        if straight_high:
+            candidates.append((ranks["Straight"], (straight_high,)))
+        if by_count[0][1] == 3 and by_count[1][1] == 1:
+            candidates.append((ranks["Three of a Kind"], (by_count[0][0],) + tuple(v for v, c in by_count[1:])))
+        if by_count[0][1] == 2 and by_count[1][1] == 2:
+            candidates.append((ranks["Two Pair"], (by_count[0][0], by_count[1][0], by_count[2][0])))
+        if by_count[0][1] == 2 and by_count[1][1] == 1:
+            candidates.append((ranks["One Pair"], (by_count[0][0],) + tuple(v for v, c in by_count[1:])))
+        candidates.append((ranks["High Card"], tuple(values)))
+        # Category order is ruleset-specific, so take the strongest that applies.
+        return max(candidates, key=lambda x: x[0])
+
+    def get_hand_rank(self, cards):
+        values = tuple(sorted((Evaluator.card_value(c) for c in cards), reverse=True))
+        flush = len({c.suit for c in cards}) == 1
+        return self.table[(values, flush)]
+
+    def hand_score(self, cards):
+        values = tuple(sorted((Evaluator.card_value(c) for c in cards), reverse=True))
+        flush = len({c.suit for c in cards}) == 1
+        return self.scores[(values, flush)]
+
+    @staticmethod
+    def _best(all_cards, table):
+        """
+        Best entry of `table` out of any number of cards. Sorting the cards
+        once keeps every 5-card combination already in descending order, so
+        each one is a direct table lookup; flush keys are only tried for the
+        cards of a suit that has five or more.
+        """
+        cards = sorted(((Evaluator.card_value(c), c.suit) for c in all_cards), key=lambda x: x[0], reverse=True)
+        best = max(table[(values, False)] for values in combinations([v for v, _ in cards], 5))
+        for suit, count in Counter(s for _, s in cards).items():
+            if count >= 5:
+                suited = [v for v, s in cards if s == suit]
+                best = max(best, max(table[(values, True)] for values in combinations(suited, 5)))
+        return best
+
+    def best_hand_rank(self, all_cards):
+        return Ruleset._best(all_cards, self.table)
+
+    def best_hand_score(self, all_cards):
+        return Ruleset._best(all_cards, self.scores)
+
+    def describe_score(self, score):
+        return Evaluator.describe_score(score, self.hand_ranks)
+
+    def evaluate_hand(self, player, community_cards):
+        return self.best_hand_rank(player.hand + community_cards)
+
+    def determine_winner(self, players, community_cards):
+        player_ranks = {}
+        for p in players:
+            if not getattr(p, "folded", False):
+                player_ranks[p] = self.best_hand_score(p.hand + community_cards)
+        return EvaluatorTable.top_ranked(player_ranks)
+
+STANDARD = Ruleset("Standard", list(RANK), Evaluator.HAND_RANKS, (14, 2, 3, 4, 5))
+
+SHORT_DECK = Ruleset(
+    "Short Deck (6+)",
+    [r for r in RANK if r not in (RANK.TWO, RANK.THREE, RANK.FOUR, RANK.FIVE)],
+    {
+        "Royal Flush": 9,
+        "Straight Flush": 8,
+        "Four of a Kind": 7,
+        "Flush": 6,
+        "Full House": 5,
+        "Straight": 4,
+        "Three of a Kind": 3,
+        "Two Pair": 2,
+        "One Pair": 1,
+        "High Card": 0
+    },
+    (14, 6, 7, 8, 9),
+)
+
+
+if __name__ == "__main__":
+    from player import RandomPlayer
+    from texas_holdem import TexasHoldemGame
+
+    print(f"{STANDARD}: {len(STANDARD.table)} distinct 5-card rank keys")
+    print(f"{SHORT_DECK}: {len(SHORT_DECK.table)} distinct 5-card rank keys")
+
+    players = [RandomPlayer("Alice", chips=1000), RandomPlayer("Bob", chips=1000), RandomPlayer("Charlie", chips=1000)]
+    game = TexasHoldemGame(players, verbose=True, ruleset=SHORT_DECK)
+    game.play_round()
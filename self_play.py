@@ -0,0 +1,337 @@
+import math
+import random
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from batching import InferenceBatcher, play_concurrently
+from card_enums import BUTTON
+from cfr import ACTIONS, HandStrengthBucketer
+from player import Player
+from tournament import BlindLevel, TournamentTable
+
+POSITIONS = (BUTTON.DEALER, BUTTON.SB, BUTTON.BB)
+STREET_BY_BOARD = {0: 0, 3: 1, 4: 2, 5: 3}
+
+
+def num_features(n_buckets):
+    # bucket one-hot, street one-hot, position one-hot (+ other), pot odds,
+    # stack-to-pot, call as a share of the stack, opponents left
+    return n_buckets + 4 + len(POSITIONS) + 1 + 4
+
+
+class PolicyNetwork:
+    """
+    A small actor-critic MLP in NumPy: one tanh hidden layer shared by a
+    softmax policy head over ACTIONS and a scalar value head (expected hand
+    result in big blinds). Everything works on batches, so one forward pass
+    can serve a whole step of tables.
+    """
+    def __init__(self, n_features, hidden=64, seed=None):
+        rng = np.random.default_rng(seed)
+        self.w1 = (rng.standard_normal((n_features, hidden)) / math.sqrt(n_features)).astype(np.float32)
+        self.b1 = np.zeros(hidden, dtype=np.float32)
+        self.wp = (rng.standard_normal((hidden, len(ACTIONS))) * 0.01).astype(np.float32)
+        self.bp = np.zeros(len(ACTIONS), dtype=np.float32)
+        self.wv = (rng.standard_normal(hidden) * 0.01).astype(np.float32)
+        self.bv = np.float32(0.0)
+
+    def forward(self, x):
+        """(action probabilities (n, 3), values (n,)) for a (n, features) batch."""
+        h = np.tanh(x @ self.w1 + self.b1)
+        logits = h @ self.wp + self.bp
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        return probs, h @ self.wv + self.bv
+
+    def __call__(self, features):
+        """Action probabilities for one feature vector (a batch of one)."""
+        return self.probabilities(features[None])[0]
+
+    def probabilities(self, x):
+        """Action probabilities for a batch, the model an InferenceBatcher needs."""
+        probs, _ = self.forward(x)
+        return probs
+
+    def update(self, x, actions, returns, lr=0.01, value_coef=0.5, entropy_coef=0.01, max_norm=1.0):
+        """
+        One advantage actor-critic gradient step on a batch: the policy
+        gradient uses the value head as baseline, the value head regresses on
+        the returns, and an entropy bonus keeps the policy exploring.
+        Returns the batch's (policy loss, value loss, entropy).
+        """
+        n = len(x)
+        h = np.tanh(x @ self.w1 + self.b1)
+        logits = h @ self.wp + self.bp
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        values = h @ self.wv + self.bv
+
+        advantages = returns - values
+        chosen = np.zeros_like(probs)
+        chosen[np.arange(n), actions] = 1.0
+        log_probs = np.log(probs + 1e-8)
+        entropy = -(probs * log_probs).sum(axis=1)
+
+        # d(loss)/d(logits) for -A*log p(a) - c*H, and for c_v * (v - R)^2 / 2.
+        d_logits = -advantages[:, None] * (chosen - probs)
+        d_logits += entropy_coef * probs * (log_probs + entropy[:, None])
+        d_logits /= n
+        d_values = value_coef * (values - returns) / n
+
+        d_h = d_logits @ self.wp.T + d_values[:, None] * self.wv
+        d_pre = d_h * (1 - h ** 2)
+        grads = {
+            "wp": h.T @ d_logits, "bp": d_logits.sum(axis=0),
+            "wv": h.T @ d_values, "bv": d_values.sum(),
+            "w1": x.T @ d_pre, "b1": d_pre.sum(axis=0),
+        }
+        norm = math.sqrt(sum(float((g ** 2).sum()) for g in grads.values()))
+        scale = lr * min(1.0, max_norm / norm) if norm > 0 else lr
+        for name, grad in grads.items():
+            setattr(self, name, (getattr(self, name) - scale * grad).astype(np.float32))
+
+        policy_loss = float(-(advantages * log_probs[np.arange(n), actions]).mean())
+        value_loss = float(((values - returns) ** 2).mean() / 2)
+        return policy_loss, value_loss, float(entropy.mean())
+
+
+class PolicyPlayer(Player):
+    """
+    Plays by sampling from a policy: any callable mapping one feature vector
+    to probabilities over ACTIONS (a PolicyNetwork, or a
+    batching.InferenceBatcher in front of one). Features are the equity
+    bucket, street, position, pot odds, stack-to-pot ratio, the call as a
+    share of the stack and the share of opponents still in. The pot is the
+    chips the table has put in since the hand's first stack snapshot, so no
+    blind sizes are needed.
+
+    With record=True every decision is kept as (features, action index)
+    until take_decisions() hands them to the trainer.
+    """
+    __slots__ = ("policy", "bucketer", "record", "decisions", "_start_chips")
+
+    def __init__(self, name, chips=1000, community_cards=None, position=BUTTON.PLAYER, verbose=False,
+                 policy=None, bucketer=None, record=False):
+        super().__init__(name, chips=chips, community_cards=community_cards, position=position, verbose=verbose)
+        if policy is None:
+            raise ValueError("PolicyPlayer needs a policy")
+        self.policy = policy
+        self.bucketer = bucketer if bucketer is not None else HandStrengthBucketer(samples=8)
+        self.record = record
+        self.decisions = []
+        self._start_chips = 0
+
+    def receive_cards(self, cards):
+        super().receive_cards(cards)
+        # Hole cards are dealt before the blinds, so stacks are still untouched here.
+        if len(self.hand) == 2:
+            self._start_chips = sum(self.seats.chips) if self.seats is not None else self.chips
+
+    def features(self, call_amount):
+        n_buckets = self.bucketer.n_buckets
+        x = np.zeros(num_features(n_buckets), dtype=np.float32)
+        x[self.bucketer.bucket(self.hand, self.community_cards)] = 1.0
+        i = n_buckets
+        x[i + STREET_BY_BOARD.get(len(self.community_cards), 3)] = 1.0
+        i += 4
+        x[i + (POSITIONS.index(self.position) if self.position in POSITIONS else len(POSITIONS))] = 1.0
+        i += len(POSITIONS) + 1
+
+        if self.seats is not None:
+            pot = max(1, self._start_chips - sum(self.seats.chips))
+            others = [p for p in self.seats.players if p is not self]
+            live = sum(1 for p in others if not p.folded)
+            share_left = live / len(others) if others else 0.0
+        else:
+            pot, share_left = 1, 0.0
+        x[i] = call_amount / (pot + call_amount)
+        x[i + 1] = math.log1p(self.chips / pot) / 5
+        x[i + 2] = min(1.0, call_amount / self.chips) if self.chips else 1.0
+        x[i + 3] = share_left
+        return x
+
+    def take_decisions(self):
+        decisions, self.decisions = self.decisions, []
+        return decisions
+
+    def make_decision(self, highest_bet, call_amount):
+        if self.folded or self.chips <= 0:
+            return
+
+        features = self.features(call_amount)
+        probs = self.policy(features)
+        action = random.choices(range(len(ACTIONS)), weights=probs)[0]
+        if ACTIONS[action] == "fold" and call_amount == 0:
+            action = ACTIONS.index("call")
+        if self.record:
+            self.decisions.append((features, action))
+
+        if ACTIONS[action] == "fold":
+            self.fold()
+            if self.verbose:
+                print(f"{self.name} folds (policy).")
+        elif ACTIONS[action] == "call" or call_amount >= self.chips:
+            amount = min(call_amount, self.chips)
+            self.place_bet(amount)
+            if self.verbose:
+                print(f"{self.name} calls {amount} (policy).")
+        else:
+            # Half-pot raises, at least the size of the call.
+            pot = max(1, self._start_chips - sum(self.seats.chips)) if self.seats is not None else call_amount
+            raise_amount = min(self.chips - call_amount, max(call_amount, pot // 2, 1))
+            self.place_bet(call_amount + raise_amount)
+            if self.verbose:
+                print(f"{self.name} raises to {call_amount + raise_amount} (policy).")
+
+
+def _collect_worker(network, tables, seats, hands, n_buckets, level, depth, max_batch_size, max_wait, seed):
+    """
+    Play `hands` hands at each of `tables` self-play tables, one thread per
+    table sharing an InferenceBatcher, and return (features, actions,
+    returns in big blinds, inference batches). Stacks are re-dealt before
+    every hand at a random depth in big blinds.
+    """
+    random.seed(seed)
+    rng = random.Random(seed)
+    batcher = InferenceBatcher(network.probabilities, max_batch_size, max_wait)
+    bucketer = HandStrengthBucketer(n_buckets, samples=8)
+    games = []
+    for t in range(tables):
+        players = [PolicyPlayer(f"T{t}S{s}", policy=batcher, bucketer=bucketer, record=True) for s in range(seats)]
+        game = TournamentTable(t, players)
+        game.level = level
+        games.append(game)
+
+    # Stacks are drawn up front so the shared rng is not touched from the threads.
+    low, high = depth
+    stacks = {game.table_id: [[rng.randint(low, high) * level.big_blind for _ in range(seats)] for _ in range(hands)]
+              for game in games}
+    samples = []
+    lock = threading.Lock()
+
+    def deal_stacks(game, i):
+        for player, stack in zip(game.players, stacks[game.table_id][i]):
+            player.chips = stack
+
+    def collect(game, i):
+        rows = []
+        for player, stack in zip(game.players, stacks[game.table_id][i]):
+            result = (player.chips - stack) / level.big_blind
+            rows.extend((features, action, result) for features, action in player.take_decisions())
+        with lock:
+            samples.extend(rows)
+
+    play_concurrently(games, hands, batcher, before_round=deal_stacks, after_round=collect)
+
+    if not samples:
+        return np.zeros((0, num_features(n_buckets)), np.float32), np.zeros(0, np.int64), np.zeros(0, np.float32), 0
+    x = np.stack([s[0] for s in samples])
+    actions = np.array([s[1] for s in samples], dtype=np.int64)
+    returns = np.array([s[2] for s in samples], dtype=np.float32)
+    return x, actions, returns, batcher.batches
+
+
+class SelfPlayTrainer:
+    """
+    Trains a PolicyNetwork by self-play on the real engine: every seat of
+    `tables` TournamentTables per worker is a PolicyPlayer sharing the
+    current network. Within a worker the tables run in threads and their
+    decisions meet in an InferenceBatcher: by default (max_wait None, a
+    batch as large as the table count) that is one forward pass per step
+    of every running table; with workers > 1 the tables are spread over
+    processes that each get a copy of the network. Each decision is
+    credited with the hand's result, in units of `reward_scale` big blinds
+    to keep the value targets near 1.
+
+    Every iteration's throughput is appended to `history`: hands/s and
+    samples/s of collection, the mean inference batch size, and the time
+    spent collecting versus updating.
+    """
+    def __init__(self, network=None, n_buckets=8, hidden=64, tables=16, seats=6, workers=1,
+                 level=None, depth=(20, 200), reward_scale=100, lr=0.01, batch_size=256, epochs=2,
+                 max_batch_size=None, max_wait=None, seed=None):
+        self.n_buckets = n_buckets
+        self.network = network if network is not None else PolicyNetwork(num_features(n_buckets), hidden, seed)
+        self.tables = tables
+        self.seats = seats
+        self.workers = workers
+        self.level = level or BlindLevel(5, 10)
+        self.depth = depth
+        self.reward_scale = reward_scale
+        self.max_batch_size = max_batch_size or tables
+        self.max_wait = max_wait
+        self.lr = lr
+        self.batch_size = batch_size
+        self.epochs = epochs
+        self.rng = random.Random(seed)
+        self.history = []
+
+    def collect(self, hands):
+        """Play `hands` hands per table; returns (features, actions, returns, inference batches)."""
+        if self.workers <= 1:
+            return _collect_worker(self.network, self.tables, self.seats, hands, self.n_buckets, self.level,
+                                   self.depth, self.max_batch_size, self.max_wait, self.rng.getrandbits(64))
+        per_worker = [self.tables // self.workers + (i < self.tables % self.workers) for i in range(self.workers)]
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = [pool.submit(_collect_worker, self.network, n, self.seats, hands, self.n_buckets, self.level,
+                                   self.depth, self.max_batch_size, self.max_wait, self.rng.getrandbits(64))
+                       for n in per_worker if n]
+            parts = [future.result() for future in futures]
+        return (np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts]),
+                np.concatenate([p[2] for p in parts]), sum(p[3] for p in parts))
+
+    def train(self, iterations, hands=10):
+        """Alternate collecting `hands` hands per table and updating the network."""
+        for _ in range(iterations):
+            start = time.perf_counter()
+            x, actions, returns, batches = self.collect(hands)
+            returns = returns / self.reward_scale
+            collected = time.perf_counter()
+
+            losses = (0.0, 0.0, 0.0)
+            order = np.arange(len(x))
+            for _ in range(self.epochs):
+                np.random.default_rng(self.rng.getrandbits(64)).shuffle(order)
+                for i in range(0, len(order), self.batch_size):
+                    rows = order[i:i + self.batch_size]
+                    losses = self.network.update(x[rows], actions[rows], returns[rows], lr=self.lr)
+            done = time.perf_counter()
+
+            collect_seconds = collected - start
+            total_hands = hands * self.tables
+            self.history.append({
+                "hands": total_hands,
+                "samples": len(x),
+                "mean_return": float(returns.mean()) * self.reward_scale if len(x) else 0.0,
+                "hands_per_sec": total_hands / collect_seconds,
+                "samples_per_sec": len(x) / collect_seconds,
+                "mean_batch": len(x) / batches if batches else 0.0,
+                "collect_seconds": collect_seconds,
+                "update_seconds": done - collected,
+                "policy_loss": losses[0],
+                "value_loss": losses[1],
+                "entropy": losses[2],
+            })
+        return self.history
+
+    def report(self):
+        lines = []
+        for i, h in enumerate(self.history, 1):
+            lines.append(f"iter {i:3d}: {h['hands']:,} hands, {h['samples']:,} samples, "
+                         f"{h['hands_per_sec']:,.0f} hands/s, {h['samples_per_sec']:,.0f} samples/s, "
+                         f"batch {h['mean_batch']:.1f}, update {h['update_seconds']:.2f}s, "
+                         f"value loss {h['value_loss']:.2f}, entropy {h['entropy']:.3f}")
+        return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    import os
+
+    trainer = SelfPlayTrainer(tables=16, seats=6, workers=os.cpu_count() or 1, seed=1)
+    trainer.train(5, hands=10)
+    print(trainer.report())
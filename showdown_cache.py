@@ -0,0 +1,213 @@
+import os
+import time
+from itertools import chain, combinations, combinations_with_replacement
+
+import numpy as np
+
+from evaluator import MASK_VALUES
+from isomorphism import NUM_RANKS, card_id
+from ruleset import STANDARD
+
+NUM_BOARDS = 2_598_960
+FILES = ("board_masks", "board_keys", "flush_suits", "flush_masks", "nonflush", "flush")
+
+# Rank index 0..12 (two..ace) and suit index of every card id. Card ids put the
+# ace first in each suit, so it moves to the top here.
+_RANK_INDEX = np.array([NUM_RANKS - 1 if c % NUM_RANKS == 0 else c % NUM_RANKS - 1 for c in range(52)],
+                       dtype=np.int64)
+_SUIT_INDEX = np.arange(52, dtype=np.int64) // NUM_RANKS
+
+
+def _rank_multisets(size):
+    """Every multiset of `size` rank indices that one deck allows, in sorted tuples."""
+    return [combo for combo in combinations_with_replacement(range(NUM_RANKS), size)
+            if all(combo.count(r) <= 4 for r in set(combo))]
+
+
+def _multiset_code(ranks):
+    code = 0
+    for r in sorted(ranks):
+        code = code * NUM_RANKS + r
+    return code
+
+
+def _best_nonflush_score(ranks):
+    values = sorted((r + 2 for r in ranks), reverse=True)
+    return max(STANDARD.scores[(combo, False)] for combo in combinations(values, 5))
+
+
+def _nonflush_table(board_multisets):
+    """
+    Best non-flush score for every board rank multiset plus two hole ranks,
+    as an int32 array [board key, hole rank, hole rank]. Seven-card multisets
+    are scored once each and shared between the boards and hole pairs that
+    make them; impossible combinations (five of a rank) stay 0.
+    """
+    table = np.zeros((len(board_multisets), NUM_RANKS, NUM_RANKS), dtype=np.int32)
+    seven = {}
+    for key, board in enumerate(board_multisets):
+        for r1 in range(NUM_RANKS):
+            for r2 in range(r1, NUM_RANKS):
+                ranks = tuple(sorted(board + (r1, r2)))
+                if ranks.count(r1) > 4 or ranks.count(r2) > 4:
+                    continue
+                score = seven.get(ranks)
+                if score is None:
+                    score = seven[ranks] = _best_nonflush_score(ranks)
+                table[key, r1, r2] = table[key, r2, r1] = score
+    return table
+
+
+def _flush_table():
+    """Best flush or straight flush score for every 13-bit suited rank mask with five or more cards."""
+    table = np.zeros(1 << NUM_RANKS, dtype=np.int32)
+    for mask, values in enumerate(MASK_VALUES):
+        if len(values) >= 5:
+            table[mask] = max(STANDARD.scores[(combo, True)] for combo in combinations(values, 5))
+    return table
+
+
+def build_showdown_cache(out_dir):
+    """
+    Precompute the all-boards tables into out_dir (about 40 MB):
+
+      board_masks.npy    uint64 52-bit card mask of each of the 2,598,960 boards
+      board_keys.npy     uint16 index of the board's rank multiset
+      flush_suits.npy    int8 suit with three or more board cards, else -1
+      flush_masks.npy    uint16 13-bit rank mask of the board cards in that suit
+      nonflush.npy       int32 [board key, hole rank, hole rank] best non-flush score
+      flush.npy          int32 best flush score of a suited rank mask
+
+    Boards are in lexicographic order of their card ids. Scores are the
+    packed integers of Evaluator.pack_rank.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    boards = np.fromiter(chain.from_iterable(combinations(range(52), 5)), dtype=np.uint8,
+                         count=NUM_BOARDS * 5).reshape(NUM_BOARDS, 5)
+    ranks = _RANK_INDEX[boards]
+    suits = _SUIT_INDEX[boards]
+
+    masks = np.zeros(NUM_BOARDS, dtype=np.uint64)
+    for column in boards.T:
+        masks |= np.left_shift(np.uint64(1), column.astype(np.uint64))
+
+    multisets = _rank_multisets(5)
+    lookup = np.zeros(NUM_RANKS ** 5, dtype=np.uint16)
+    for key, multiset in enumerate(multisets):
+        lookup[_multiset_code(multiset)] = key
+    codes = np.zeros(NUM_BOARDS, dtype=np.int64)
+    for column in np.sort(ranks, axis=1).T:
+        codes = codes * NUM_RANKS + column
+    keys = lookup[codes]
+
+    suit_counts = np.stack([(suits == s).sum(axis=1) for s in range(4)], axis=1)
+    flush_suits = np.where(suit_counts.max(axis=1) >= 3, suit_counts.argmax(axis=1), -1).astype(np.int8)
+    bits = np.left_shift(1, ranks)
+    flush_masks = np.where(suits == flush_suits[:, None], bits, 0).sum(axis=1).astype(np.uint16)
+
+    arrays = {
+        "board_masks": masks,
+        "board_keys": keys,
+        "flush_suits": flush_suits,
+        "flush_masks": flush_masks,
+        "nonflush": _nonflush_table(multisets),
+        "flush": _flush_table(),
+    }
+    for name in FILES:
+        np.save(os.path.join(out_dir, f"{name}.npy"), arrays[name])
+
+
+class ShowdownCache:
+    """
+    Heads-up all-in equity over every possible board, from the tables written
+    by build_showdown_cache. The tables are memory-mapped, so processes
+    opening the same directory share one copy through the page cache.
+
+    A player's score on a board is max(nonflush[board key, hole ranks],
+    flush[board flush mask | suited hole cards]): two small gathers per
+    board, done for all live boards at once in NumPy.
+    """
+    def __init__(self, out_dir):
+        missing = [name for name in FILES if not os.path.exists(os.path.join(out_dir, f"{name}.npy"))]
+        if missing:
+            raise ValueError(f"No showdown cache in {out_dir} (missing {', '.join(missing)})")
+        for name in FILES:
+            # A plain ndarray view of the mapping skips np.memmap's per-operation overhead.
+            table = np.load(os.path.join(out_dir, f"{name}.npy"), mmap_mode="r")
+            setattr(self, name, table.view(np.ndarray))
+
+    @classmethod
+    def open(cls, out_dir):
+        """Load the cache in out_dir, building it first if it is not there yet."""
+        if not os.path.exists(os.path.join(out_dir, f"{FILES[-1]}.npy")):
+            build_showdown_cache(out_dir)
+        return cls(out_dir)
+
+    def _scores(self, hole_ids, keys, flushes, flush_suits, flush_masks):
+        """Scores of one hole pair on the live boards; flush masks are only combined where a flush is possible."""
+        (r1, r2), (s1, s2) = _RANK_INDEX[hole_ids], _SUIT_INDEX[hole_ids]
+        scores = np.asarray(self.nonflush[:, r1, r2])[keys]
+        suited = (flush_masks | np.where(flush_suits == s1, np.uint16(1 << r1), np.uint16(0))
+                  | np.where(flush_suits == s2, np.uint16(1 << r2), np.uint16(0)))
+        scores[flushes] = np.maximum(scores[flushes], self.flush[suited])
+        return scores
+
+    def heads_up(self, hero, villain, board=()):
+        """
+        Exact all-in equity of two hole-card pairs over every board that
+        completes the known `board` cards (0 to 5 of them). Returns
+        {"win", "tie", "lose" (board counts for hero), "boards", "equity"}.
+        """
+        hero_ids = [card_id(c) for c in hero]
+        villain_ids = [card_id(c) for c in villain]
+        board_ids = [card_id(c) for c in board]
+        if len(set(hero_ids + villain_ids + board_ids)) != 4 + len(board_ids):
+            raise ValueError("Hole and board cards must be distinct")
+
+        dead = np.uint64(sum(1 << c for c in hero_ids + villain_ids))
+        known = np.uint64(sum(1 << c for c in board_ids))
+        masks = self.board_masks
+        live = (masks & dead) == 0
+        if board_ids:
+            live &= (masks & known) == known
+        live = np.flatnonzero(live)
+
+        keys = self.board_keys[live]
+        # Only boards with three or more cards of a suit can make a flush.
+        flush_suits = self.flush_suits[live]
+        flushes = np.flatnonzero(flush_suits >= 0)
+        flush_suits = flush_suits[flushes]
+        flush_masks = self.flush_masks[live[flushes]]
+        hero_scores = self._scores(hero_ids, keys, flushes, flush_suits, flush_masks)
+        villain_scores = self._scores(villain_ids, keys, flushes, flush_suits, flush_masks)
+
+        win = int(np.count_nonzero(hero_scores > villain_scores))
+        tie = int(np.count_nonzero(hero_scores == villain_scores))
+        boards = len(live)
+        return {
+            "win": win,
+            "tie": tie,
+            "lose": boards - win - tie,
+            "boards": boards,
+            "equity": (win + tie / 2) / boards,
+        }
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    from equity import CHAR_TO_RANK, CHAR_TO_SUIT
+    from card import Card
+
+    def cards(text):
+        return [Card(CHAR_TO_RANK[text[i]], CHAR_TO_SUIT[text[i + 1]]) for i in range(0, len(text), 2)]
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        start = time.perf_counter()
+        cache = ShowdownCache.open(out_dir)
+        print(f"Built the showdown cache in {time.perf_counter() - start:.1f}s")
+        for hero, villain in (("AhAs", "KdKc"), ("AhKh", "QsQd"), ("7c2d", "AsKs")):
+            start = time.perf_counter()
+            result = cache.heads_up(cards(hero), cards(villain))
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{hero} vs {villain}: {result['equity']:.4f} over {result['boards']:,} boards in {elapsed:.0f}ms")
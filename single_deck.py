@@ -1,21 +1,53 @@
 import random
+import numpy as np
 import pandas as pd
 
 from card import Card
 from card_enums import RANK, SUIT
+from ruleset import STANDARD
+
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUIT)}
 
 class SingleDeck:
-    def __init__(self):
-        self.cards = [Card(rank, suit) for suit in SUIT for rank in RANK]
+    def __init__(self, ruleset=None):
+        self.ruleset = ruleset or STANDARD
+        self.cards = [Card(rank, suit) for suit in SUIT for rank in self.ruleset.ranks]
+        self.counters = []
+        self._rebuild_counts()
 
     def __str__(self):
         return "\n".join(str(card) for card in self.cards)
 
+    def _rebuild_counts(self):
+        """
+        Recount the rank x suit composition from scratch. Only needed when
+        self.cards is replaced wholesale; draws, adds and removes keep the
+        matrix up to date in O(1).
+        """
+        self.counts = np.zeros((len(RANK), len(SUIT)), dtype=np.int32)
+        for card in self.cards:
+            self.counts[card.value, SUIT_INDEX[card.suit]] += 1
+        self.rank_totals = self.counts.sum(axis=1)
+
+    def _update_counts(self, card, delta):
+        self.counts[card.value, SUIT_INDEX[card.suit]] += delta
+        self.rank_totals[card.value] += delta
+
+    def attach_counter(self, counter):
+        """Register a counting system to be told about every card leaving or re-entering the deck."""
+        self.counters.append(counter)
+
     def add_card(self, card: Card):
         self.cards.append(card)
+        self._update_counts(card, 1)
+        for counter in self.counters:
+            counter.observe(card, -1)
 
     def remove_card(self, card: Card):
         self.cards.remove(card)
+        self._update_counts(card, -1)
+        for counter in self.counters:
+            counter.observe(card)
 
     def shuffle(self):
         random.shuffle(self.cards)
@@ -25,18 +57,33 @@ class SingleDeck:
             print(f"{i}: {card}")
 
     def draw_card(self):
-        return self.cards.pop(0) if self.cards else None
+        if not self.cards:
+            return None
+        card = self.cards.pop(0)
+        self._update_counts(card, -1)
+        for counter in self.counters:
+            counter.observe(card)
+        return card
+
+    def remaining(self, rank: RANK, suit: SUIT = None):
+        """Cards of a rank (optionally of one suit) still in the deck."""
+        if suit is None:
+            return int(self.rank_totals[rank.value])
+        return int(self.counts[rank.value, SUIT_INDEX[suit]])
+
+    def rank_probability(self, rank: RANK):
+        """Probability that the next card drawn has this rank."""
+        return self.rank_totals[rank.value] / len(self.cards) if self.cards else 0.0
+
+    def card_probability(self, rank: RANK, suit: SUIT):
+        """Probability that the next card drawn is exactly this rank and suit."""
+        return self.counts[rank.value, SUIT_INDEX[suit]] / len(self.cards) if self.cards else 0.0
 
     def display_table(self):
         ranks = [rank.name for rank in RANK]
         suits = [suit.name for suit in SUIT]
 
-        table = {suit: [0 for _ in ranks] for suit in suits}
-
-        for card in self.cards:
-            table[card.suit.name][ranks.index(card.rank.name)] += 1
-
-        df = pd.DataFrame(table, index=ranks)
+        df = pd.DataFrame(self.counts, index=ranks, columns=suits)
 
         df["Total"] = df.sum(axis=1)
 
@@ -70,3 +117,4 @@ if __name__ == '__main__':
     print("-" * 30)
 
     deck.display_table()
+    print(f"P(next card is an Ace): {deck.rank_probability(RANK.ACE):.4f}")
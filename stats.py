@@ -0,0 +1,267 @@
+import csv
+import math
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from card_enums import PHASE
+
+
+class RunningStats:
+    """
+    Welford's online mean and variance in constant memory. Two instances
+    from separate workers combine exactly with merge() (Chan et al.).
+    """
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def push(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def merge(self, other):
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        """Sample variance (0 for fewer than two values)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def stderr(self):
+        return self.stdev / math.sqrt(self.count) if self.count else 0.0
+
+    def confidence_interval(self, z=1.96):
+        half = z * self.stderr
+        return self.mean - half, self.mean + half
+
+
+class PlayerStats:
+    """Aggregated results and tendencies of one player class."""
+    COUNTERS = ("hands", "vpip", "pfr", "bets", "calls", "checks", "folds", "showdowns", "showdowns_won")
+
+    def __init__(self):
+        for name in PlayerStats.COUNTERS:
+            setattr(self, name, 0)
+        self.winnings = RunningStats()  # net big blinds per hand
+
+    def merge(self, other):
+        for name in PlayerStats.COUNTERS:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.winnings.merge(other.winnings)
+        return self
+
+    def bb_per_100(self, z=1.96):
+        """Win rate in big blinds per 100 hands with its confidence interval."""
+        low, high = self.winnings.confidence_interval(z)
+        return 100 * self.winnings.mean, (100 * low, 100 * high)
+
+    @property
+    def aggression(self):
+        """Aggression factor: bets and raises per call."""
+        if self.calls:
+            return self.bets / self.calls
+        return math.inf if self.bets else 0.0
+
+    def as_row(self, z=1.96):
+        bb100, (low, high) = self.bb_per_100(z)
+        hands = self.hands or 1
+        row = {name: getattr(self, name) for name in PlayerStats.COUNTERS}
+        row.update({
+            "vpip_pct": 100 * self.vpip / hands,
+            "pfr_pct": 100 * self.pfr / hands,
+            "aggression": self.aggression,
+            "bb_per_100": bb100,
+            "bb_per_100_low": low,
+            "bb_per_100_high": high,
+            "bb_stdev": self.winnings.stdev,
+        })
+        return row
+
+
+class StatsCollector:
+    """
+    Streaming statistics fed from game events: set it as game.recorder (or
+    attach it next to other listeners with game.add_recorder). Players are grouped by
+    class name, so memory stays constant however many hands are played.
+    Showdown categories count the final hand of every player who reached a
+    showdown, scored by the game itself (so Omaha hands use two hole cards
+    and three board cards) and named by the game's ruleset. Collectors from separate worker
+    processes combine with merge(). One collector may follow many tables,
+    also ones playing concurrently: hands in progress are kept per table.
+    """
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self.players = {}
+        self.showdown_categories = Counter()
+        self.hands = 0
+        # (stacks, voluntary seats, pre-flop raisers) by the game's SeatTable
+        self._hands = {}
+
+    def _stats(self, player):
+        key = type(player).__name__
+        stats = self.players.get(key)
+        if stats is None:
+            stats = self.players[key] = PlayerStats()
+        return stats
+
+    def start_hand(self, game):
+        self._hands[game.seats] = ([p.chips for p in game.players], set(), set())
+
+    def action(self, player, old_bet, call_amount, phase):
+        _, voluntary, raised = self._hands[player.seats]
+        added = player.current_bet - old_bet
+        with StatsCollector._lock:
+            stats = self._stats(player)
+            if player.folded:
+                stats.folds += 1
+            elif added > call_amount:
+                stats.bets += 1
+                if phase == PHASE.PF:
+                    voluntary.add(player.seat)
+                    raised.add(player.seat)
+            elif added > 0:
+                stats.calls += 1
+                if phase == PHASE.PF:
+                    voluntary.add(player.seat)
+            else:
+                stats.checks += 1
+
+    def end_hand(self, game):
+        stacks, voluntary, raised = self._hands.pop(game.seats)
+        big_blind = game.current_big_blind
+        board = game.dealer.community_cards
+        contenders = [p for p in game.players if not p.folded]
+        showdown = len(contenders) > 1 and len(board) == 5
+        if showdown:
+            scores = game.showdown_scores(contenders)
+            best = max(scores.values())
+
+        with StatsCollector._lock:
+            self.hands += 1
+            for player, before in zip(game.players, stacks):
+                if before <= 0:
+                    continue  # busted players still seated in a cash game
+                stats = self._stats(player)
+                stats.hands += 1
+                stats.vpip += player.seat in voluntary
+                stats.pfr += player.seat in raised
+                stats.winnings.push((player.chips - before) / big_blind)
+                if showdown and player.seat in scores:
+                    stats.showdowns += 1
+                    stats.showdowns_won += scores[player.seat] == best
+                    self.showdown_categories[game.ruleset.describe_score(scores[player.seat])[0]] += 1
+
+    def merge(self, other):
+        for key, stats in other.players.items():
+            if key in self.players:
+                self.players[key].merge(stats)
+            else:
+                self.players[key] = stats
+        self.showdown_categories.update(other.showdown_categories)
+        self.hands += other.hands
+        return self
+
+    def rows(self, z=1.96):
+        return [dict(player=key, **stats.as_row(z)) for key, stats in sorted(self.players.items())]
+
+    def category_rows(self):
+        total = sum(self.showdown_categories.values()) or 1
+        return [{"category": name, "count": count, "frequency": count / total}
+                for name, count in self.showdown_categories.most_common()]
+
+    def to_csv(self, path, z=1.96):
+        rows = self.rows(z)
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["player"])
+            writer.writeheader()
+            writer.writerows(rows)
+
+    def to_parquet(self, path, z=1.96):
+        """Needs pandas with a Parquet engine (pyarrow or fastparquet) installed."""
+        import pandas as pd
+        pd.DataFrame(self.rows(z)).to_parquet(path, index=False)
+
+
+def _collect(make_players, hands, seed):
+    from texas_holdem import TexasHoldemGame
+
+    random.seed(seed)
+    collector = StatsCollector()
+    game = TexasHoldemGame(make_players(), testing=True)
+    game.recorder = collector
+    for _ in range(hands):
+        if sum(1 for p in game.players if p.chips > 0) < 2:
+            game = TexasHoldemGame(make_players(), testing=True)
+            game.recorder = collector
+        game.play_round()
+    return collector
+
+
+def collect(make_players, hands, workers=1, seed=None):
+    """
+    Play `hands` hands of TexasHoldemGame with players from `make_players()`
+    (a picklable function), starting a fresh game whenever only one player
+    has chips left. The hands are split over worker processes and their
+    collectors are merged.
+    """
+    rng = random.Random(seed)
+    if workers <= 1:
+        return _collect(make_players, hands, rng.getrandbits(64))
+    shares = [hands // workers + (1 if i < hands % workers else 0) for i in range(workers)]
+    collector = StatsCollector()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_collect, make_players, n, rng.getrandbits(64)) for n in shares]
+        for future in futures:
+            collector.merge(future.result())
+    return collector
+
+
+def _demo_players():
+    from ai_player import AlphaBetaPlayer, MinimaxPlayer
+    from player import RandomPlayer
+
+    return [RandomPlayer("Random1", 1000), RandomPlayer("Random2", 1000),
+            MinimaxPlayer("Minimax", 1000), AlphaBetaPlayer("AlphaBeta", 1000)]
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    stats = collect(_demo_players, hands=2000, workers=2, seed=1)
+    print(f"{stats.hands} hands in {time.perf_counter() - start:.1f}s")
+    for row in stats.rows():
+        print(f"{row['player']:>16}: {row['bb_per_100']:+8.1f} bb/100 "
+              f"(95% CI {row['bb_per_100_low']:+.1f} to {row['bb_per_100_high']:+.1f}), "
+              f"VPIP {row['vpip_pct']:.0f}%, PFR {row['pfr_pct']:.0f}%, AF {row['aggression']:.2f}")
+    for row in stats.category_rows():
+        print(f"  {row['category']:<16} {row['frequency']:.3f}")
@@ -1,17 +1,130 @@
+from array import array
+
 from card_enums import BUTTON
 from player import Player
 
+
+class SeatTable:
+    """
+    Players in seat order, with their stacks and bets held in two contiguous
+    arrays indexed by seat. Seated Players read and write those arrays through
+    their chips/current_bet properties, so nothing has to be synced by hand.
+    The dealer, small blind and big blind are kept as seat indices, so finding
+    them is O(1) instead of a scan over the players.
+    """
+    def __init__(self, players=()):
+        self.players = []
+        self.chips = array("q")
+        self.bets = array("q")
+        self.dealer = None
+        self.small_blind = None
+        self.big_blind = None
+        players = list(players)
+        # Check everyone first, so a failure leaves no player half-moved.
+        for player in players:
+            if player.seats is not None:
+                raise ValueError(f"{player.name} is already seated at another table")
+        for player in players:
+            self.seat(player)
+
+    def __len__(self):
+        return len(self.players)
+
+    def seat(self, player, index=None):
+        """
+        Seat a player at index, or at the end. A player sits at one table at a
+        time: unseat them from their current SeatTable before moving them.
+        """
+        if player.seats is not None:
+            raise ValueError(f"{player.name} is already seated at another table")
+        if index is None:
+            index = len(self.players)
+        chips, bet = player.chips, player.current_bet
+        self.players.insert(index, player)
+        self.chips.insert(index, chips)
+        self.bets.insert(index, bet)
+        player.seats = self
+        self._renumber(index)
+
+    def unseat(self, player):
+        index = player.seat
+        chips, bet = self.chips[index], self.bets[index]
+        del self.players[index]
+        del self.chips[index]
+        del self.bets[index]
+        player.seats = None
+        player.seat = None
+        player.chips = chips
+        player.current_bet = bet
+        self._renumber(index)
+
+    def _renumber(self, start):
+        for i in range(start, len(self.players)):
+            self.players[i].seat = i
+        # Seat indices have shifted; positions are reassigned next hand.
+        self.dealer = self.small_blind = self.big_blind = None
+
+    def assign_button(self, button):
+        """Put the button on seat `button` and the blinds on the next two seats."""
+        players = self.players
+        n = len(players)
+        if self.dealer is None:
+            for player in players:
+                player.position = BUTTON.NONE
+        else:
+            for seat in (self.dealer, self.small_blind, self.big_blind):
+                players[seat].position = BUTTON.NONE
+        self.dealer = button % n
+        self.small_blind = (button + 1) % n
+        self.big_blind = (button + 2) % n
+        players[self.dealer].position = BUTTON.DEALER
+        players[self.small_blind].position = BUTTON.SB
+        players[self.big_blind].position = BUTTON.BB
+
+    def player_at(self, seat):
+        return self.players[seat] if seat is not None else None
+
+
 class Table:
-    def __init__(self, players):
+    def __init__(self, players, pot_limit=False):
         self.players = players
         self.pot = 0
         self.current_bet = 0
+        self.pot_limit = pot_limit
+
+    def max_bet(self, player, highest_bet=None, committed=None):
+        """
+        Largest total bet the player may have in front of them this street.
+        Under pot-limit a raise may be at most the size of the pot after
+        calling: pot + all bets on the table + the call amount. `committed`
+        is what the player had bet before acting (defaults to their current bet).
+        """
+        if highest_bet is None:
+            highest_bet = self.current_bet
+        if committed is None:
+            committed = player.current_bet
+        stack = player.current_bet + player.chips
+        if not self.pot_limit:
+            return stack
+        others = sum(p.current_bet for p in self.players if p is not player)
+        pot_after_call = self.pot + others + max(highest_bet, committed)
+        return min(max(highest_bet, committed) + pot_after_call, stack)
+
+    def clamp_bet(self, player, highest_bet=None, committed=None):
+        """Return chips bet beyond the pot-limit maximum to the player's stack."""
+        excess = player.current_bet - self.max_bet(player, highest_bet, committed)
+        if excess > 0:
+            player.current_bet -= excess
+            player.chips += excess
+        return max(excess, 0)
 
     def process_bet(self, player, amount):
         if amount < self.current_bet:
             raise ValueError("Bet must be at least the current bet amount.")
         elif amount < player.current_bet:
             raise ValueError("Bet cannot be lower than what you've already put in.")
+        elif self.pot_limit and amount > self.max_bet(player):
+            raise ValueError("Bet exceeds the pot limit.")
         additional_bet = amount - player.current_bet
         if additional_bet > player.chips:
             raise ValueError("Not enough chips to call or raise that amount.")
@@ -36,10 +149,10 @@ class Table:
             raise ValueError("Invalid action.")
 
     def collect_bets(self):
+        # Chips bet before folding stay in the pot.
         for player in self.players:
-            if not player.folded:
-                self.pot += player.current_bet
-                player.current_bet = 0
+            self.pot += player.current_bet
+            player.current_bet = 0
 
     def reset_betting_round(self):
         self.current_bet = 0
@@ -53,9 +166,9 @@ class Table:
             self.pot = 0
             return
 
-        share = self.pot // len(winners)
-        for winner in winners:
-            winner.chips += share
+        share, odd_chips = divmod(self.pot, len(winners))
+        for i, winner in enumerate(winners):
+            winner.chips += share + (1 if i < odd_chips else 0)
         self.pot = 0
 
     def reset_pot(self):
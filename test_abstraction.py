@@ -0,0 +1,96 @@
+import os
+import random
+import tempfile
+import unittest
+import numpy as np
+from abstraction import AbstractionPipeline, BucketIndex, hand_features, iter_canonical_situations
+from card import Card
+from card_enums import PHASE, SUIT
+from isomorphism import canonical_index, holdem_indexer, id_to_card
+
+def relabel(cards, mapping):
+    return [Card(c.rank, mapping[c.suit]) for c in cards]
+
+class TestAbstraction(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.out_dir = cls.tmp.name
+        pipeline = AbstractionPipeline(cls.out_dir, n_buckets=4, runouts=3, opponents=2, chunk_size=40,
+                                       kmeans_iterations=3, limit=120, seed=1)
+        pipeline.build(streets=(PHASE.PF, PHASE.FLOP))
+        cls.index = BucketIndex(cls.out_dir, runouts=3, opponents=2, seed=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_pipeline_writes_sorted_tables(self):
+        self.assertEqual(sorted(os.listdir(self.out_dir)),
+                         sorted(f"{street}.{name}.npy" for street in ("pf", "flop")
+                                for name in ("keys", "buckets", "centroids")))
+        for street in ("pf", "flop"):
+            keys = np.load(os.path.join(self.out_dir, f"{street}.keys.npy"))
+            buckets = np.load(os.path.join(self.out_dir, f"{street}.buckets.npy"))
+            np.testing.assert_array_equal(keys, np.arange(120))
+            self.assertEqual(buckets.dtype, np.uint8)
+            self.assertLess(buckets.max(), 4)
+        self.assertEqual(self.index.n_buckets, 4)
+
+    def test_index_round_trips(self):
+        """Every stored situation, rebuilt from its isomorphism index, looks up its own bucket."""
+        for board_size, street in ((0, "pf"), (3, "flop")):
+            buckets = np.load(os.path.join(self.out_dir, f"{street}.buckets.npy"))
+            indexer = holdem_indexer(board_size)
+            for key in range(0, 120, 7):
+                rounds = indexer.unindex(key)
+                hole = [id_to_card(c) for c in rounds[0]]
+                board = [id_to_card(c) for c in rounds[1]] if board_size else []
+                with self.subTest(street=street, key=key):
+                    self.assertEqual(canonical_index(hole, board), key)
+                    self.assertEqual(self.index.bucket(hole, board), buckets[key])
+
+    def test_buckets_stable_under_suit_isomorphism(self):
+        rng = random.Random(3)
+        suits = list(SUIT)
+        for _, hole_ids, board_ids in next(iter_canonical_situations(PHASE.FLOP, chunk_size=120)):
+            hole = [id_to_card(c) for c in hole_ids]
+            board = [id_to_card(c) for c in board_ids]
+            shuffled = suits[:]
+            rng.shuffle(shuffled)
+            mapping = dict(zip(suits, shuffled))
+            self.assertEqual(self.index.bucket(relabel(hole, mapping), relabel(board, mapping)),
+                             self.index.bucket(hole, board))
+
+    def test_missing_situations_and_streets(self):
+        # Past the limit the situation is featurized and assigned to the nearest centroid.
+        indexer = holdem_indexer(3)
+        rounds = indexer.unindex(indexer.size - 1)
+        bucket = self.index.bucket([id_to_card(c) for c in rounds[0]], [id_to_card(c) for c in rounds[1]])
+        self.assertIn(bucket, range(4))
+        with self.assertRaises(ValueError):
+            self.index.bucket([id_to_card(0), id_to_card(1)], [id_to_card(c) for c in range(2, 7)])
+        with tempfile.TemporaryDirectory() as empty:
+            with self.assertRaises(ValueError):
+                BucketIndex(empty)
+
+    def test_seeding_samples_every_chunk(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            chunk_files = []
+            for i in range(3):
+                features_file = os.path.join(tmp, f"chunk{i}.features.npy")
+                np.save(features_file, np.full((20, 13), i, dtype=np.float32))
+                chunk_files.append((None, features_file))
+            pipeline = AbstractionPipeline(tmp, kmeans_sample=9, seed=5)
+            sample = pipeline._seed_sample(chunk_files)
+        self.assertEqual(sample.shape, (9, 10))
+        self.assertEqual(sorted(sample[:, 0].tolist()), [0.0] * 3 + [1.0] * 3 + [2.0] * 3)
+
+    def test_river_features_have_no_potential(self):
+        hs, ppot, npot, hist = hand_features([0, 13], [26, 39, 1, 14, 27], random.Random(4), opponents=4)
+        self.assertTrue(0 <= hs <= 1)
+        self.assertEqual((ppot, npot), (0.0, 0.0))
+        self.assertAlmostEqual(float(hist.sum()), 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
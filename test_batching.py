@@ -0,0 +1,117 @@
+import random
+import threading
+import unittest
+import numpy as np
+from batching import InferenceBatcher, play_concurrently
+from hand_export import HandColumns
+from opponent_model import OpponentModel
+from replay import HandRecorder, HandReplayer
+from self_play import PolicyNetwork, PolicyPlayer, num_features
+from stats import StatsCollector
+from tournament import Tournament
+
+class RecordingModel:
+    def __init__(self):
+        self.sizes = []
+
+    def __call__(self, x):
+        self.sizes.append(len(x))
+        return x * 2
+
+class TestBatching(unittest.TestCase):
+    def call_from_threads(self, batcher, threads, calls, register=True):
+        results = {}
+
+        def run(t):
+            try:
+                results[t] = [batcher(np.array([t, i], dtype=np.float32)) for i in range(calls)]
+            finally:
+                if register:
+                    batcher.finished()
+
+        if register:
+            batcher.register(threads)
+        workers = [threading.Thread(target=run, args=(t,)) for t in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        return results
+
+    def test_lockstep_batches_every_client(self):
+        model = RecordingModel()
+        batcher = InferenceBatcher(model, max_batch_size=64, max_wait=None)
+        results = self.call_from_threads(batcher, 6, 10)
+        # Results go back to the caller that asked.
+        for t, rows in results.items():
+            self.assertEqual([row.tolist() for row in rows], [[2 * t, 2 * i] for i in range(10)])
+        self.assertEqual(batcher.requests, 60)
+        self.assertEqual(model.sizes, [6] * 10)
+        self.assertEqual(batcher.mean_batch(), 6)
+
+    def test_max_batch_size_caps_batches(self):
+        model = RecordingModel()
+        batcher = InferenceBatcher(model, max_batch_size=4, max_wait=None)
+        self.call_from_threads(batcher, 10, 5)
+        self.assertEqual(sum(model.sizes), 50)
+        self.assertEqual(batcher.largest_batch, 4)
+
+    def test_max_wait_flushes_partial_batches(self):
+        model = RecordingModel()
+        batcher = InferenceBatcher(model, max_batch_size=64, max_wait=0.001)
+        # Nobody registered, so only the wait can flush these.
+        self.call_from_threads(batcher, 3, 5, register=False)
+        self.assertEqual(sum(model.sizes), 15)
+        self.assertGreater(batcher.wait_seconds, 0)
+
+    def test_model_errors_reach_callers(self):
+        def broken(x):
+            raise RuntimeError("model failed")
+        batcher = InferenceBatcher(broken, max_batch_size=1)
+        with self.assertRaises(RuntimeError):
+            batcher(np.zeros(2))
+        with self.assertRaises(ValueError):
+            InferenceBatcher(broken, max_batch_size=0)
+
+    def test_tournament_batches_across_tables(self):
+        random.seed(5)
+        network = PolicyNetwork(num_features(8), hidden=16, seed=5)
+        batcher = InferenceBatcher(network.probabilities, max_batch_size=64, max_wait=None)
+        players = [PolicyPlayer(f"Player{i}", chips=500, policy=batcher) for i in range(27)]
+        tournament = Tournament(players, seats_per_table=9, batcher=batcher)
+        tournament.run(max_rounds=3)
+        self.assertEqual(tournament.clock, 3)
+        self.assertGreaterEqual(tournament.hands_played, 3)
+        self.assertEqual(sum(p.chips for p in players), 27 * 500)
+        self.assertGreater(batcher.mean_batch(), 1)
+        self.assertEqual(batcher.clients, 0)
+
+    def test_shared_recorders_across_concurrent_tables(self):
+        """One set of listeners follows every table while the tables play at the same time."""
+        random.seed(6)
+        network = PolicyNetwork(num_features(8), hidden=16, seed=6)
+        batcher = InferenceBatcher(network.probabilities, max_batch_size=64, max_wait=None)
+        players = [PolicyPlayer(f"Player{i}", chips=500, policy=batcher) for i in range(27)]
+        tournament = Tournament(players, seats_per_table=9, batcher=batcher)
+        recorder, stats, model, columns = HandRecorder(), StatsCollector(), OpponentModel(), HandColumns()
+        for table in tournament.tables:
+            for listener in (recorder, stats, model, columns):
+                table.add_recorder(listener)
+        tournament.run(max_rounds=4)
+
+        self.assertEqual(recorder.count, tournament.hands_played)
+        self.assertEqual(stats.hands, tournament.hands_played)
+        self.assertEqual(model.total.hands, sum(len(hand["players"]) for hand in recorder.hands))
+        self.assertEqual(len(set(columns.players["hand_id"])), tournament.hands_played)
+        replayer = HandReplayer()
+        self.assertTrue(all(replayer.verify(hand) for hand in recorder.hands))
+
+    def test_play_concurrently_reraises(self):
+        class Broken:
+            def play_round(self):
+                raise KeyError("table")
+        with self.assertRaises(KeyError):
+            play_concurrently([Broken(), Broken()], rounds=2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from blackjack import ACE, BasicStrategy, BlackjackGame, BlackjackRules, hand_total, simulate
+from card_enums import RANK
+from counting import HiLo, KO
+
+class TestBlackjack(unittest.TestCase):
+    def rig(self, game, values):
+        """Stack the shoe so the next cards dealt are `values` (player, dealer, player, dealer, ...)."""
+        game.shoe.values = list(values) + [10] * 20
+        game.shoe.cursor = 0
+
+    def test_hand_total(self):
+        self.assertEqual(hand_total([ACE, 6]), (17, True))
+        self.assertEqual(hand_total([ACE, 6, 10]), (17, False))
+        self.assertEqual(hand_total([ACE, ACE, 9]), (21, True))
+        self.assertEqual(hand_total([10, 6, 9]), (25, False))
+
+    def test_basic_strategy_cells(self):
+        s17 = BasicStrategy(BlackjackRules(hit_soft_17=False))
+        h17 = BasicStrategy(BlackjackRules(hit_soft_17=True))
+        self.assertEqual(s17.action([10, 6], 10, True, True, True), "R")
+        self.assertEqual(s17.action([10, 6], 10, True, True, False), "H")
+        self.assertEqual(s17.action([8, 8], 10, True, True, True), "P")
+        self.assertEqual(s17.action([5, 6], ACE, True, True, True), "H")
+        self.assertEqual(h17.action([5, 6], ACE, True, True, True), "D")
+        self.assertEqual(s17.action([ACE, 7], 2, True, True, True), "S")
+        self.assertEqual(h17.action([ACE, 7], 2, True, True, True), "D")
+        self.assertEqual(s17.action([ACE, 7], 4, False, True, True), "S")
+
+    def test_blackjack_pays_three_to_two(self):
+        game = BlackjackGame()
+        self.rig(game, [ACE, 9, 10, 8])
+        self.assertEqual(game.play_round(), 1.5)
+
+    def test_dealer_blackjack_takes_original_bet_only(self):
+        game = BlackjackGame()
+        self.rig(game, [10, ACE, 6, 10])
+        self.assertEqual(game.play_round(), -1.0)
+
+    def test_double_down(self):
+        """11 vs 6 doubles, draws a 10 and beats the dealer's 6+10 bust."""
+        game = BlackjackGame()
+        self.rig(game, [5, 6, 6, 10, 10, 10])
+        self.assertEqual(game.play_round(), 2.0)
+
+    def test_split_eights(self):
+        """8,8 vs 10 splits into two hands of 18 against the dealer's 20: lose both."""
+        game = BlackjackGame(BlackjackRules(surrender=False))
+        self.rig(game, [8, 10, 8, 10, 10, 10])
+        self.assertEqual(game.play_round(), -2.0)
+
+    def test_surrender(self):
+        game = BlackjackGame()
+        self.rig(game, [10, 10, 6, 7])
+        self.assertEqual(game.play_round(), -0.5)
+
+    def test_shoe_tracks_composition_and_count(self):
+        """The count matrix and the Hi-Lo count follow every dealt card."""
+        hilo = HiLo(decks=6)
+        game = BlackjackGame(BlackjackRules(decks=6), counters=[hilo])
+        shoe = game.shoe
+        dealt = shoe.deck.cards[:30]
+        for _ in range(30):
+            shoe.draw()
+
+        aces_left = 24 - sum(1 for c in dealt if c.rank == RANK.ACE)
+        self.assertEqual(int(shoe.counts[RANK.ACE.value].sum()), aces_left)
+        self.assertAlmostEqual(shoe.rank_probability(RANK.ACE), aces_left / (312 - 30))
+        self.assertEqual(hilo.running_count, sum(HiLo.TAGS[c.value] for c in dealt))
+        self.assertEqual(hilo.cards_seen, 30)
+
+        shoe.shuffle()
+        self.assertEqual(hilo.running_count, 0)
+        self.assertEqual(KO(decks=6).running_count, -20)
+
+    def test_simulation_reports_interval(self):
+        result = simulate(BlackjackRules(), rounds=20_000, seed=3)
+        low, high = result["ci"]
+        self.assertEqual(result["rounds"], 20_000)
+        self.assertLess(low, result["house_edge"])
+        self.assertLess(result["house_edge"], high)
+        self.assertLess(abs(result["house_edge"]), 0.05)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+import numpy as np
+from card import Card
+from card_enums import RANK, SUIT
+from cfr import ACTIONS, CFRPlayer, CFRTrainer, HandStrengthBucketer
+
+def small_trainer(seed=0):
+    return CFRTrainer(bucketer=HandStrengthBucketer(3, samples=4, seed=seed), raise_cap=1)
+
+class TestCFR(unittest.TestCase):
+    def test_training_is_seeded_and_normalized(self):
+        """Same seeds give the same tables; the average strategy is a distribution over legal actions."""
+        first, second = small_trainer(), small_trainer()
+        first.train(20, seed=1)
+        second.train(20, seed=1)
+        self.assertEqual(first.iterations, 20)
+        np.testing.assert_array_equal(first.regrets, second.regrets)
+        np.testing.assert_array_equal(first.strategy_sum, second.strategy_sum)
+        self.assertTrue((first.regrets >= 0).all())
+
+        strategy = first.average_strategy()
+        decisions = first.tree.terminal == 0
+        np.testing.assert_allclose(strategy[decisions].sum(axis=2), 1.0, rtol=1e-5)
+        self.assertTrue((strategy[~np.broadcast_to(first.tree.legal[:, None, :], strategy.shape)] == 0).all())
+
+    def test_parallel_training(self):
+        trainer = small_trainer()
+        trainer.train(8, workers=2, chunk=2, seed=3)
+        self.assertEqual(trainer.iterations, 8)
+        self.assertGreater(trainer.strategy_sum.sum(), 0)
+
+    def test_save_load_round_trip(self):
+        trainer = small_trainer()
+        trainer.train(10, seed=2)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ckpt")
+            trainer.save(path)
+            self.assertFalse([f for f in os.listdir(path) if f.endswith(".tmp")])
+
+            loaded = CFRTrainer.load(path)
+            self.assertEqual((loaded.n_buckets, loaded.raise_cap, loaded.iterations), (3, 1, 10))
+            np.testing.assert_array_equal(loaded.regrets, trainer.regrets)
+            np.testing.assert_array_equal(loaded.strategy_sum, trainer.strategy_sum)
+            # Play-time lookups come straight from the memory-mapped file.
+            player = CFRPlayer("CFR", checkpoint=path)
+            self.assertIsInstance(player.strategy, np.memmap)
+            np.testing.assert_array_equal(player.strategy, trainer.average_strategy())
+
+            # Resuming copies the read-only tables and leaves the checkpoint untouched.
+            loaded.train(5, seed=4)
+            self.assertEqual(loaded.iterations, 15)
+            self.assertNotIsInstance(loaded.average_strategy(), np.memmap)
+            with open(os.path.join(path, "meta.json")) as f:
+                files = json.load(f)["files"]
+            np.testing.assert_array_equal(np.load(os.path.join(path, files["regrets"])), trainer.regrets)
+            del player, loaded
+
+    def test_interrupted_save_keeps_previous_checkpoint(self):
+        """Tables of an unfinished save are ignored; a finished save replaces the old ones."""
+        trainer = small_trainer()
+        trainer.train(10, seed=2)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "ckpt")
+            trainer.save(path)
+            first = sorted(os.listdir(path))
+            regrets = trainer.regrets.copy()
+
+            # A save that dies before its header is written leaves only stray tables behind.
+            trainer.train(5, seed=3)
+            np.save(os.path.join(path, "regrets.crashed.npy"), trainer.regrets)
+            loaded = CFRTrainer.load(path, mmap=False)
+            self.assertEqual(loaded.iterations, 10)
+            np.testing.assert_array_equal(loaded.regrets, regrets)
+
+            trainer.save(path)
+            second = os.listdir(path)
+            self.assertEqual(len(second), 4)
+            self.assertFalse(set(first) & set(second) - {"meta.json"})
+            self.assertEqual(CFRTrainer.load(path, mmap=False).iterations, 15)
+
+    def test_player_follows_strategy(self):
+        """A strategy that always folds folds facing a bet and checks when it can."""
+        random.seed(6)
+        trainer = small_trainer()
+        trainer.strategy_sum[:, :, ACTIONS.index("fold")] = 1.0
+        player = CFRPlayer("CFR", 100, trainer=trainer)
+        self.assertFalse(hasattr(player, "__dict__"))
+        player.receive_cards([Card(RANK.SEVEN, SUIT.HEARTS), Card(RANK.TWO, SUIT.CLUBS)])
+        player.make_decision(highest_bet=0, call_amount=0)
+        self.assertFalse(player.folded)
+        self.assertEqual(player.chips, 100)
+        player.make_decision(highest_bet=10, call_amount=10)
+        self.assertTrue(player.folded)
+
+        with self.assertRaises(ValueError):
+            CFRPlayer("CFR")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import os
+import random
+import tempfile
+import unittest
+from checkpoint import CheckpointWriter, load, restore, run_tournament, snapshot
+from player import RandomPlayer
+from texas_holdem import TexasHoldemGame
+from tournament import Tournament
+
+class TestCheckpoint(unittest.TestCase):
+    def build_tournament(self):
+        return Tournament([RandomPlayer(f"P{i}", chips=400) for i in range(30)], seats_per_table=6)
+
+    def build_game(self):
+        return TexasHoldemGame([RandomPlayer(name, 1000) for name in ("A", "B", "C", "D")], testing=True)
+
+    def test_tournament_resume_is_identical(self):
+        random.seed(11)
+        reference = [(p.name, p.chips) for p in self.build_tournament().run()]
+
+        random.seed(11)
+        first = self.build_tournament()
+        first.run(max_rounds=15)
+        data = snapshot(first, stats={"rounds": first.clock, "rate": 1.5})
+
+        random.seed(999)
+        resumed = self.build_tournament()
+        stats = restore(resumed, data)
+        self.assertEqual(stats, {"rounds": 15, "rate": 1.5})
+        self.assertEqual(resumed.clock, 15)
+        self.assertEqual([(p.name, p.chips) for p in resumed.run()], reference)
+
+    def test_game_resume_is_identical(self):
+        random.seed(5)
+        reference = self.build_game()
+        for _ in range(10):
+            reference.play_round()
+
+        random.seed(5)
+        first = self.build_game()
+        for _ in range(4):
+            first.play_round()
+        data = snapshot(first)
+        resumed = self.build_game()
+        restore(resumed, data)
+        self.assertEqual([c.value for c in resumed.dealer.deck.cards], [c.value for c in first.dealer.deck.cards])
+        for _ in range(6):
+            resumed.play_round()
+        self.assertEqual([p.chips for p in resumed.players], [p.chips for p in reference.players])
+        self.assertEqual(resumed.button_position, reference.button_position)
+
+    def test_corrupt_checkpoint_is_rejected(self):
+        data = bytearray(snapshot(self.build_game()))
+        data[-1] ^= 0xFF
+        with self.assertRaises(ValueError):
+            restore(self.build_game(), bytes(data))
+        with self.assertRaises(TypeError):
+            restore(self.build_tournament(), snapshot(self.build_game()))
+
+    def test_background_writer_and_resume(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "run.ckpt")
+            writer = CheckpointWriter(path)
+            game = self.build_game()
+            writer.submit(snapshot(game))
+            writer.close()
+            self.assertFalse(os.path.exists(path + ".tmp"))
+            self.assertEqual(load(path), snapshot(game))
+
+            random.seed(3)
+            reference = [p.name for p in self.build_tournament().run()]
+            random.seed(3)
+            first = self.build_tournament()
+            first.run(max_rounds=10)
+            with open(path, "wb") as f:
+                f.write(snapshot(first))
+            standings = run_tournament(self.build_tournament(), path, every=5)
+            self.assertEqual([p.name for p in standings], reference)
+
+if __name__ == "__main__":
+    unittest.main()
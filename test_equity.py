@@ -0,0 +1,49 @@
+import math
+import unittest
+from card import Card
+from card_enums import RANK, SUIT
+from equity import parse_range, range_vs_range
+
+class TestEquity(unittest.TestCase):
+    def test_parse_range_counts(self):
+        """Combo counts and weights for the common range notations."""
+        cases = [
+            ("AA", 6), ("AKs", 4), ("AKo", 12), ("AK", 16), ("QQ+", 18),
+            ("ATs+", 16), ("22-55", 24), ("A2s-A5s", 16), ("AhKh", 1),
+        ]
+        for text, expected in cases:
+            with self.subTest(range=text):
+                self.assertEqual(len(parse_range(text)), expected)
+
+        weighted = parse_range("QQ+, AKs, 50% AQo")
+        self.assertEqual(len(weighted), 34)
+        self.assertAlmostEqual(sum(weighted.values()), 18 + 4 + 6)
+
+    def test_parse_range_rejects_bad_tokens(self):
+        for text in ("AAs", "XK", "150% AKs", "AKs-QJs"):
+            with self.subTest(range=text):
+                with self.assertRaises(ValueError):
+                    parse_range(text)
+
+    def test_river_equity_is_exact(self):
+        """On a complete board, the flush beats the set and the set beats a weaker set."""
+        board = [Card(RANK.TWO, SUIT.HEARTS), Card(RANK.SEVEN, SUIT.DIAMONDS), Card(RANK.NINE, SUIT.CLUBS),
+                 Card(RANK.QUEEN, SUIT.HEARTS), Card(RANK.THREE, SUIT.HEARTS)]
+        result = range_vs_range(parse_range("AhKh, 22"), parse_range("QsQc"), board=board)
+        self.assertEqual(result["runouts"], 1)
+        self.assertEqual(result["combo_equity1"]["AhKh"], 1.0)
+        self.assertEqual(result["combo_equity1"]["2d2c"], 0.0)
+        self.assertAlmostEqual(result["equity"][0], 0.25)
+        self.assertAlmostEqual(sum(result["equity"]), 1.0)
+
+    def test_conflicting_combos_are_removed(self):
+        """AhKh cannot face AhAs; only the five remaining aces combos count."""
+        board = [Card(RANK.TWO, SUIT.CLUBS), Card(RANK.SEVEN, SUIT.DIAMONDS), Card(RANK.NINE, SUIT.CLUBS),
+                 Card(RANK.JACK, SUIT.SPADES), Card(RANK.THREE, SUIT.DIAMONDS)]
+        result = range_vs_range(parse_range("AhKh"), parse_range("AA"), board=board)
+        self.assertEqual(len(result["combo_equity2"]), 6)
+        self.assertTrue(math.isnan(result["combo_equity2"]["AhAs"]))
+        self.assertEqual(result["equity"][0], 0.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from evaluator import Evaluator, EvaluatorTable
+from evaluator import CachedEvaluator, EvaluationCache, Evaluator, EvaluatorTable
 from card_enums import RANK, SUIT
 
 class TestEvaluator(unittest.TestCase):
@@ -282,5 +282,64 @@ class TestEvaluator(unittest.TestCase):
         winner = EvaluatorTable.determine_winner([player1, player2], community_cards)
         self.assertEqual(winner, [player2], "Folded player should be ignored; player2 wins")
 
+    def test_category_helpers(self):
+        """The is_* / get_*_info wrappers agree with one HandAnalysis of the same cards."""
+        cards = self.create_cards(["NINE", "NINE", "NINE", "FOUR", "FOUR", "ACE", "TWO"],
+                                  ["CLUBS", "HEARTS", "SPADES", "CLUBS", "HEARTS", "DIAMONDS", "CLUBS"])
+        self.assertTrue(Evaluator.is_full_house(cards))
+        self.assertFalse(Evaluator.is_three_of_a_kind(cards))
+        self.assertFalse(Evaluator.is_one_pair(cards))
+        self.assertEqual(Evaluator.get_full_house_info(cards), (9, 4))
+        self.assertEqual(Evaluator.get_three_of_a_kind_info(cards), (9, [14, 4, 2]))
+
+        # Seven cards holding the wheel and a six-high straight take the higher one.
+        cards = self.create_cards(["ACE", "TWO", "THREE", "FOUR", "FIVE", "SIX", "KING"],
+                                  ["CLUBS", "HEARTS", "SPADES", "CLUBS", "HEARTS", "DIAMONDS", "CLUBS"])
+        self.assertTrue(Evaluator.is_straight(cards))
+        self.assertEqual(Evaluator.get_highest_straight_card(cards), 6)
+        self.assertEqual(Evaluator.get_highest_straight_card(cards[:5]), 5)
+        self.assertIsNone(Evaluator.get_highest_straight_card(cards[1:4]))
+
+        cards = self.create_cards(["KING", "KING", "SEVEN", "SEVEN", "THREE"],
+                                  ["CLUBS", "HEARTS", "SPADES", "CLUBS", "HEARTS"])
+        self.assertEqual(Evaluator.get_two_pair_info(cards), (13, 7, 3))
+        self.assertEqual(Evaluator.get_hand_rank(cards), (Evaluator.HAND_RANKS["Two Pair"], (13, 7, 3)))
+
+    def test_cached_evaluator_matches_reference(self):
+        """Cached results equal uncached ones regardless of card order, and repeats hit the cache."""
+        CachedEvaluator.configure(max_size=1000)
+        hole = self.create_cards(["ACE", "KING"], ["HEARTS", "HEARTS"])
+        board = self.create_cards(["QUEEN", "JACK", "TEN", "FIVE", "TWO"],
+                                  ["HEARTS", "HEARTS", "HEARTS", "DIAMONDS", "CLUBS"])
+        player = self.MockPlayer(hole)
+        expected = Evaluator.evaluate_hand(player, board)
+        self.assertEqual(CachedEvaluator.evaluate_hand(player, board), expected)
+        self.assertEqual(CachedEvaluator.best_hand_rank(list(reversed(hole + board))), expected)
+        self.assertEqual(CachedEvaluator.get_hand_rank(board), Evaluator.get_hand_rank(board))
+
+        stats = CachedEvaluator.stats()["evaluate_hand"]
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertGreater(stats["memory_bytes"], 0)
+
+    def test_evaluation_cache_eviction(self):
+        """LRU keeps recently read entries; FIFO evicts in insertion order."""
+        lru = EvaluationCache(max_size=2, policy="lru")
+        lru.put(1, (0, ()))
+        lru.put(2, (0, ()))
+        lru.get(1)
+        lru.put(3, (0, ()))
+        self.assertIsNotNone(lru.get(1))
+        self.assertIsNone(lru.get(2))
+        self.assertEqual(lru.stats()["evictions"], 1)
+
+        fifo = EvaluationCache(max_size=2, policy="fifo")
+        fifo.put(1, (0, ()))
+        fifo.put(2, (0, ()))
+        fifo.get(1)
+        fifo.put(3, (0, ()))
+        self.assertIsNone(fifo.get(1))
+        self.assertIsNotNone(fifo.get(2))
+
 if __name__ == "__main__":
     unittest.main()
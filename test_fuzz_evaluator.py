@@ -0,0 +1,25 @@
+import unittest
+from evaluator import Evaluator
+from fuzz_evaluator import REFERENCE, fuzz, format_report
+
+class TestFuzzEvaluator(unittest.TestCase):
+    def test_candidates_agree_with_reference(self):
+        results = fuzz(first_cards=[44, 45, 46, 47], samples=300, chunk=100, seed=1)
+        # Lowest card 44 leaves C(7, 4) hands, 45 C(6, 4), and so on.
+        self.assertEqual(results[5]["hands"], 35 + 15 + 5 + 1)
+        self.assertEqual(results[7]["hands"], 300)
+        for size, report in results.items():
+            with self.subTest(size=size):
+                self.assertEqual(report["mismatches"], {})
+                self.assertEqual(sum(report["categories"].values()), report["hands"])
+                self.assertIn(REFERENCE, report["hands_per_sec"])
+        self.assertIn("7-card hands: 300", format_report(results))
+
+    def test_wrong_order_is_reported(self):
+        engines = {"suits": lambda cards: len({c.suit for c in cards}),
+                   "reversed": lambda cards: -Evaluator.hand_score(cards)}
+        results = fuzz(five_card_engines=engines, best_hand_engines={}, sizes=(), first_cards=[40])
+        self.assertEqual(set(results[5]["mismatches"]), {"suits", "reversed"})
+
+if __name__ == "__main__":
+    unittest.main()
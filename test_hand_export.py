@@ -0,0 +1,96 @@
+import importlib.util
+import os
+import random
+import tempfile
+import unittest
+from card_enums import BUTTON, PHASE
+from hand_export import PLAYER_COLUMNS, HandColumns, ParquetExporter, scan, summarize
+from player import RandomPlayer
+from tournament import BlindLevel, TournamentTable
+
+HAVE_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+class Counting(RandomPlayer):
+    __slots__ = ("decisions",)
+
+    def __init__(self, name, chips):
+        super().__init__(name, chips)
+        self.decisions = 0
+
+    def make_decision(self, highest_bet, call_amount):
+        if not self.folded and self.chips > 0:
+            self.decisions += 1
+        super().make_decision(highest_bet, call_amount)
+
+def play(recorder, hands, seed=1):
+    random.seed(seed)
+    players = [Counting(f"P{i}", 10_000) for i in range(3)]
+    game = TournamentTable(7, players)
+    game.level = BlindLevel(5, 10)
+    game.recorder = recorder
+    for _ in range(hands):
+        game.play_round()
+    return players
+
+class TestHandColumns(unittest.TestCase):
+    def test_rows(self):
+        columns = HandColumns(first_hand_id=100)
+        players = play(columns, 50)
+        rows = columns.players
+        self.assertEqual({len(values) for values in rows.values()}, {150})
+        self.assertEqual(rows["hand_id"][:3], [100, 100, 100])
+        self.assertEqual(set(rows["table_id"]), {7})
+        self.assertEqual(len(columns.actions["hand_id"]), sum(p.decisions for p in players))
+        for hand in range(50):
+            self.assertEqual(sum(rows["result"][3 * hand:3 * hand + 3]), 0)
+        for i in range(150):
+            self.assertTrue(0 <= rows["hole1"][i] < 52 and 0 <= rows["hole2"][i] < 52)
+            self.assertIsInstance(rows["last_phase"][i], PHASE)
+            self.assertIsInstance(rows["position"][i], BUTTON)
+            if rows["category"][i] is not None:
+                self.assertIsNotNone(rows["board5"][i])
+                self.assertFalse(rows["folded"][i])
+
+        players_part, actions_part = columns.take()
+        self.assertEqual(len(players_part["hand_id"]), 150)
+        self.assertEqual(columns.players, {name: [] for name in PLAYER_COLUMNS})
+
+        # Row groups need a subclass that writes them out.
+        with self.assertRaises(ValueError):
+            HandColumns(row_group_size=30)
+
+    @unittest.skipIf(HAVE_PYARROW, "pyarrow is installed")
+    def test_parquet_needs_pyarrow(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            with self.assertRaises(ImportError):
+                ParquetExporter(out_dir)
+
+@unittest.skipUnless(HAVE_PYARROW, "needs pyarrow")
+class TestParquetExport(unittest.TestCase):
+    def test_round_trip_and_queries(self):
+        with tempfile.TemporaryDirectory() as out_dir:
+            with ParquetExporter(out_dir, row_group_size=30) as exporter:
+                players = play(exporter, 40)
+            path = os.path.join(out_dir, "players.parquet")
+            import pyarrow.parquet as pq
+            self.assertEqual(pq.ParquetFile(path).metadata.num_row_groups, 4)
+
+            table = scan(path)
+            self.assertEqual(table.num_rows, 120)
+            self.assertEqual(sum(table.column("result").to_pylist()), 0)
+            actions = scan(os.path.join(out_dir, "actions.parquet"), columns=["phase", "action"])
+            self.assertEqual(actions.num_rows, sum(p.decisions for p in players))
+            self.assertEqual(actions.column_names, ["phase", "action"])
+
+            small_blinds = scan(path, columns=["position", "hand_id"],
+                                where={"position": BUTTON.SB, "hand_id": [3, 4, 5]})
+            self.assertEqual(small_blinds.column("position").to_pylist(), ["SB"] * 3)
+            self.assertEqual(small_blinds.column("hand_id").to_pylist(), [3, 4, 5])
+
+            summary = summarize(path, "position")
+            self.assertEqual(summary.column("position").to_pylist(), ["BB", "DEALER", "SB"])
+            self.assertEqual(summary.column("result_count").to_pylist(), [40, 40, 40])
+            self.assertEqual(sum(summary.column("result_sum").to_pylist()), 0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import random
+import unittest
+import numpy as np
+from ai_player import MinimaxPlayer
+from equity import CHAR_TO_RANK, CHAR_TO_SUIT
+from card import Card
+from hand_reading import CARD_COMBOS, COMBOS, NUM_COMBOS, PREFLOP_STRENGTH, RangeReader, board_strength
+from isomorphism import card_id
+from player import Player
+from tournament import BlindLevel, TournamentTable
+
+def ids(text):
+    return [card_id(Card(CHAR_TO_RANK[text[i]], CHAR_TO_SUIT[text[i + 1]])) for i in range(0, len(text), 2)]
+
+def combo(text):
+    return int(np.flatnonzero((COMBOS == sorted(ids(text))).all(axis=1))[0])
+
+class Caller(Player):
+    def make_decision(self, highest_bet, call_amount):
+        self.place_bet(min(call_amount, self.chips))
+
+class TestHandReading(unittest.TestCase):
+    def test_combo_tables(self):
+        self.assertEqual(NUM_COMBOS, 1326)
+        self.assertEqual(CARD_COMBOS.shape, (52, 51))
+        for card in (0, 25, 51):
+            self.assertTrue((COMBOS[CARD_COMBOS[card]] == card).any(axis=1).all())
+        self.assertGreater(PREFLOP_STRENGTH[combo("AhAs")], PREFLOP_STRENGTH[combo("KhKs")])
+        self.assertGreater(PREFLOP_STRENGTH[combo("KhKs")], PREFLOP_STRENGTH[combo("7h2s")])
+
+    def test_board_strength(self):
+        board = tuple(sorted(ids("QcJc2d")))
+        strength = board_strength(board)
+        self.assertGreater(strength[combo("QhQd")], strength[combo("AhQd")])
+        self.assertGreater(strength[combo("AhQd")], strength[combo("7h3s")])
+        self.assertEqual(strength[combo("QhJh")], strength[combo("QsJs")])
+        self.assertEqual(strength[combo("Qc3h")], 0.0)
+        self.assertIs(board_strength(board), strength)
+
+    def test_actions_narrow_the_range(self):
+        reader = RangeReader(seed=1)
+        reader.new_hand(ids("AhKh"))
+        weights = reader.weights("Villain")
+        self.assertEqual(np.count_nonzero(weights), 1225)
+        self.assertAlmostEqual(weights.sum(), 1.0)
+        self.assertEqual(weights[combo("AhQs")], 0.0)
+
+        reader.observe_action("Villain", "raise")
+        reader.observe_action("Villain", "raise")
+        weights = reader.weights("Villain")
+        self.assertAlmostEqual(weights.sum(), 1.0)
+        self.assertGreater(weights[combo("AsAd")], 50 * weights[combo("7s2d")])
+        self.assertNotIn(tuple(sorted(ids("7s2d"))), reader.combined_range())
+        self.assertIn(tuple(sorted(ids("AsAd"))), reader.combined_range())
+
+        # Board cards remove the combos holding them.
+        reader.observe_board(ids("As7c2d"))
+        self.assertEqual(reader.weights("Villain")[combo("AsAd")], 0.0)
+        self.assertAlmostEqual(reader.weights("Villain").sum(), 1.0)
+
+    def test_equity(self):
+        reader = RangeReader(samples=2000, seed=1)
+        reader.new_hand(ids("AhAs"))
+        self.assertAlmostEqual(reader.equity(), 0.85, delta=0.03)
+        # A range that keeps raising on a low board is ahead of a bare ace more often.
+        reader = RangeReader(samples=2000, seed=1)
+        reader.new_hand(ids("AhKs"))
+        before = reader.equity(["Villain"])
+        reader.observe_board(ids("7c6c2d"))
+        for _ in range(3):
+            reader.observe_action("Villain", "raise")
+        self.assertLess(reader.equity(["Villain"]), before - 0.15)
+        # Estimates are cached per set of opponents, not shared between them.
+        self.assertGreater(reader.equity(["Newcomer"]), reader.equity(["Villain"]) + 0.15)
+        self.assertEqual(reader.equity(["Villain"]), reader.equity(["Villain"]))
+
+    def test_game_feeds_reader(self):
+        random.seed(3)
+        reader = RangeReader(samples=50, seed=3)
+        hero = MinimaxPlayer("Hero", 10_000, reader=reader)
+        game = TournamentTable(0, [hero, Caller("Caller", 10_000)])
+        game.level = BlindLevel(5, 10)
+        game.play_round()
+        self.assertEqual(sorted(reader.hole), sorted(card_id(c) for c in hero.hand))
+        if not hero.folded:
+            self.assertEqual(sorted(reader.board), sorted(card_id(c) for c in game.dealer.community_cards))
+        self.assertIn("Caller", reader.ranges)
+        self.assertNotIn("Hero", reader.ranges)
+        self.assertTrue(0.0 <= hero.estimate_strength() <= 1.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import random
+import unittest
+from itertools import combinations
+from card import Card
+from card_enums import RANK, SUIT
+from isomorphism import canonical_index, canonicalize_cards, holdem_indexer
+
+class TestIsomorphism(unittest.TestCase):
+    def test_sizes(self):
+        """Canonical situation counts match the known hold'em figures."""
+        expected = {0: 169, 3: 1_286_792, 4: 13_960_050, 5: 123_156_254}
+        for board_size, size in expected.items():
+            with self.subTest(board_size=board_size):
+                self.assertEqual(holdem_indexer(board_size).size, size)
+
+    def test_preflop_is_dense(self):
+        """All 1,326 starting hands map onto exactly the indices 0..168."""
+        indexer = holdem_indexer(0)
+        indices = {indexer.index([list(hole)]) for hole in combinations(range(52), 2)}
+        self.assertEqual(indices, set(range(169)))
+
+    def test_suit_relabelling(self):
+        """(A♥ K♥ | Q♥ J♦ 2♣) and (A♠ K♠ | Q♠ J♥ 2♦) share an index and canonical form."""
+        hole_a = [Card(RANK.ACE, SUIT.HEARTS), Card(RANK.KING, SUIT.HEARTS)]
+        board_a = [Card(RANK.QUEEN, SUIT.HEARTS), Card(RANK.JACK, SUIT.DIAMONDS), Card(RANK.TWO, SUIT.CLUBS)]
+        hole_b = [Card(RANK.ACE, SUIT.SPADES), Card(RANK.KING, SUIT.SPADES)]
+        board_b = [Card(RANK.QUEEN, SUIT.SPADES), Card(RANK.JACK, SUIT.HEARTS), Card(RANK.TWO, SUIT.DIAMONDS)]
+        self.assertEqual(canonical_index(hole_a, board_a), canonical_index(hole_b, board_b))
+
+        canon_a = canonicalize_cards(hole_a, board_a)
+        canon_b = canonicalize_cards(hole_b, board_b)
+        as_tuples = lambda cards: [(c.rank, c.suit) for c in cards]
+        self.assertEqual(as_tuples(canon_a[0]), as_tuples(canon_b[0]))
+        self.assertEqual(as_tuples(canon_a[1]), as_tuples(canon_b[1]))
+
+    def test_round_trip(self):
+        """unindex returns a canonical form that indexes back to the same value."""
+        rng = random.Random(7)
+        for board_size in (3, 4, 5):
+            indexer = holdem_indexer(board_size)
+            for _ in range(500):
+                index = rng.randrange(indexer.size)
+                rounds = indexer.unindex(index)
+                with self.subTest(board_size=board_size, index=index):
+                    self.assertEqual(indexer.index(rounds), index)
+                    self.assertEqual(indexer.canonicalize(rounds), rounds)
+
+    def test_hole_and_board_are_distinct_rounds(self):
+        """Swapping a hole card with a board card is a different situation."""
+        hole = [Card(RANK.ACE, SUIT.HEARTS), Card(RANK.KING, SUIT.CLUBS)]
+        board = [Card(RANK.TWO, SUIT.SPADES), Card(RANK.SEVEN, SUIT.DIAMONDS), Card(RANK.NINE, SUIT.HEARTS)]
+        swapped_hole = [board[0], hole[1]]
+        swapped_board = [hole[0], board[1], board[2]]
+        self.assertNotEqual(canonical_index(hole, board), canonical_index(swapped_hole, swapped_board))
+
+if __name__ == "__main__":
+    unittest.main()
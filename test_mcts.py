@@ -0,0 +1,71 @@
+import gc
+import random
+import unittest
+from card import Card
+from card_enums import RANK, SUIT
+from ai_player import MCTSPlayer, mcts_search
+
+def spades_board():
+    return [Card(RANK.ACE, SUIT.SPADES), Card(RANK.KING, SUIT.SPADES), Card(RANK.QUEEN, SUIT.SPADES),
+            Card(RANK.JACK, SUIT.SPADES), Card(RANK.THREE, SUIT.HEARTS)]
+
+NUTS = [Card(RANK.TEN, SUIT.SPADES), Card(RANK.NINE, SUIT.HEARTS)]
+HOPELESS = [Card(RANK.FOUR, SUIT.DIAMONDS), Card(RANK.TWO, SUIT.CLUBS)]
+
+def most_visited(stats):
+    return max(stats, key=lambda a: stats[a][0])
+
+class TestMCTS(unittest.TestCase):
+    def search(self, hand, seed=1, **kwargs):
+        return mcts_search(hand, spades_board(), chips=1000, call_amount=100, pot=10, num_opponents=1,
+                           time_budget=None, max_iterations=300, seed=seed, **kwargs)
+
+    def test_seeded_search_is_deterministic(self):
+        first = self.search(HOPELESS)
+        self.assertEqual(first, self.search(HOPELESS))
+        self.assertEqual(sum(visits for visits, _ in first.values()), 300)
+        self.assertEqual(set(first), {"fold", "call", "raise"})
+
+    def test_folds_hopeless_and_plays_the_nuts(self):
+        """Calling 100 into 10 with king-high loses; with the royal flush it always wins."""
+        hopeless = self.search(HOPELESS)
+        self.assertEqual(most_visited(hopeless), "fold")
+        nuts = self.search(NUTS)
+        self.assertNotEqual(most_visited(nuts), "fold")
+        visits, value_sum = nuts["call"]
+        self.assertEqual(value_sum / visits, 10)
+
+    def test_all_in_decisions_cannot_raise(self):
+        stats = mcts_search(NUTS, spades_board(), chips=50, call_amount=100, pot=10, num_opponents=1,
+                            time_budget=None, max_iterations=50, seed=2)
+        self.assertEqual(set(stats), {"fold", "call"})
+
+    def test_player_decides_and_releases_its_pool(self):
+        random.seed(3)
+        with MCTSPlayer("MCTS", 1000, time_budget=None, max_iterations=100, workers=2) as player:
+            player.receive_cards(list(HOPELESS))
+            player.community_cards = spades_board()
+            player.make_decision(highest_bet=100, call_amount=100)
+            self.assertTrue(player.folded)
+            shutdown = player._shutdown
+            self.assertTrue(shutdown.alive)
+            self.assertFalse(hasattr(player, "__dict__"))
+        self.assertFalse(shutdown.alive)
+        self.assertIsNone(player._executor)
+
+        # A player dropped without close() still shuts its pool down.
+        player = MCTSPlayer("MCTS", 1000, time_budget=None, max_iterations=20, workers=2)
+        player.receive_cards(list(NUTS))
+        player.community_cards = spades_board()
+        player.make_decision(highest_bet=100, call_amount=100)
+        self.assertFalse(player.folded)
+        shutdown = player._shutdown
+        del player
+        gc.collect()
+        self.assertFalse(shutdown.alive)
+
+        with self.assertRaises(ValueError):
+            MCTSPlayer("MCTS", time_budget=None, max_iterations=None)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+from card import Card
+from card_enums import PHASE, RANK, SUIT
+from evaluator import Evaluator, OmahaEvaluatorTable
+from omaha import OmahaGame
+from player import Player
+from stats import StatsCollector
+from table import Table
+
+class Shover(Player):
+    def make_decision(self, highest_bet, call_amount):
+        self.place_bet(self.chips)
+
+class Caller(Player):
+    def make_decision(self, highest_bet, call_amount):
+        self.place_bet(min(call_amount, self.chips))
+
+class ActionLog:
+    def __init__(self):
+        self.actions = []
+
+    def start_hand(self, game):
+        pass
+
+    def action(self, player, old_bet, call_amount, phase):
+        self.actions.append((player.name, phase, player.current_bet - old_bet, player.chips))
+
+    def end_hand(self, game):
+        pass
+
+class TestOmaha(unittest.TestCase):
+    def cards(self, spec):
+        return [Card(RANK[rank], SUIT[suit]) for rank, suit in spec]
+
+    def test_exactly_two_hole_cards(self):
+        """Four hearts on board plus one hole heart is a flush in hold'em but not in Omaha."""
+        board = self.cards([("TWO", "HEARTS"), ("SEVEN", "HEARTS"), ("NINE", "HEARTS"),
+                            ("JACK", "HEARTS"), ("KING", "CLUBS")])
+        player = Player("Omaha")
+        player.receive_cards(self.cards([("ACE", "HEARTS"), ("THREE", "CLUBS"),
+                                         ("FOUR", "DIAMONDS"), ("EIGHT", "SPADES")]))
+        holdem_rank, _ = Evaluator.best_hand_rank(player.hand + board)
+        omaha_rank, _ = OmahaEvaluatorTable.evaluate_hand(player, board)
+        self.assertEqual(holdem_rank, Evaluator.HAND_RANKS["Flush"])
+        self.assertEqual(omaha_rank, Evaluator.HAND_RANKS["High Card"])
+
+    def test_winner_uses_two_plus_three(self):
+        board = self.cards([("ACE", "SPADES"), ("ACE", "CLUBS"), ("SEVEN", "DIAMONDS"),
+                            ("EIGHT", "HEARTS"), ("TWO", "CLUBS")])
+        trips = Player("Trips")
+        trips.receive_cards(self.cards([("ACE", "HEARTS"), ("KING", "HEARTS"),
+                                        ("THREE", "SPADES"), ("FOUR", "SPADES")]))
+        full_house = Player("Full House")
+        full_house.receive_cards(self.cards([("SEVEN", "CLUBS"), ("SEVEN", "HEARTS"),
+                                             ("KING", "CLUBS"), ("QUEEN", "DIAMONDS")]))
+        self.assertEqual(OmahaEvaluatorTable.determine_winner([trips, full_house], board), [full_house])
+
+    def test_pot_limit_max_bet(self):
+        """With 100 in the pot and a 20 bet to call, the most one can raise to is 20 + 140."""
+        alice, bob = Player("Alice", chips=1000), Player("Bob", chips=1000)
+        table = Table([alice, bob], pot_limit=True)
+        table.pot = 100
+        table.player_action(alice, "raise", 20)
+        self.assertEqual(table.max_bet(bob), 160)
+
+        bob.place_bet(500)
+        self.assertEqual(table.clamp_bet(bob, 20, committed=0), 340)
+        self.assertEqual(bob.current_bet, 160)
+        self.assertEqual(bob.chips, 840)
+
+        with self.assertRaises(ValueError):
+            table.player_action(alice, "raise", 1000)
+
+    def test_recorders_see_capped_bets(self):
+        """Listeners are told the chips actually committed, not the oversized bet asked for."""
+        game = OmahaGame([Shover("Over", 10_000), Caller("Caller", 10_000)], testing=True)
+        log, stats = ActionLog(), StatsCollector()
+        game.add_recorder(log)
+        game.add_recorder(stats)
+        for _ in range(5):
+            game.play_round()
+        # Shoving into a small pre-flop pot is capped, so chips are left behind.
+        preflop = [(added, chips) for name, phase, added, chips in log.actions if name == "Over" and phase == PHASE.PF]
+        self.assertTrue(preflop)
+        self.assertTrue(all(added > 0 and chips > 0 for added, chips in preflop))
+        over = stats.players["Shover"]
+        self.assertEqual(stats.hands, 5)
+        self.assertEqual(over.bets + over.calls + over.checks + over.folds,
+                         sum(1 for name, *_ in log.actions if name == "Over"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import random
+import unittest
+from ai_player import MinimaxPlayer
+from evaluator import Evaluator, OmahaEvaluatorTable
+from omaha import OmahaGame
+from opponent_model import OpponentModel
+from player import Player
+from texas_holdem import TexasHoldemGame
+from tournament import BlindLevel, TournamentTable
+
+class Bettor(Player):
+    def make_decision(self, highest_bet, call_amount):
+        if call_amount:
+            self.place_bet(min(call_amount, self.chips))
+        elif self.chips > 20:
+            self.place_bet(20)
+
+class Folder(Player):
+    def make_decision(self, highest_bet, call_amount):
+        if call_amount:
+            self.fold()
+
+class Caller(Player):
+    def make_decision(self, highest_bet, call_amount):
+        self.place_bet(min(call_amount, self.chips))
+
+class TestOpponentModel(unittest.TestCase):
+    def play(self, model, players, hands):
+        random.seed(1)
+        game = TournamentTable(0, players)
+        game.level = BlindLevel(5, 10)
+        game.recorder = model
+        for _ in range(hands):
+            game.play_round()
+        return game
+
+    def test_learns_tendencies(self):
+        model = OpponentModel()
+        self.play(model, [Bettor("Bettor", 10_000), Folder("Folder", 10_000), Caller("Caller", 10_000)], 30)
+
+        fold, call, reraise = model.response_frequencies("Folder")
+        self.assertGreater(fold, 0.8)
+        self.assertEqual(model.players["Folder"].folds, model.players["Folder"].faced)
+        fold, call, reraise = model.response_frequencies("Caller")
+        self.assertGreater(call, 0.8)
+        # Unseen players get the prior.
+        self.assertEqual(model.response_frequencies("Nobody"), model.prior)
+
+        bettor = model.players["Bettor"]
+        self.assertEqual(bettor.hands, 30)
+        self.assertGreater(bettor.bets, 0)
+        self.assertAlmostEqual(bettor.bet_bb / bettor.bets, 20 / 10)
+        self.assertEqual(model.players["Caller"].showdowns, 30)
+        self.assertEqual(model.players["Folder"].showdowns, 0)
+        self.assertTrue(0 < model.showdown_strength() < 1)
+
+        all_fold, _, _ = model.response_probabilities(["Folder"])
+        self.assertGreater(all_fold, model.response_probabilities(["Folder", "Caller"])[0])
+
+    def test_minimax_weights_responses(self):
+        model = OpponentModel()
+        folders = [Folder(f"Folder{i}", 10_000) for i in range(2)]
+        game = self.play(model, [Bettor("Bettor", 10_000)] + folders, 20)
+        for player in folders:
+            game.seats.unseat(player)
+
+        informed = MinimaxPlayer("Informed", 10_000, model=model)
+        naive = MinimaxPlayer("Naive", 10_000)
+        table = TexasHoldemGame([informed, naive] + folders, testing=True)
+        for player in table.players:
+            player.reset_hand()
+            player.receive_cards([table.dealer.deck.draw_card(), table.dealer.deck.draw_card()])
+        naive.folded = True
+        self.assertEqual(informed.opponents(), ["Folder0", "Folder1"])
+        # Against players who always fold, a raise is worth more than the worst case.
+        p_fold, p_call, p_raise = model.response_probabilities(informed.opponents())
+        self.assertGreater(p_fold, p_call + p_raise)
+        informed_ev = informed.minimax_value_of_action("raise", 10, 10)
+        self.assertGreater(informed_ev, naive.minimax_value_of_action("raise", 10, 10))
+
+    def test_omaha_showdown_strength(self):
+        """Omaha showdowns are scored with two hole cards and three board cards."""
+        random.seed(2)
+        model = OpponentModel()
+        game = OmahaGame([Caller("A", 100_000), Caller("B", 100_000)], testing=True)
+        game.recorder = model
+        top = max(Evaluator.HAND_RANKS.values())
+        expected = 0.0
+        for _ in range(40):
+            game.play_round()
+            for player in game.players:
+                category, _ = OmahaEvaluatorTable.evaluate_hand(player, game.dealer.community_cards)
+                expected += category / top
+        self.assertEqual(model.total.showdowns, 80)
+        self.assertAlmostEqual(model.total.showdown_strength, expected)
+
+    def test_shared_instance(self):
+        self.assertIs(OpponentModel.shared(), OpponentModel.shared())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import copy
+import os
+import random
+import tempfile
+import unittest
+from ai_player import MinimaxPlayer
+from player import RandomPlayer
+from replay import HandRecorder, HandReplayer, ReplayMismatch, iter_log, replay_log
+from ruleset import SHORT_DECK
+from texas_holdem import TexasHoldemGame
+from tournament import Tournament
+
+class TestReplay(unittest.TestCase):
+    def record(self, rounds=60, ruleset=None):
+        random.seed(21)
+        players = [RandomPlayer("A", 1000), RandomPlayer("B", 1000), MinimaxPlayer("C", 1000), RandomPlayer("D", 1000)]
+        game = TexasHoldemGame(players, testing=True, ruleset=ruleset)
+        game.recorder = HandRecorder()
+        for _ in range(rounds):
+            game.play_round()
+        return game.recorder.hands
+
+    def test_replay_matches_live_play(self):
+        replayer = HandReplayer()
+        for ruleset in (None, SHORT_DECK):
+            for hand in self.record(ruleset=ruleset):
+                self.assertEqual(replayer.replay(hand), hand["result"])
+
+    def test_tournament_hands_with_antes(self):
+        random.seed(8)
+        tournament = Tournament([RandomPlayer(f"P{i}", chips=300) for i in range(12)], seats_per_table=6)
+        recorder = HandRecorder()
+        for table in tournament.tables:
+            table.recorder = recorder
+        tournament.run(max_rounds=60)
+        self.assertTrue(any(hand["blinds"][2] > 0 for hand in recorder.hands))
+        replayer = HandReplayer()
+        self.assertTrue(all(replayer.verify(hand) for hand in recorder.hands))
+
+    def test_tampered_hands_are_caught(self):
+        hands = [h for h in self.record() if len(h["actions"]) > 2]
+        replayer = HandReplayer()
+
+        dropped = copy.deepcopy(hands[0])
+        dropped["actions"].pop()
+        self.assertFalse(replayer.verify(dropped))
+
+        wrong_seat = copy.deepcopy(hands[0])
+        seat = wrong_seat["actions"][0][0]
+        wrong_seat["actions"][0][0] = (seat + 1) % len(wrong_seat["players"])
+        with self.assertRaises(ReplayMismatch):
+            replayer.replay(wrong_seat)
+
+        wrong_result = copy.deepcopy(hands[0])
+        wrong_result["result"][0] += 1
+        self.assertFalse(replayer.verify(wrong_result))
+
+    def test_log_streaming_and_parallel_replay(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "hands.jsonl")
+            with open(path, "w") as f:
+                random.seed(4)
+                game = TexasHoldemGame([RandomPlayer(n, 500) for n in "ABCDE"], testing=True)
+                game.recorder = HandRecorder(f)
+                for _ in range(50):
+                    game.play_round()
+            self.assertEqual(sum(1 for _ in iter_log(path)), 50)
+
+            serial = replay_log(path, chunk=16)
+            parallel = replay_log(path, workers=2, chunk=16)
+            self.assertEqual((serial["hands"], serial["mismatches"]), (50, []))
+            self.assertEqual((parallel["hands"], parallel["mismatches"]), (50, []))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import unittest
+from card_enums import BUTTON
+from player import RandomPlayer
+from results_store import ResultsStore
+from tournament import BlindLevel, TournamentTable
+
+class TestResultsStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "results.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def play(self, store, hands, tables=2):
+        random.seed(1)
+        games = []
+        for table_id in range(tables):
+            game = TournamentTable(table_id, [RandomPlayer(f"R{table_id}{i}", 10_000) for i in range(3)])
+            game.level = BlindLevel(5, 10)
+            game.recorder = store
+            games.append(game)
+        for _ in range(hands):
+            for game in games:
+                game.play_round()
+
+    def test_records_hands_and_answers_queries(self):
+        with ResultsStore(self.path, label="test", batch_size=7) as store:
+            self.play(store, 20)
+            store.flush()
+            self.assertEqual(store.hands_written, 40)
+            self.assertGreaterEqual(store.transactions, 40 // 7)
+            self.assertEqual(store.query("PRAGMA journal_mode")[0][0], "wal")
+            self.assertEqual(store.query("SELECT COUNT(*) FROM hands")[0][0], 40)
+            self.assertEqual(store.query("SELECT COUNT(*) FROM player_hands")[0][0], 120)
+            totals = store.query("SELECT SUM(result) FROM player_hands GROUP BY hand_id")
+            self.assertEqual({total for (total,) in totals}, {0})
+
+            expected = store.query("SELECT COUNT(*), SUM(won) FROM player_hands WHERE position = 'SB'")[0]
+            stats = store.win_rate("RandomPlayer", BUTTON.SB)
+            self.assertEqual((stats["hands"], stats["wins"]), expected)
+            self.assertEqual(store.win_rate("RandomPlayer", "SB"), stats)
+            self.assertEqual(store.win_rate("RandomPlayer", last_hands=10)["hands"], 30)
+            self.assertEqual(store.win_rate("MinimaxPlayer")["hands"], 0)
+
+            plan = store.query("EXPLAIN QUERY PLAN SELECT COUNT(*), SUM(won) FROM player_hands "
+                               "WHERE player_class = 'RandomPlayer' AND position = 'SB' AND hand_id > 5")
+            self.assertIn("COVERING INDEX player_hands_class_position", plan[0][-1])
+
+    def test_runs_share_one_file(self):
+        with ResultsStore(self.path) as first:
+            self.play(first, 5, tables=1)
+        with ResultsStore(self.path, label="second") as second:
+            self.play(second, 5, tables=1)
+            second.flush()
+            self.assertEqual(second.query("SELECT COUNT(*) FROM runs")[0][0], 2)
+            ids = [hand_id for (hand_id,) in second.query("SELECT hand_id FROM hands ORDER BY hand_id")]
+            self.assertEqual(ids, list(range(1, 11)))
+            runs = second.query("SELECT run_id, COUNT(*) FROM hands GROUP BY run_id")
+            self.assertEqual([count for _, count in runs], [5, 5])
+
+    def test_stores_open_together_share_one_file(self):
+        first = ResultsStore(self.path, batch_size=3)
+        second = ResultsStore(self.path, batch_size=2)
+        try:
+            for i in range(50):
+                for store in (first, second):
+                    store.submit((i, 10, 1, 0), [(0, f"P{i}", "Player", "SB", 1000, 0, 0, 0)])
+            first.flush()
+            second.flush()
+        finally:
+            first.close()
+            second.close()
+        with ResultsStore(self.path) as store:
+            self.assertEqual(store.query("SELECT COUNT(DISTINCT hand_id) FROM hands")[0][0], 100)
+            runs = store.query("SELECT run_id, COUNT(*) FROM hands GROUP BY run_id")
+            self.assertEqual([count for _, count in runs], [50, 50])
+            orphans = store.query("SELECT COUNT(*) FROM player_hands WHERE hand_id NOT IN (SELECT hand_id FROM hands)")
+            self.assertEqual(orphans[0][0], 0)
+
+    def test_query_from_any_thread(self):
+        with ResultsStore(self.path) as store:
+            self.play(store, 3, tables=1)
+            store.flush()
+            self.assertEqual(store.query("SELECT COUNT(*) FROM hands")[0][0], 3)
+            counts = []
+            workers = [threading.Thread(target=lambda: counts.append(store.win_rate("RandomPlayer")["hands"]))
+                       for _ in range(4)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            self.assertEqual(counts, [9] * 4)
+
+    def test_write_errors_surface(self):
+        store = ResultsStore(self.path)
+        store.submit((0, 10, 1, 0), [(0, "P", "Player", "SB")])   # too few columns
+        with self.assertRaises(sqlite3.Error):
+            store.flush()
+        with self.assertRaises(sqlite3.Error):
+            store.submit((0, 10, 1, 0), [])
+        with self.assertRaises(sqlite3.Error):
+            store.close()
+
+if __name__ == "__main__":
+    unittest.main()
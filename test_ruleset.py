@@ -0,0 +1,100 @@
+import random
+import unittest
+from card import Card
+from card_enums import RANK, SUIT
+from dealer import Dealer
+from evaluator import Evaluator
+from player import Player
+from ruleset import SHORT_DECK, STANDARD
+
+class TestRuleset(unittest.TestCase):
+    def cards(self, spec):
+        return [Card(RANK[rank], SUIT[suit]) for rank, suit in spec]
+
+    def test_standard_table_matches_evaluator(self):
+        """Every entry of the standard precomputed table agrees with Evaluator.get_hand_rank."""
+        rank_by_value = {Evaluator.card_value(Card(rank, SUIT.HEARTS)): rank for rank in RANK}
+        suits = list(SUIT)
+        single_deck = [(values, flush) for values, flush in STANDARD.table
+                       if max(values.count(v) for v in values) <= 4 and (not flush or len(set(values)) == 5)]
+        self.assertEqual(len(single_deck), 7462)
+        for (values, flush), expected in STANDARD.table.items():
+            cards = [Card(rank_by_value[v], SUIT.HEARTS if flush else suits[i % 4]) for i, v in enumerate(values)]
+            self.assertEqual(Evaluator.get_hand_rank(cards), expected, (values, flush))
+
+    def test_packed_scores_sort_like_ranks(self):
+        """Packed scores order every rank key exactly like the tuples and decode back to them."""
+        for ruleset in (STANDARD, SHORT_DECK):
+            with self.subTest(ruleset=ruleset.name):
+                keys = list(ruleset.table)
+                by_rank = sorted(keys, key=lambda k: ruleset.table[k])
+                by_score = sorted(keys, key=lambda k: ruleset.scores[k])
+                self.assertEqual([ruleset.table[k] for k in by_rank], [ruleset.table[k] for k in by_score])
+                for key in keys:
+                    category, kickers = ruleset.table[key]
+                    # Five of a kind ends in a 0 kicker, which unpacking drops.
+                    if kickers[-1] == 0:
+                        kickers = kickers[:-1]
+                    self.assertEqual(Evaluator.unpack_score(ruleset.scores[key]), (category, kickers))
+
+        board = self.cards([("KING", "HEARTS"), ("KING", "CLUBS"), ("NINE", "HEARTS"),
+                            ("SEVEN", "HEARTS"), ("SIX", "SPADES")])
+        hole = self.cards([("ACE", "HEARTS"), ("TEN", "HEARTS")])
+        score = STANDARD.best_hand_score(hole + board)
+        self.assertEqual(score, Evaluator.best_hand_score(hole + board))
+        self.assertEqual(Evaluator.unpack_score(score), STANDARD.best_hand_rank(hole + board))
+        self.assertEqual(STANDARD.describe_score(score), ("Flush", (14, 13, 10, 9, 7)))
+        self.assertEqual(SHORT_DECK.describe_score(SHORT_DECK.best_hand_score(hole + board))[0], "Flush")
+
+    def test_short_deck_composition(self):
+        dealer = Dealer(ruleset=SHORT_DECK)
+        self.assertEqual(len(dealer.deck.cards), 36)
+        self.assertEqual(dealer.deck.remaining(RANK.FIVE), 0)
+        self.assertEqual(dealer.deck.remaining(RANK.SIX), 4)
+        dealer.reset_deck(2)
+        self.assertEqual(len(dealer.deck.cards), 72)
+
+    def test_short_deck_low_straight(self):
+        hand = self.cards([("ACE", "HEARTS"), ("SIX", "CLUBS"), ("SEVEN", "SPADES"),
+                           ("EIGHT", "DIAMONDS"), ("NINE", "HEARTS")])
+        self.assertEqual(SHORT_DECK.get_hand_rank(hand), (SHORT_DECK.hand_ranks["Straight"], (9,)))
+        self.assertEqual(Evaluator.get_hand_rank(hand)[0], Evaluator.HAND_RANKS["High Card"])
+
+    def test_short_deck_flush_beats_full_house(self):
+        board = self.cards([("KING", "HEARTS"), ("KING", "CLUBS"), ("NINE", "HEARTS"),
+                            ("SEVEN", "HEARTS"), ("SIX", "SPADES")])
+        flush = Player("Flush")
+        flush.receive_cards(self.cards([("ACE", "HEARTS"), ("TEN", "HEARTS")]))
+        full_house = Player("Full House")
+        full_house.receive_cards(self.cards([("NINE", "CLUBS"), ("NINE", "DIAMONDS")]))
+        self.assertEqual(SHORT_DECK.determine_winner([flush, full_house], board), [flush])
+        self.assertEqual(STANDARD.determine_winner([flush, full_house], board), [full_house])
+
+    def test_multi_deck_hands(self):
+        """Five of a kind and paired flushes, only possible with several decks, rank like Evaluator."""
+        five_aces = self.cards([("ACE", suit) for suit in ("HEARTS", "CLUBS", "SPADES", "DIAMONDS", "HEARTS")])
+        paired_flush = self.cards([("ACE", "HEARTS"), ("ACE", "HEARTS"), ("KING", "HEARTS"),
+                                   ("TEN", "HEARTS"), ("NINE", "HEARTS")])
+        for hand, category in ((five_aces, "Four of a Kind"), (paired_flush, "Flush")):
+            self.assertEqual(STANDARD.get_hand_rank(hand), Evaluator.get_hand_rank(hand))
+            self.assertEqual(STANDARD.get_hand_rank(hand)[0], Evaluator.HAND_RANKS[category])
+            self.assertEqual(STANDARD.hand_score(hand), Evaluator.pack_rank(Evaluator.get_hand_rank(hand)))
+        self.assertEqual(STANDARD.best_hand_rank(five_aces + paired_flush[2:4]), (Evaluator.HAND_RANKS["Four of a Kind"], (14, 13)))
+
+        # Whole boards dealt from two decks resolve without missing table keys.
+        dealer = Dealer(num_decks=2)
+        random.seed(3)
+        for _ in range(200):
+            dealer.reset_deck(2)
+            dealer.deck.shuffle()
+            cards = [dealer.deck.draw_card() for _ in range(9)]
+            players = [Player("P1"), Player("P2")]
+            players[0].receive_cards(cards[:2])
+            players[1].receive_cards(cards[2:4])
+            board = cards[4:]
+            self.assertTrue(STANDARD.determine_winner(players, board))
+            for p in players:
+                self.assertEqual(STANDARD.best_hand_rank(p.hand + board), Evaluator.best_hand_rank(p.hand + board))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import random
+import unittest
+import numpy as np
+from player import RandomPlayer
+from self_play import PolicyNetwork, PolicyPlayer, SelfPlayTrainer, num_features
+from texas_holdem import TexasHoldemGame
+
+class TestSelfPlay(unittest.TestCase):
+    def test_network_update_follows_advantage(self):
+        net = PolicyNetwork(5, hidden=8, seed=0)
+        x = np.random.default_rng(0).standard_normal((64, 5)).astype(np.float32)
+        probs, values = net.forward(x)
+        self.assertEqual(probs.shape, (64, 3))
+        self.assertEqual(values.shape, (64,))
+        np.testing.assert_allclose(probs.sum(axis=1), 1.0, rtol=1e-5)
+
+        # Raising pays, folding costs: the policy should move towards raising.
+        actions = np.repeat([0, 2], 32)
+        returns = np.where(actions == 2, 1.0, -1.0).astype(np.float32)
+        before = net.forward(x)[0][:, 2].mean()
+        for _ in range(50):
+            net.update(x, actions, returns, lr=0.1)
+        self.assertGreater(net.forward(x)[0][:, 2].mean(), before + 0.1)
+
+    def test_collect_batches_decisions(self):
+        trainer = SelfPlayTrainer(n_buckets=4, hidden=8, tables=4, seats=3, seed=1)
+        x, actions, returns, batches = trainer.collect(3)
+        self.assertEqual(x.shape, (len(actions), num_features(4)))
+        self.assertEqual(len(returns), len(actions))
+        self.assertTrue(set(actions.tolist()) <= {0, 1, 2})
+        self.assertTrue(np.isfinite(returns).all())
+        # Decisions of concurrent tables share forward passes.
+        self.assertGreater(len(x), 0)
+        self.assertLess(batches, len(x))
+
+    def test_train_reports_throughput(self):
+        trainer = SelfPlayTrainer(n_buckets=4, hidden=8, tables=2, seats=3, seed=2)
+        history = trainer.train(2, hands=2)
+        self.assertEqual(len(history), 2)
+        for entry in history:
+            self.assertEqual(entry["hands"], 4)
+            self.assertGreater(entry["hands_per_sec"], 0)
+            self.assertGreater(entry["samples_per_sec"], 0)
+            self.assertGreaterEqual(entry["mean_batch"], 1)
+        self.assertIn("hands/s", trainer.report())
+
+    def test_policy_player_in_a_game(self):
+        random.seed(4)
+        net = PolicyNetwork(num_features(8), seed=4)
+        players = [PolicyPlayer("Policy", 1000, policy=net, record=True),
+                   RandomPlayer("Random1", 1000), RandomPlayer("Random2", 1000)]
+        game = TexasHoldemGame(players, testing=True)
+        for _ in range(5):
+            game.play_round()
+        self.assertEqual(sum(p.chips for p in players), 3000)
+        decisions = players[0].take_decisions()
+        self.assertTrue(decisions)
+        self.assertEqual(players[0].decisions, [])
+        players[0].reset_hand()
+        self.assertEqual(players[0].community_cards, [])
+
+if __name__ == "__main__":
+    unittest.main()
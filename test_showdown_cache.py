@@ -0,0 +1,51 @@
+import random
+import tempfile
+import unittest
+from itertools import combinations
+from isomorphism import id_to_card
+from ruleset import STANDARD
+from showdown_cache import ShowdownCache
+
+class TestShowdownCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.cache = ShowdownCache.open(cls.tmp.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_matches_direct_evaluation(self):
+        rng = random.Random(5)
+        for _ in range(5):
+            ids = rng.sample(range(52), 7)
+            hero, villain, board = ([id_to_card(c) for c in part] for part in (ids[:2], ids[2:4], ids[4:]))
+            win = tie = boards = 0
+            for extra in combinations([c for c in range(52) if c not in ids], 2):
+                full = board + [id_to_card(c) for c in extra]
+                mine, theirs = STANDARD.best_hand_score(hero + full), STANDARD.best_hand_score(villain + full)
+                win += mine > theirs
+                tie += mine == theirs
+                boards += 1
+            result = self.cache.heads_up(hero, villain, board)
+            self.assertEqual((result["win"], result["tie"], result["boards"]), (win, tie, boards))
+
+    def test_preflop_all_boards(self):
+        aces = [id_to_card(0), id_to_card(13)]
+        kings = [id_to_card(12), id_to_card(25)]
+        result = self.cache.heads_up(aces, kings)
+        self.assertEqual(result["boards"], 1_712_304)
+        self.assertAlmostEqual(result["equity"], 0.8264, places=3)
+        reverse = self.cache.heads_up(kings, aces)
+        self.assertEqual((reverse["win"], reverse["tie"]), (result["lose"], result["tie"]))
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            self.cache.heads_up([id_to_card(0), id_to_card(1)], [id_to_card(1), id_to_card(2)])
+        with tempfile.TemporaryDirectory() as empty:
+            with self.assertRaises(ValueError):
+                ShowdownCache(empty)
+
+if __name__ == "__main__":
+    unittest.main()
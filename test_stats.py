@@ -0,0 +1,112 @@
+import csv
+import os
+import random
+import statistics
+import tempfile
+import unittest
+from collections import Counter
+from evaluator import Evaluator, OmahaEvaluatorTable
+from omaha import OmahaGame
+from player import Player
+from stats import RunningStats, StatsCollector
+from texas_holdem import TexasHoldemGame
+
+class Bettor(Player):
+    def make_decision(self, highest_bet, call_amount):
+        if call_amount:
+            self.place_bet(min(call_amount, self.chips))
+        elif self.chips > 10:
+            self.place_bet(10)
+
+class Caller(Player):
+    def make_decision(self, highest_bet, call_amount):
+        self.place_bet(min(call_amount, self.chips))
+
+class TestStats(unittest.TestCase):
+    def test_running_stats_and_merge(self):
+        rng = random.Random(1)
+        values = [rng.gauss(3, 2) for _ in range(1000)]
+        whole, left, right = RunningStats(), RunningStats(), RunningStats()
+        for i, x in enumerate(values):
+            whole.push(x)
+            (left if i < 300 else right).push(x)
+        self.assertAlmostEqual(whole.mean, statistics.mean(values))
+        self.assertAlmostEqual(whole.variance, statistics.variance(values))
+        merged = left.merge(right)
+        self.assertEqual(merged.count, 1000)
+        self.assertAlmostEqual(merged.mean, whole.mean)
+        self.assertAlmostEqual(merged.variance, whole.variance)
+        self.assertEqual((merged.min, merged.max), (min(values), max(values)))
+        low, high = whole.confidence_interval()
+        self.assertLess(low, whole.mean)
+        self.assertGreater(high, whole.mean)
+
+    def play(self, hands, seed):
+        random.seed(seed)
+        game = TexasHoldemGame([Bettor("Bettor", 10_000), Caller("Caller", 10_000)], testing=True)
+        collector = StatsCollector()
+        game.recorder = collector
+        for _ in range(hands):
+            game.play_round()
+        return collector
+
+    def test_collector_counts(self):
+        stats = self.play(40, seed=2)
+        raiser, caller = stats.players["Bettor"], stats.players["Caller"]
+        self.assertEqual(stats.hands, 40)
+        self.assertEqual((raiser.hands, raiser.vpip, raiser.pfr), (40, 40, 40))
+        self.assertEqual((caller.vpip, caller.pfr), (40, 0))
+        # Four streets, one bet and one call each.
+        self.assertEqual(raiser.bets, 160)
+        self.assertEqual(caller.calls, 160)
+        self.assertEqual((raiser.aggression, caller.aggression), (float("inf"), 0.0))
+        self.assertEqual(raiser.showdowns, 40)
+        self.assertEqual(sum(stats.showdown_categories.values()), 80)
+        # Heads-up the result is zero-sum in big blinds.
+        self.assertAlmostEqual(raiser.winnings.mean * raiser.winnings.count,
+                               -caller.winnings.mean * caller.winnings.count)
+
+    def test_omaha_showdowns_use_two_hole_cards(self):
+        """Omaha categories come from exactly two hole cards plus three board cards."""
+        random.seed(4)
+        game = OmahaGame([Caller("A", 100_000), Caller("B", 100_000), Caller("C", 100_000)], testing=True)
+        collector = StatsCollector()
+        expected = Counter()
+
+        class Expected:
+            def start_hand(self, game):
+                pass
+
+            def action(self, player, old_bet, call_amount, phase):
+                pass
+
+            def end_hand(self, game):
+                for p in game.players:
+                    if not p.folded:
+                        rank = OmahaEvaluatorTable.evaluate_hand(p, game.dealer.community_cards)
+                        expected[Evaluator.describe_score(Evaluator.pack_rank(rank))[0]] += 1
+
+        game.add_recorder(collector)
+        game.add_recorder(Expected())
+        for _ in range(60):
+            game.play_round()
+        self.assertEqual(sum(expected.values()), 180)
+        self.assertEqual(collector.showdown_categories, expected)
+
+    def test_merge_and_export(self):
+        first, second = self.play(20, seed=3), self.play(30, seed=4)
+        merged = StatsCollector().merge(first).merge(second)
+        self.assertEqual(merged.hands, 50)
+        self.assertEqual(merged.players["Caller"].calls, 200)
+        self.assertEqual(sum(merged.showdown_categories.values()), 100)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stats.csv")
+            merged.to_csv(path)
+            with open(path) as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual([row["player"] for row in rows], ["Bettor", "Caller"])
+        self.assertEqual(rows[0]["pfr_pct"], "100.0")
+
+if __name__ == "__main__":
+    unittest.main()
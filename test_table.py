@@ -0,0 +1,63 @@
+import unittest
+from card_enums import BUTTON
+from player import Player, RandomPlayer
+from table import SeatTable
+from texas_holdem import TexasHoldemGame
+
+class TestSeatTable(unittest.TestCase):
+    def test_players_are_slotted(self):
+        self.assertFalse(hasattr(Player("A"), "__dict__"))
+        self.assertFalse(hasattr(RandomPlayer("B"), "__dict__"))
+        self.assertIsNot(Player("A").community_cards, Player("B").community_cards)
+
+    def test_chips_and_bets_live_in_arrays(self):
+        alice, bob = Player("Alice", chips=500), Player("Bob", chips=300)
+        seats = SeatTable([alice, bob])
+        alice.place_bet(120)
+        self.assertEqual(list(seats.chips), [380, 300])
+        self.assertEqual(list(seats.bets), [120, 0])
+        seats.chips[1] += 50
+        self.assertEqual(bob.chips, 350)
+
+    def test_unseat_keeps_stack(self):
+        alice, bob, carol = Player("Alice", chips=500), Player("Bob", chips=300), Player("Carol", chips=200)
+        seats = SeatTable([alice, bob, carol])
+        bob.place_bet(100)
+        seats.unseat(bob)
+        self.assertEqual((bob.chips, bob.current_bet), (200, 100))
+        self.assertEqual(carol.seat, 1)
+        self.assertEqual(list(seats.chips), [500, 200])
+
+        other = SeatTable([bob])
+        seats.unseat(alice)
+        other.seat(alice)
+        self.assertIs(alice.seats, other)
+        self.assertEqual(seats.players, [carol])
+
+    def test_players_sit_at_one_table(self):
+        """Seating a player who sits elsewhere fails instead of emptying the other game."""
+        players = [Player(name) for name in ("A", "B", "C")]
+        game = TexasHoldemGame(players, testing=True)
+        with self.assertRaises(ValueError):
+            TexasHoldemGame(players, testing=True)
+        self.assertEqual(game.players, players)
+        with self.assertRaises(ValueError):
+            SeatTable().seat(players[0])
+        newcomer = Player("D")
+        with self.assertRaises(ValueError):
+            SeatTable([newcomer, players[1]])
+        self.assertIsNone(newcomer.seats)
+        self.assertIs(players[0].seats, game.seats)
+
+    def test_assign_button(self):
+        players = [Player(name) for name in ("A", "B", "C", "D")]
+        seats = SeatTable(players)
+        seats.assign_button(3)
+        self.assertEqual((seats.dealer, seats.small_blind, seats.big_blind), (3, 0, 1))
+        self.assertEqual([p.position for p in players], [BUTTON.SB, BUTTON.BB, BUTTON.NONE, BUTTON.DEALER])
+        seats.assign_button(0)
+        self.assertEqual([p.position for p in players], [BUTTON.DEALER, BUTTON.SB, BUTTON.BB, BUTTON.NONE])
+        self.assertIs(seats.player_at(seats.big_blind), players[2])
+
+if __name__ == "__main__":
+    unittest.main()
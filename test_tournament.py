@@ -0,0 +1,65 @@
+import random
+import unittest
+from player import Player, RandomPlayer
+from tournament import BlindLevel, BlindSchedule, Tournament, TournamentTable
+
+class TestTournament(unittest.TestCase):
+    def test_schedule(self):
+        schedule = BlindSchedule([BlindLevel(10, 20), BlindLevel(20, 40, 5)], hands_per_level=3)
+        self.assertEqual(schedule.level(2).big_blind, 20)
+        self.assertEqual(schedule.level(3).ante, 5)
+        self.assertEqual(schedule.level(100).big_blind, 40)
+
+        geometric = BlindSchedule.geometric(ante_from_level=2)
+        blinds = [level.big_blind for level in geometric.levels]
+        self.assertEqual(blinds, sorted(blinds))
+        self.assertEqual(geometric.levels[1].ante, 0)
+        self.assertGreater(geometric.levels[2].ante, 0)
+
+    def test_antes_and_blinds(self):
+        players = [Player(name, chips=1000) for name in ("A", "B", "C")]
+        table = TournamentTable(0, players)
+        table.level = BlindLevel(10, 20, ante=5)
+        table._assign_positions()
+        table._calculate_dynamic_blinds()
+        table._post_blinds()
+        self.assertEqual(table.table.pot, 3 * 5 + 10 + 20)
+
+    def test_seating_keeps_button(self):
+        a, b, c, d = (Player(name) for name in ("A", "B", "C", "D"))
+        table = TournamentTable(0, [a, b, c, d])
+        table.button_position = 2
+        table.unseat(a)
+        self.assertIs(table.players[table.button_position], c)
+        newcomer = Player("E")
+        table.seat(newcomer)
+        self.assertIs(table.players[table.button_position], c)
+        self.assertIs(table.players[table.button_position - 1], newcomer)
+
+    def test_runs_to_a_single_winner(self):
+        random.seed(3)
+        players = [RandomPlayer(f"P{i}", chips=500) for i in range(40)]
+        tournament = Tournament(players, seats_per_table=6)
+        self.assertEqual(len(tournament.tables), 7)
+        standings = tournament.run()
+
+        self.assertEqual(len(standings), 40)
+        self.assertEqual(len({id(p) for p in standings}), 40)
+        self.assertEqual(standings[0].chips, 40 * 500)
+        self.assertTrue(all(p.chips == 0 for p in standings[1:]))
+        self.assertEqual(len(tournament.tables), 1)
+        self.assertGreater(tournament.tables_broken, 0)
+
+    def test_tables_stay_balanced(self):
+        random.seed(4)
+        players = [RandomPlayer(f"P{i}", chips=300) for i in range(50)]
+        tournament = Tournament(players, seats_per_table=9)
+        while tournament.remaining > 9:
+            tournament.play_round()
+            sizes = [len(t.players) for t in tournament.tables]
+            self.assertLessEqual(max(sizes) - min(sizes), 1)
+            self.assertLessEqual(max(sizes), 9)
+            self.assertEqual(sum(sizes), tournament.remaining)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,18 +1,59 @@
-from evaluator import EvaluatorTable
+from ruleset import STANDARD
 from ai_player import MinimaxPlayer, AlphaBetaPlayer
 from player import RandomPlayer
 from dealer import Dealer
-from table import Table
-from card_enums import PHASE, BUTTON
+from table import SeatTable, Table
+from card_enums import PHASE
+
+class RecorderGroup:
+    """
+    Fans every hand event out to several listeners in order, so one game can
+    feed e.g. a HandRecorder, a StatsCollector and an OpponentModel at once
+    through its single recorder slot (see TexasHoldemGame.add_recorder).
+    """
+    def __init__(self, *listeners):
+        self.listeners = list(listeners)
+
+    def add(self, listener):
+        self.listeners.append(listener)
+
+    def start_hand(self, game):
+        for listener in self.listeners:
+            listener.start_hand(game)
+
+    def action(self, player, old_bet, call_amount, phase):
+        for listener in self.listeners:
+            listener.action(player, old_bet, call_amount, phase)
+
+    def end_hand(self, game):
+        for listener in self.listeners:
+            listener.end_hand(game)
+
 
 class TexasHoldemGame:
-    def __init__(self, players, verbose=False, testing=False):
-        self.players = players
-        self.dealer = Dealer()
+    HOLE_CARDS = 2
+
+    def __init__(self, players, verbose=False, testing=False, ruleset=None):
+        self.seats = SeatTable(players)
+        self.players = self.seats.players
+        self.ruleset = ruleset or STANDARD
+        self.dealer = Dealer(ruleset=self.ruleset)
         self.table = Table(self.players)
         self.verbose = verbose
         self.testing = testing
         self.button_position = 0
+        # Optional hand event listener (replay.HandRecorder, stats.StatsCollector,
+        # ...); add_recorder combines several into a RecorderGroup.
+        self.recorder = None
+
+    def add_recorder(self, listener):
+        """Attach another hand event listener next to any already attached."""
+        if self.recorder is None:
+            self.recorder = listener
+        elif isinstance(self.recorder, RecorderGroup):
+            self.recorder.add(listener)
+        else:
+            self.recorder = RecorderGroup(self.recorder, listener)
 
     def play_round(self):
         """
@@ -27,6 +68,14 @@ class TexasHoldemGame:
          8) river & betting
          9) showdown & pot distribution
         """
+        self._play_hand()
+
+        # 9) Rotate button
+        self._rotate_button()
+        if self.recorder is not None:
+            self.recorder.end_hand(self)
+
+    def _play_hand(self):
         # 1) Round Setup (shuffle, reset pot, reset players, deal holes)
         self._round_setup()
 
@@ -40,7 +89,6 @@ class TexasHoldemGame:
         # 4) Preflop betting
         self._betting_round(PHASE.PF)
         if self._check_for_default_winner():
-            self._rotate_button()
             return
 
         # 5) Flop
@@ -48,7 +96,6 @@ class TexasHoldemGame:
         self._log_community_cards(PHASE.FLOP)
         self._betting_round(PHASE.FLOP)
         if self._check_for_default_winner():
-            self._rotate_button()
             return
 
         # 6) Turn
@@ -56,7 +103,6 @@ class TexasHoldemGame:
         self._log_community_cards(PHASE.TURN)
         self._betting_round(PHASE.TURN)
         if self._check_for_default_winner():
-            self._rotate_button()
             return
 
         # 7) River
@@ -64,21 +110,19 @@ class TexasHoldemGame:
         self._log_community_cards(PHASE.RIVER)
         self._betting_round(PHASE.RIVER)
         if self._check_for_default_winner():
-            self._rotate_button()
             return
 
         # 8) Showdown
         self._showdown()
 
-        # 9) Rotate button
-        self._rotate_button()
-
     def _round_setup(self):
         """
         Reset deck, pot, players' hands/bets, then deal hole cards.
         """
         # Shuffle/Reset deck and clear community cards
         self.dealer.reset_deck()
+        if self.recorder is not None:
+            self.recorder.start_hand(self)
 
         # Reset the table pot
         self.table.reset_pot()
@@ -87,8 +131,8 @@ class TexasHoldemGame:
         for player in self.players:
             player.reset_hand()
 
-        # Deal two hole cards to each player
-        self.dealer.deal_hole_cards(self.players)
+        # Deal the hole cards (two in hold'em) to each player
+        self.dealer.deal_hole_cards(self.players, count=self.HOLE_CARDS)
 
         if self.verbose:
             for p in self.players:
@@ -98,25 +142,11 @@ class TexasHoldemGame:
         """
         Assign dealer, SB, BB based on current button_position index.
         """
-        n = len(self.players)
-
-        # Clear old positions
-        for p in self.players:
-            p.position = BUTTON.NONE
-
-        # Dealer
-        dealer_p = self.players[self.button_position]
-        dealer_p.position = BUTTON.DEALER
-
-        # SB
-        sb_index = (self.button_position + 1) % n
-        sb_p = self.players[sb_index]
-        sb_p.position = BUTTON.SB
-
-        # BB
-        bb_index = (self.button_position + 2) % n
-        bb_p = self.players[bb_index]
-        bb_p.position = BUTTON.BB
+        seats = self.seats
+        seats.assign_button(self.button_position)
+        dealer_p = seats.player_at(seats.dealer)
+        sb_p = seats.player_at(seats.small_blind)
+        bb_p = seats.player_at(seats.big_blind)
 
         if self.verbose:
             print("\nPositions:")
@@ -150,8 +180,8 @@ class TexasHoldemGame:
         """
         SB and BB place the computed blinds into the pot.
         """
-        sb_player = next((p for p in self.players if p.position == BUTTON.SB), None)
-        bb_player = next((p for p in self.players if p.position == BUTTON.BB), None)
+        sb_player = self.seats.player_at(self.seats.small_blind)
+        bb_player = self.seats.player_at(self.seats.big_blind)
 
         if sb_player and sb_player.chips > 0:
             sb_amount = min(self.current_small_blind, sb_player.chips)
@@ -169,8 +199,9 @@ class TexasHoldemGame:
 
     def _betting_round(self, phase):
         """
-        Conduct a betting round that continues until all non-folded players
-        have matched the highest bet or folded. (Simplified version.)
+        Conduct a betting round that continues until every non-folded player
+        who can still bet has acted at least once and matched the highest bet,
+        or folded. (Simplified version.)
         """
         if self.verbose:
             print(f"\n--- {phase.name} Betting Round ---")
@@ -179,6 +210,17 @@ class TexasHoldemGame:
         def active_players():
             return [p for p in self.players if not p.folded and p.chips > 0]
 
+        acted = set()
+
+        def street_done():
+            if sum(1 for p in self.players if not p.folded) <= 1:
+                return True
+            active = active_players()
+            if not self._all_bets_matched(highest_bet, active):
+                return False
+            # A lone player with chips left has nobody to bet against.
+            return len(active) <= 1 or all(p.seat in acted for p in active)
+
         highest_bet = 0
         start_index = self._first_to_act(phase)
 
@@ -192,8 +234,8 @@ class TexasHoldemGame:
                 if player.folded or player.chips <= 0:
                     continue
 
-                # If all active players' bets match highest_bet, no need to continue
-                if self._all_bets_matched(highest_bet, active_players()):
+                # Everyone has acted and matched the highest bet, no need to continue
+                if street_done():
                     break
 
                 call_amount = highest_bet - player.current_bet
@@ -201,6 +243,14 @@ class TexasHoldemGame:
 
                 # Use your player's "decision" method (RandomPlayer, etc.)
                 player.make_decision(highest_bet, call_amount)
+                self._apply_bet_limit(player, highest_bet, old_bet)
+                # Listeners see the bet as committed, after any cap.
+                if self.recorder is not None:
+                    self.recorder.action(player, old_bet, call_amount, phase)
+                for other in self.players:
+                    if other is not player:
+                        other.observe_action(player, old_bet, call_amount, phase)
+                acted.add(player.seat)
 
                 new_bet = player.current_bet
 
@@ -212,18 +262,22 @@ class TexasHoldemGame:
                     action_happened = True
 
             # End conditions
-            if self._all_bets_matched(highest_bet, active_players()):
+            if street_done():
                 break
             if not action_happened:
                 # No change in a full cycle, avoid infinite loop
                 break
-            if len(active_players()) <= 1:
-                # Only one left? They get the pot
-                break
 
         # After all betting is done, move the bets to the pot
         self.table.collect_bets()
 
+    def _apply_bet_limit(self, player, highest_bet, old_bet):
+        """
+        Hook for betting structures that cap bet sizes. No-limit hold'em has
+        no cap; variants override this to trim an oversized bet.
+        """
+        pass
+
     def _all_bets_matched(self, highest_bet, active_players):
         """
         Returns True if all active players have bet at least 'highest_bet'
@@ -243,7 +297,7 @@ class TexasHoldemGame:
         n = len(self.players)
         if phase == PHASE.PF:
             # Preflop acts left of BB
-            bb_index = next((i for i, p in enumerate(self.players) if p.position == BUTTON.BB), 0)
+            bb_index = self.seats.big_blind if self.seats.big_blind is not None else 0
             return (bb_index + 1) % n
         else:
             # Postflop acts left of the Dealer
@@ -259,7 +313,7 @@ class TexasHoldemGame:
             winner = active_players[0]
             if self.verbose:
                 print(f"Winner by default (everyone else folded): {winner.name}")
-            self.table.distribute_pot(winner)
+            self.table.distribute_pot([winner])
             return True
         if len(active_players) == 0:
             # Everyone folded? Very rare scenario
@@ -268,12 +322,17 @@ class TexasHoldemGame:
             return True
         return False
 
+    def showdown_scores(self, players):
+        """Packed score (see Evaluator.pack_rank) of each player's showdown hand, by seat."""
+        board = self.dealer.community_cards
+        return {p.seat: self.ruleset.best_hand_score(p.hand + board) for p in players}
+
     def _showdown(self):
         """
         Evaluate the remaining players' hole cards + community
         and determine a winner (or tie).
         """
-        winners = EvaluatorTable.determine_winner(self.players, self.dealer.community_cards)
+        winners = self.ruleset.determine_winner(self.players, self.dealer.community_cards)
         if len(winners) == 1:
             # it's still a list but just has one winner
             if not self.testing:
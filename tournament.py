@@ -0,0 +1,231 @@
+import math
+import random
+import time
+
+from batching import play_concurrently
+from player import RandomPlayer
+from texas_holdem import TexasHoldemGame
+
+
+class BlindLevel:
+    def __init__(self, small_blind, big_blind, ante=0):
+        if small_blind < 1 or big_blind < small_blind:
+            raise ValueError("Blinds must be positive and the big blind at least the small blind")
+        if ante < 0:
+            raise ValueError("Ante cannot be negative")
+        self.small_blind = small_blind
+        self.big_blind = big_blind
+        self.ante = ante
+
+    def __str__(self):
+        return f"{self.small_blind}/{self.big_blind}" + (f" ante {self.ante}" if self.ante else "")
+
+
+class BlindSchedule:
+    """
+    Blind levels on a tournament clock that ticks once per round, where a
+    round is one hand at every table. The level goes up every
+    `hands_per_level` rounds and the last level is kept once it is reached.
+    """
+    def __init__(self, levels, hands_per_level=10):
+        if not levels:
+            raise ValueError("A blind schedule needs at least one level")
+        if hands_per_level < 1:
+            raise ValueError("Hands per level must be greater than 0")
+        self.levels = list(levels)
+        self.hands_per_level = hands_per_level
+
+    def level_index(self, clock):
+        return min(clock // self.hands_per_level, len(self.levels) - 1)
+
+    def level(self, clock):
+        return self.levels[self.level_index(clock)]
+
+    @classmethod
+    def geometric(cls, small_blind=10, growth=1.5, num_levels=40, ante_from_level=4,
+                  ante_fraction=0.1, hands_per_level=10):
+        """
+        Blinds that grow by `growth` per level, rounded to multiples of 5 past
+        the first level, with an ante of `ante_fraction` of the big blind from
+        `ante_from_level` on (0-based).
+        """
+        levels = []
+        value = float(small_blind)
+        for i in range(num_levels):
+            sb = int(value) if i == 0 else max(5, int(round(value / 5)) * 5)
+            bb = 2 * sb
+            ante = max(1, int(bb * ante_fraction)) if i >= ante_from_level else 0
+            levels.append(BlindLevel(sb, bb, ante))
+            value *= growth
+        return cls(levels, hands_per_level)
+
+
+class TournamentTable(TexasHoldemGame):
+    """
+    One headless TexasHoldemGame inside a tournament. Blinds come from the
+    tournament's current level instead of the smallest stack, antes are posted
+    before the blinds, and players can be seated and unseated between hands
+    without losing track of the button.
+    """
+    def __init__(self, table_id, players, ruleset=None):
+        super().__init__(players, verbose=False, testing=True, ruleset=ruleset)
+        self.table_id = table_id
+        self.level = None
+
+    def _calculate_dynamic_blinds(self):
+        self.current_small_blind = self.level.small_blind
+        self.current_big_blind = self.level.big_blind
+
+    def _post_blinds(self):
+        ante = self.level.ante
+        if ante:
+            for player in self.players:
+                if player.chips > 0:
+                    player.place_bet(min(ante, player.chips))
+        super()._post_blinds()
+
+    def seat(self, player):
+        """Seat a player just behind the button so they do not post a blind straight away."""
+        self.seats.seat(player, self.button_position)
+        if len(self.players) > 1:
+            self.button_position += 1
+
+    def unseat(self, player):
+        index = player.seat
+        self.seats.unseat(player)
+        if index < self.button_position:
+            self.button_position -= 1
+        self.button_position = self.button_position % len(self.players) if self.players else 0
+
+    def next_big_blind(self):
+        """The player who posts the big blind next hand, the usual choice when moving a player."""
+        return self.players[(self.button_position + 3) % len(self.players)]
+
+
+class Tournament:
+    """
+    Sit-and-go and multi-table tournament engine. A sit-and-go is simply a
+    tournament whose players fit at one table.
+
+    Players are dealt round-robin onto tables of `seats_per_table`. Each round
+    every table plays one hand, busted players are removed (players busting in
+    the same round are ranked by the stack they started the hand with), then
+    tables are broken while the rest can seat everyone and finally balanced so
+    no two tables differ by more than one player. Tables always run headless.
+
+    With a batching.InferenceBatcher, each round's hands are played at all
+    tables at once in threads, so players whose policy is that batcher get
+    their decisions evaluated together. Without one, tables play one after
+    another as before.
+    """
+    def __init__(self, players, seats_per_table=9, schedule=None, ruleset=None, verbose=False, batcher=None):
+        if len(players) < 2:
+            raise ValueError("A tournament needs at least two players")
+        if seats_per_table < 2:
+            raise ValueError("Tables need at least two seats")
+        self.seats_per_table = seats_per_table
+        self.schedule = schedule or BlindSchedule.geometric()
+        self.verbose = verbose
+        self.batcher = batcher
+
+        num_tables = math.ceil(len(players) / seats_per_table)
+        seating = [[] for _ in range(num_tables)]
+        for i, player in enumerate(players):
+            seating[i % num_tables].append(player)
+        self.tables = [TournamentTable(i, seats, ruleset) for i, seats in enumerate(seating)]
+
+        self.remaining = len(players)
+        self.eliminated = []
+        self.clock = 0
+        self.hands_played = 0
+        self.tables_broken = 0
+        self.players_moved = 0
+
+    def play_round(self):
+        """Play one hand at every table, then bust, break and balance."""
+        level = self.schedule.level(self.clock)
+        if self.verbose and self.clock % self.schedule.hands_per_level == 0:
+            print(f"Level {self.schedule.level_index(self.clock) + 1}: {level} "
+                  f"({self.remaining} players, {len(self.tables)} tables)")
+
+        starting = {id(p): p.chips for t in self.tables for p in t.players}
+        for table in self.tables:
+            table.level = level
+        if self.batcher is None:
+            for table in self.tables:
+                table.play_round()
+        else:
+            play_concurrently(self.tables, batcher=self.batcher)
+
+        busted = []
+        for table in self.tables:
+            self.hands_played += 1
+            for player in [p for p in table.players if p.chips <= 0]:
+                table.unseat(player)
+                player.reset_hand()
+                busted.append((starting[id(player)], player))
+
+        # Bigger starting stacks finish higher, so they are eliminated last.
+        busted.sort(key=lambda x: x[0])
+        for _, player in busted:
+            self.eliminated.append(player)
+            if self.verbose:
+                print(f"{player.name} finishes in place {self.remaining}.")
+            self.remaining -= 1
+
+        self.tables = [t for t in self.tables if t.players]
+        self._break_tables()
+        self._balance_tables()
+        self.clock += 1
+
+    def _break_tables(self):
+        while len(self.tables) > 1 and self.remaining <= (len(self.tables) - 1) * self.seats_per_table:
+            broken = min(self.tables, key=lambda t: len(t.players))
+            self.tables.remove(broken)
+            for player in list(broken.players):
+                target = min(self.tables, key=lambda t: len(t.players))
+                broken.unseat(player)
+                target.seat(player)
+                self.players_moved += 1
+            self.tables_broken += 1
+            if self.verbose:
+                print(f"Table {broken.table_id} is broken, {len(self.tables)} tables left.")
+
+    def _balance_tables(self):
+        while len(self.tables) > 1:
+            largest = max(self.tables, key=lambda t: len(t.players))
+            smallest = min(self.tables, key=lambda t: len(t.players))
+            if len(largest.players) - len(smallest.players) <= 1:
+                return
+            player = largest.next_big_blind()
+            largest.unseat(player)
+            smallest.seat(player)
+            self.players_moved += 1
+
+    def run(self, max_rounds=None):
+        """Play rounds until one player is left (or max_rounds) and return the standings."""
+        while self.remaining > 1 and (max_rounds is None or self.clock < max_rounds):
+            self.play_round()
+        return self.standings()
+
+    def standings(self):
+        """Players still in, biggest stack first, followed by everyone eliminated, last out first."""
+        alive = sorted((p for t in self.tables for p in t.players), key=lambda p: -p.chips)
+        return alive + self.eliminated[::-1]
+
+
+if __name__ == "__main__":
+    random.seed(1)
+    players = [RandomPlayer(f"Player{i + 1}", chips=1500) for i in range(10_000)]
+    tournament = Tournament(players, seats_per_table=9)
+
+    start = time.perf_counter()
+    standings = tournament.run()
+    elapsed = time.perf_counter() - start
+
+    print(f"Winner: {standings[0].name} with {standings[0].chips} chips")
+    for place, player in enumerate(standings[1:5], start=2):
+        print(f"  {place}. {player.name}")
+    print(f"{tournament.hands_played:,} hands over {tournament.clock} rounds in {elapsed:.1f}s "
+          f"({tournament.hands_played / elapsed:,.0f} hands/s), "
+          f"{tournament.tables_broken} tables broken, {tournament.players_moved} players moved")